@@ -3,7 +3,10 @@ Configuration Module
 Quản lý cấu hình và môi trường cho ứng dụng
 """
 import os
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -82,6 +85,10 @@ class Settings(BaseSettings):
 # Global settings instance
 settings = Settings()
 
+# Listener ghi log ở thread riêng để handler không chặn event loop asyncio
+_log_listener: Optional[QueueListener] = None
+
+
 def setup_logging() -> None:
     """Thiết lập logging cho ứng dụng"""
     
@@ -119,10 +126,20 @@ def setup_logging() -> None:
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
     
-    # Xóa handlers cũ và thêm handlers mới
+    # Xóa handlers cũ; root logger chỉ đẩy record vào queue,
+    # console/file handler chạy trong thread của QueueListener
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+    else:
+        atexit.register(lambda: _log_listener and _log_listener.stop())
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _log_listener.start()
+    
     root_logger.handlers.clear()
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(QueueHandler(log_queue))
     
     # Thiết lập level cho các logger cụ thể
     logging.getLogger('telegram').setLevel(logging.WARNING)
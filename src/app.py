@@ -76,6 +76,7 @@ class Application:
         comment_handler = self.container.get_comment_handler()
         
         # TODO: Setup conversation handlers, commands, etc.
+        # (comment callbacks: register comment_handler.callback_handler() once a PTB Application exists here)
         # For now, just log that the bot would start
         logger.info("🤖 Telegram bot handlers configured with clean architecture")
     
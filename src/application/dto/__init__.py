@@ -4,13 +4,36 @@ These objects transfer data between layers without exposing domain entities.
 """
 from datetime import datetime
 from typing import Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from ...domain.entities.ticket import TicketStatus, TicketPriority
 from ...domain.entities.comment import CommentType
 from ...domain.entities.user import UserRole
 
 
-@dataclass
+# Status -> emoji, shared with the ticket formatters
+STATUS_EMOJIS = {
+    "Open": "🟢",
+    "In Progress": "🟡",
+    "Resolved": "🔵",
+    "Closed": "⚫"
+}
+
+_PRIORITY_EMOJIS = {
+    "Low": "🟢",
+    "Medium": "🟡",
+    "High": "🟠",
+    "Urgent": "🔴"
+}
+
+_COMMENT_TYPE_EMOJIS = {
+    "public": "💬",
+    "internal": "🔒",
+    "system": "🤖"
+}
+
+
+@dataclass(frozen=True)
 class TicketDTO:
     """Data transfer object for Ticket"""
     number: str
@@ -24,6 +47,13 @@ class TicketDTO:
     updated_date: datetime
     resolved_date: Optional[datetime]
     is_overdue: bool
+    # Derived once in __post_init__ (read for every rendered ticket); frozen so they cannot go stale
+    status_emoji: str = field(init=False, repr=False, compare=False)
+    priority_emoji: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'status_emoji', STATUS_EMOJIS.get(self.status, "❓"))
+        object.__setattr__(self, 'priority_emoji', _PRIORITY_EMOJIS.get(self.priority, "❓"))
     
     @classmethod
     def from_domain(cls, ticket) -> 'TicketDTO':
@@ -47,30 +77,28 @@ class TicketDTO:
         """Get formatted title for display"""
         return f"[{self.number}] {self.title}"
     
-    @property
-    def status_emoji(self) -> str:
-        """Get emoji for status"""
-        emoji_map = {
-            "Open": "🟢",
-            "In Progress": "🟡", 
-            "Resolved": "🔵",
-            "Closed": "⚫"
-        }
-        return emoji_map.get(self.status, "❓")
+    @cached_property
+    def formatted_created_long(self) -> str:
+        """Get created date formatted for display (cached per DTO)"""
+        return f"{self.created_date:%Y-%m-%d %H:%M}"
     
-    @property
-    def priority_emoji(self) -> str:
-        """Get emoji for priority"""
-        emoji_map = {
-            "Low": "🟢",
-            "Medium": "🟡",
-            "High": "🟠", 
-            "Urgent": "🔴"
-        }
-        return emoji_map.get(self.priority, "❓")
+    @cached_property
+    def formatted_created_short(self) -> str:
+        """Get created date as month/day (cached per DTO)"""
+        return f"{self.created_date:%m/%d}"
+    
+    @cached_property
+    def formatted_updated(self) -> str:
+        """Get updated date formatted for display (cached per DTO)"""
+        return f"{self.updated_date:%Y-%m-%d %H:%M}"
+    
+    @cached_property
+    def callback_view(self) -> str:
+        """Get callback data for viewing this ticket's comments (cached per DTO)"""
+        return f"view_comments:{self.number}"
 
 
-@dataclass
+@dataclass(frozen=True)
 class CommentDTO:
     """Data transfer object for Comment"""
     id: Optional[int]
@@ -85,6 +113,13 @@ class CommentDTO:
     is_recent: bool
     display_author: str
     preview_content: str
+    # Derived once in __post_init__ (read for every rendered comment); frozen so they cannot go stale
+    type_emoji: str = field(init=False, repr=False, compare=False)
+    formatted_date: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'type_emoji', _COMMENT_TYPE_EMOJIS.get(self.comment_type, "💬"))
+        object.__setattr__(self, 'formatted_date', f"{self.created_date:%Y-%m-%d %H:%M}")
     
     @classmethod
     def from_domain(cls, comment) -> 'CommentDTO':
@@ -103,21 +138,6 @@ class CommentDTO:
             display_author=comment.display_author,
             preview_content=comment.preview_content
         )
-    
-    @property
-    def type_emoji(self) -> str:
-        """Get emoji for comment type"""
-        emoji_map = {
-            "public": "💬",
-            "internal": "🔒",
-            "system": "🤖"
-        }
-        return emoji_map.get(self.comment_type, "💬")
-    
-    @property
-    def formatted_date(self) -> str:
-        """Get formatted date for display"""
-        return self.created_date.strftime("%Y-%m-%d %H:%M")
 
 
 @dataclass
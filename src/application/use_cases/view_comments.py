@@ -2,7 +2,8 @@
 Use case for viewing comments on a ticket.
 Contains pure business logic for comment viewing with proper authorization.
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from ..dto import (
     ViewCommentsRequest, 
     ViewCommentsResponse, 
@@ -89,6 +90,34 @@ class ViewCommentsUseCase:
             user_can_add_internal_comment=can_add_internal_comment
         )
     
+    async def get_comment_version(
+        self,
+        ticket_number: str,
+        user_email: str,
+        access_checked: bool = False
+    ) -> Tuple[int, int, Optional[datetime]]:
+        """
+        Get a cheap (latest comment ID, comment count, last edit) token to tell whether comments changed
+        
+        Pass access_checked=True when execute already showed this ticket's thread to the
+        same user; the probe is then a single repository query.
+        """
+        
+        if not access_checked:
+            # Same access rules as execute, so the probe reveals nothing about foreign tickets
+            ticket = await self.ticket_repository.get_by_number(ticket_number)
+            if not ticket:
+                raise ValueError(f"Ticket {ticket_number} not found")
+            
+            user = await self.user_repository.get_by_email(user_email)
+            if not user:
+                raise ValueError(f"User {user_email} not found")
+            
+            if not TicketDomainService.can_user_access_ticket(user, ticket):
+                raise PermissionError("User cannot access this ticket")
+        
+        return await self.comment_repository.get_comment_version(ticket_number)
+    
     async def get_recent_ticket_numbers_for_user(self, user_email: str, limit: int = 10) -> List[str]:
         """Get recent ticket numbers that user can access"""
         recent_tickets = await self.ticket_repository.get_recent_tickets(user_email, limit)
@@ -102,11 +131,11 @@ class ViewCommentsUseCase:
     ) -> List[TicketDTO]:
         """Search tickets that user can access for comment viewing"""
         
+        # Resolve the user first so unknown users never trigger a ticket search
         user = await self.user_repository.get_by_email(user_email)
         if not user:
             raise ValueError(f"User {user_email} not found")
         
-        # Search tickets
         tickets = await self.ticket_repository.search_tickets(
             query=query,
             user_email=user_email,
@@ -28,7 +28,7 @@ from .presentation import (
     CommentFormatter,
     CommentKeyboards,
     TicketFormatter,
-    TicketKeyboards
+    ticket_keyboards
 )
 
 logger = logging.getLogger(__name__)
@@ -154,7 +154,7 @@ class DependencyContainer:
         
         # Create keyboards
         self._keyboards['comment'] = CommentKeyboards()
-        self._keyboards['ticket'] = TicketKeyboards()
+        self._keyboards['ticket'] = ticket_keyboards
         
         # Create handlers
         self._handlers['comment'] = CommentHandler(
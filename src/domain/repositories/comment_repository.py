@@ -3,7 +3,8 @@ Abstract repository interface for Comment entity.
 Defines the contract for comment data access operations.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from ..entities.comment import Comment, CommentType
 
 
@@ -55,6 +56,11 @@ class CommentRepository(ABC):
         """Get count of comments for a ticket"""
         pass
     
+    @abstractmethod
+    async def get_comment_version(self, ticket_number: str) -> Tuple[int, int, Optional[datetime]]:
+        """Get (latest comment ID, comment count, last edit time) for a ticket, used to detect new or edited comments"""
+        pass
+    
     @abstractmethod
     async def search_comments(
         self, 
@@ -0,0 +1,83 @@
+"""
+Batched comment fetcher.
+Coalesces concurrent per-ticket comment lookups into a single bulk query.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from ...domain.entities.comment import Comment
+
+logger = logging.getLogger(__name__)
+
+BulkCommentLoader = Callable[[List[str]], Awaitable[Dict[str, List[Comment]]]]
+
+
+class BatchedCommentFetcher:
+    """Collects fetch() calls for a short window and resolves them with one bulk load"""
+
+    def __init__(self, load_many: BulkCommentLoader, max_batch: int = 32, window: float = 0.02):
+        """
+        Initialize batched fetcher
+
+        Args:
+            load_many: Coroutine loading comments for several ticket numbers at once
+            max_batch: Flush as soon as this many distinct tickets are pending
+            window: Seconds to wait for more callers while a bulk load is already running
+        """
+        self._load_many = load_many
+        self.max_batch = max_batch
+        self.window = window
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def fetch(self, ticket_number: str) -> List[Comment]:
+        """Get comments for a ticket, sharing the query with concurrent callers"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(ticket_number, []).append(future)
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            # Idle fetcher: flush on the next loop iteration so a lone caller does not
+            # pay the window, while callers arriving in the same tick still share the query
+            if self._inflight:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the pending batch over to a dispatch task"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        """Run one bulk load and resolve every waiting caller with its ticket's slice"""
+        try:
+            results = await self._load_many(list(batch))
+        except Exception as e:
+            logger.error("Batched comment load failed for %s ticket(s): %s", len(batch), e, exc_info=True)
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for ticket_number, futures in batch.items():
+            comments = results.get(ticket_number, [])
+            for future in futures:
+                if not future.done():
+                    future.set_result(list(comments))
@@ -2,7 +2,7 @@
 Legacy comment repository that handles both new and legacy Odoo comment tables.
 """
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from ...domain.repositories.comment_repository import CommentRepository
@@ -10,6 +10,7 @@ from ...domain.entities.comment import Comment, CommentType
 from ..database.connection import DatabaseConnection
 from ..database.schema_service import DatabaseSchemaService
 from ..adapters.legacy_data_adapter import LegacyDataAdapter
+from .batched_comment_fetcher import BatchedCommentFetcher
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,8 @@ class LegacyCommentRepository(CommentRepository):
         self.schema_service = schema_service
         self.legacy_adapter = legacy_adapter
         self._use_legacy_tables = None
+        # Concurrent lookups on the clean table share one query per batch window
+        self._clean_comment_fetcher = BatchedCommentFetcher(self._load_clean_comments)
     
     async def _detect_table_structure(self) -> bool:
         """Detect whether to use legacy or new tables"""
@@ -221,35 +224,39 @@ class LegacyCommentRepository(CommentRepository):
                                           comment_type: Optional[CommentType] = None) -> List[Comment]:
         """Get comments from clean table"""
         try:
-            query = """
-            SELECT id, ticket_number, content, author_email, comment_type,
-                   created_at, updated_at
-            FROM comments 
-            WHERE ticket_number = $1
-            """
-            params = [ticket_number]
-            
-            if comment_type:
-                query += " AND comment_type = $2"
-                params.append(comment_type.value)
+            comments = await self._clean_comment_fetcher.fetch(ticket_number)
             
-            query += " ORDER BY created_at ASC"
-            
-            async with self.db_connection.get_connection() as conn:
-                rows = await conn.fetch(query, *params)
-                
-                comments = []
-                for row in rows:
-                    comment = self._row_to_comment(dict(row))
-                    if comment and self._user_can_see_comment(comment, user_email):
-                        comments.append(comment)
-                
-                return comments
+            return [
+                comment for comment in comments
+                if (not comment_type or comment.comment_type == comment_type)
+                and self._user_can_see_comment(comment, user_email)
+            ]
                 
         except Exception as e:
             logger.error(f"Error getting comments for ticket {ticket_number}: {e}")
             return []
     
+    async def _load_clean_comments(self, ticket_numbers: List[str]) -> Dict[str, List[Comment]]:
+        """Load comments for several tickets from clean table in one query"""
+        query = """
+        SELECT id, ticket_number, content, author_email, comment_type,
+               created_at, updated_at
+        FROM comments 
+        WHERE ticket_number = ANY($1::text[])
+        ORDER BY created_at ASC
+        """
+        
+        async with self.db_connection.get_connection() as conn:
+            rows = await conn.fetch(query, ticket_numbers)
+        
+        comments_by_ticket: Dict[str, List[Comment]] = {number: [] for number in ticket_numbers}
+        for row in rows:
+            comment = self._row_to_comment(dict(row))
+            if comment:
+                comments_by_ticket.setdefault(comment.ticket_number, []).append(comment)
+        
+        return comments_by_ticket
+    
     async def _get_legacy_comments_by_ticket(self, ticket_number: str, user_email: str,
                                            comment_type: Optional[CommentType] = None) -> List[Comment]:
         """Get comments from legacy table"""
@@ -386,6 +393,53 @@ class LegacyCommentRepository(CommentRepository):
             logger.error(f"Error getting legacy comment count for {ticket_number}: {e}")
             return 0
     
+    async def get_comment_version(self, ticket_number: str) -> Tuple[int, int, Optional[datetime]]:
+        """Get (latest comment ID, comment count, last edit time) for a ticket"""
+        use_legacy = await self._detect_table_structure()
+        
+        if use_legacy:
+            return await self._get_legacy_comment_version(ticket_number)
+        else:
+            return await self._get_clean_comment_version(ticket_number)
+    
+    async def _get_clean_comment_version(self, ticket_number: str) -> Tuple[int, int, Optional[datetime]]:
+        """Get comment version from clean table"""
+        try:
+            query = """
+            SELECT COALESCE(MAX(id), 0) AS latest_id, COUNT(*) AS count, MAX(updated_at) AS last_write
+            FROM comments WHERE ticket_number = $1
+            """
+            
+            async with self.db_connection.get_connection() as conn:
+                row = await conn.fetchrow(query, ticket_number)
+                return (row['latest_id'], row['count'], row['last_write']) if row else (0, 0, None)
+                
+        except Exception as e:
+            logger.error(f"Error getting comment version for {ticket_number}: {e}")
+            return (0, 0, None)
+    
+    async def _get_legacy_comment_version(self, ticket_number: str) -> Tuple[int, int, Optional[datetime]]:
+        """Get comment version from legacy table"""
+        try:
+            ticket_id = await self._get_ticket_id_from_number(ticket_number)
+            if not ticket_id:
+                return (0, 0, None)
+            
+            query = """
+            SELECT COALESCE(MAX(id), 0) AS latest_id, COUNT(*) AS count, MAX(write_date) AS last_write
+            FROM mail_message 
+            WHERE model = 'helpdesk.ticket' AND res_id = $1
+              AND body IS NOT NULL AND body != ''
+            """
+            
+            async with self.db_connection.get_connection() as conn:
+                row = await conn.fetchrow(query, ticket_id)
+                return (row['latest_id'], row['count'], row['last_write']) if row else (0, 0, None)
+                
+        except Exception as e:
+            logger.error(f"Error getting legacy comment version for {ticket_number}: {e}")
+            return (0, 0, None)
+    
     def _row_to_comment(self, row: Dict[str, Any]) -> Comment:
         """Convert database row to Comment entity"""
         try:
@@ -2,7 +2,7 @@
 PostgreSQL implementation of CommentRepository.
 Handles comment data access using the mail_message table from Odoo.
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 import asyncpg
 from ...domain.repositories import CommentRepository
@@ -210,6 +210,22 @@ class PostgreSQLCommentRepository(CommentRepository):
             row = await conn.fetchrow(query, ticket_number)
             return row['count'] if row else 0
     
+    async def get_comment_version(self, ticket_number: str) -> Tuple[int, int, Optional[datetime]]:
+        """Get (latest comment ID, comment count, last edit time) for a ticket"""
+        async with self.pool.acquire() as conn:
+            query = """
+                SELECT COALESCE(MAX(mm.id), 0) as latest_id, COUNT(*) as count,
+                       MAX(mm.write_date) as last_write
+                FROM mail_message mm
+                JOIN helpdesk_ticket ht ON mm.res_id = ht.id
+                WHERE ht.number = $1 
+                  AND mm.model = 'helpdesk.ticket'
+                  AND mm.message_type = 'comment'
+                  AND mm.body IS NOT NULL AND mm.body != ''
+            """
+            row = await conn.fetchrow(query, ticket_number)
+            return (row['latest_id'], row['count'], row['last_write']) if row else (0, 0, None)
+    
     async def search_comments(
         self, 
         query: str, 
@@ -4,27 +4,140 @@ Kết nối trực tiếp với PostgreSQL database thay vì Odoo XML-RPC
 Multi-Destination Support: Vietnam, Thailand, India, Singapore
 """
 import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+try:
+    import asyncpg
+except ImportError:  # asyncpg chỉ cần cho AsyncPostgreSQLConnector
+    asyncpg = None
+import asyncio
+import itertools
 import logging
-from typing import Dict, List, Optional, Any
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 from datetime import datetime
+from uuid import uuid4
 import sys
 import os
 
+logger = logging.getLogger(__name__)
+
+# Inline config dùng khi không import được country_config - COMPLETE with all countries
+_FALLBACK_COUNTRY_CONFIG = {
+    'Vietnam': {
+        'code': 'VN', 'table': 'helpdesk_ticket', 'prefix': 'VN',
+        'name_template': 'From Telegram Vietnam',
+        'description_template': 'Ticket từ Vietnam cho user request. {description}',
+        'team_id': 1, 'stage_id': 1
+    },
+    'Thailand': {
+        'code': 'TH', 'table': 'helpdesk_ticket_thailand', 'prefix': 'TH',
+        'name_template': 'From Telegram Thailand',
+        'description_template': 'Ticket từ Thailand cho user request. {description}',
+        'team_id': 2, 'stage_id': 1
+    },
+    'India': {
+        'code': 'IN', 'table': 'helpdesk_ticket_india', 'prefix': 'IN',
+        'name_template': 'From Telegram India',
+        'description_template': 'Ticket từ India cho user request. {description}',
+        'team_id': 3, 'stage_id': 1
+    },
+    'Singapore': {
+        'code': 'SG', 'table': 'helpdesk_ticket_singapore', 'prefix': 'SG',
+        'name_template': 'From Telegram Singapore',
+        'description_template': 'Ticket từ Singapore cho user request. {description}',
+        'team_id': 4, 'stage_id': 1
+    },
+    'Philippines': {
+        'code': 'PH', 'table': 'helpdesk_ticket_philippines', 'prefix': 'PH',
+        'name_template': 'From Telegram Philippines',
+        'description_template': 'Ticket từ Philippines cho user request. {description}',
+        'team_id': 4, 'stage_id': 1
+    },
+    'Malaysia': {
+        'code': 'MY', 'table': 'helpdesk_ticket_malaysia', 'prefix': 'MY',
+        'name_template': 'From Telegram Malaysia',
+        'description_template': 'Ticket từ Malaysia cho user request. {description}',
+        'team_id': 5, 'stage_id': 1
+    },
+    'Indonesia': {
+        'code': 'ID', 'table': 'helpdesk_ticket_indonesia', 'prefix': 'ID',
+        'name_template': 'From Telegram Indonesia',
+        'description_template': 'Ticket từ Indonesia cho user request. {description}',
+        'team_id': 6, 'stage_id': 1
+    }
+}
+
 # Import country configuration
 try:
     from ..config.country_config import get_country_config, get_supported_countries
 except ImportError:
-    # Fallback for direct execution
-    import sys
-    import os
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
-    from country_config import get_country_config, get_supported_countries
+    try:
+        # Fallback for direct execution
+        sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+        from country_config import get_country_config, get_supported_countries
+    except ImportError:
+        def get_country_config(country_name: str) -> Dict[str, Any]:
+            if country_name not in _FALLBACK_COUNTRY_CONFIG:
+                raise ValueError(f"Quốc gia '{country_name}' không được hỗ trợ")
+            return _FALLBACK_COUNTRY_CONFIG[country_name]
+        
+        def get_supported_countries() -> List[str]:
+            return ['Vietnam', 'Thailand', 'India', 'Philippines', 'Malaysia', 'Indonesia']
 
-logger = logging.getLogger(__name__)
+# Từ khóa nhận diện tables có thể chứa tickets
+HELPDESK_TABLE_KEYWORDS = ('helpdesk', 'ticket', 'support', 'issue', 'request')
+
+# Wrapper HTML cho description/comment theo format của Odoo
+ODOO_HTML_OPEN = '<div data-oe-version="1.2">'
+ODOO_HTML_CLOSE = '</div>'
+
+# Số ticket [PREFIX][DDMMYY][XXX] sinh trong SQL: XXX lấy từ sequence quốc gia (001-999),
+# bỏ qua số đã có trong table (sequence + function tạo bởi src/telegram_bot/sql/helpdesk_ticket_number.sql)
+TICKET_NUMBER_SQL = sql.SQL("telegram_next_ticket_number(%s, %s, {table})")
+
+# Placeholder psycopg2 (%s, %% escape) -> asyncpg ($1, $2, ...)
+PYFORMAT_PLACEHOLDER_RE = re.compile(r'%%|%s')
+
+# Cache res_partner lookup theo email cho create_ticket
+PARTNER_CACHE_TTL = 300  # seconds
+PARTNER_CACHE_MAXSIZE = 5000
+
+# Kích thước pool connection psycopg2: mở sẵn ít connection, pool tăng dần đến
+# POOL_MAX_CONNECTIONS khi nhiều thread mượn cùng lúc
+POOL_MAX_CONNECTIONS = 10
+POOL_MIN_CONNECTIONS = 2
+
+# Stage mặc định khi chưa đọc được helpdesk_ticket_stage
+DEFAULT_STAGE_NAMES = {
+    1: "New",
+    2: "In Progress",
+    3: "Waiting",
+    4: "Done",
+    5: "Cancelled"
+}
+
+# Stage "Done" của project_task dùng cho monitor tickets hoàn thành
+COMPLETED_TASK_STAGE_IDS = [3]
+
+# Thời gian cache map stage id <-> name (seconds)
+STAGE_CACHE_TTL = 300
+
+# Priority (0-3) -> giá trị lưu trong helpdesk_ticket.priority
+PRIORITY_STR = {0: '0', 1: '1', 2: '2', 3: '3'}
 
 class PostgreSQLConnector:
     """Class để kết nối trực tiếp với PostgreSQL database"""
     
+    # Cache câu INSERT ticket đã compose: (table, columns, link_partner) -> query
+    _INSERT_TEMPLATES: Dict[Tuple[str, Tuple[str, ...], bool], sql.Composed] = {}
+    
     def __init__(self, host: str, port: int, database: str, username: str, password: str):
         """
         Khởi tạo kết nối PostgreSQL
@@ -41,10 +154,54 @@ class PostgreSQLConnector:
         self.database = database
         self.username = username
         self.password = password
-        self.connection = None
+        self.pool = None
+        
+        # Cache res_partner theo email: email -> (thời điểm cache, partner_id, partner_name)
+        # (create_ticket chạy trên nhiều thread của executor nên mọi thao tác cache đi qua lock)
+        self._partner_cache: "OrderedDict[str, Tuple[float, int, str]]" = OrderedDict()
+        self._partner_cache_lock = threading.Lock()
+        
+        # Cache helpdesk_ticket_stage: id -> name, name.lower() -> id
+        self._stage_names: Dict[int, str] = {}
+        self._stage_ids: Dict[str, int] = {}
+        self._stage_cache_ts = 0.0
+        
+        # Cache schema: helpdesk_ticket có cột additional_info hay không (None = chưa kiểm tra)
+        self._has_additional_info = None
         
         # Kết nối tới PostgreSQL
         self._connect()
+        
+        # Tập tables của schema public (tĩnh trong vòng đời connector), dùng để
+        # chọn table đích của destination mà không cần probe mỗi ticket
+        self._existing_tables = self._load_existing_tables()
+    
+    def _get_stage_map(self) -> Tuple[Dict[int, str], Dict[str, int]]:
+        """
+        Lấy map stage (id -> name, name.lower() -> id) từ helpdesk_ticket_stage
+        
+        Bảng stage rất nhỏ và ít đổi nên được cache trong STAGE_CACHE_TTL giây;
+        nếu chưa đọc được bảng thì dùng DEFAULT_STAGE_NAMES.
+        
+        Returns:
+            (stage_names, stage_ids)
+        """
+        now = time.monotonic()
+        if self._stage_names and now - self._stage_cache_ts < STAGE_CACHE_TTL:
+            return self._stage_names, self._stage_ids
+        
+        try:
+            with self._cursor() as cursor:
+                cursor.execute("SELECT id, name FROM helpdesk_ticket_stage;")
+                stage_names = {row[0]: self._translated_name(row[1], 'Unknown') for row in cursor.fetchall()}
+        except Exception as e:
+            logger.warning(f"Không đọc được helpdesk_ticket_stage, dùng stage mặc định: {e}")
+            stage_names = {}
+        
+        self._stage_names = stage_names or self._stage_names or DEFAULT_STAGE_NAMES
+        self._stage_ids = {name.lower(): stage_id for stage_id, name in self._stage_names.items()}
+        self._stage_cache_ts = now
+        return self._stage_names, self._stage_ids
     
     def get_stage_name(self, stage_id: int) -> str:
         """
@@ -56,22 +213,50 @@ class PostgreSQLConnector:
         Returns:
             Stage name string
         """
-        stage_mapping = {
-            1: "New",
-            2: "In Progress", 
-            3: "Waiting",
-            4: "Done",
-            5: "Cancelled"
-        }
-        return stage_mapping.get(stage_id, "Unknown")
+        stage_names, _ = self._get_stage_map()
+        return stage_names.get(stage_id, "Unknown")
+    
+    @staticmethod
+    def _translated_name(value: Any, default: str = '') -> str:
+        """
+        Lấy tên hiển thị từ cột name (text hoặc jsonb đa ngôn ngữ của Odoo)
+        
+        Args:
+            value: Giá trị cột name (str, dict jsonb hoặc None)
+            default: Giá trị trả về khi rỗng
+            
+        Returns:
+            Tên dạng string
+        """
+        if isinstance(value, str):
+            return value
+        return value.get('en_US', default) if value else default
     
     def _connect(self) -> None:
-        """Kết nối với PostgreSQL server"""
+        """Tạo connection pool tới PostgreSQL server"""
         try:
-            connection_string = f"host='{self.host}' port='{self.port}' dbname='{self.database}' user='{self.username}' password='{self.password}'"
+            # Truyền keyword args trực tiếp (không cần quote password); bật TCP
+            # keepalive để connection idle không bị NAT/firewall cắt
+            self.pool = ThreadedConnectionPool(
+                minconn=POOL_MIN_CONNECTIONS,
+                maxconn=POOL_MAX_CONNECTIONS,
+                host=self.host,
+                port=self.port,
+                dbname=self.database,
+                user=self.username,
+                password=self.password,
+                connect_timeout=5,
+                application_name='telegram_neyu_bot',
+                keepalives=1,
+                keepalives_idle=30
+            )
             
-            self.connection = psycopg2.connect(connection_string)
-            self.connection.autocommit = True
+            # Giới hạn số connection mượn cùng lúc: thread thứ POOL_MAX_CONNECTIONS + 1
+            # chờ connection được trả thay vì nhận PoolError khi pool cạn
+            self._pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+            
+            # Prepared statements thuộc về session: connection -> {tên: câu EXECUTE}
+            self._prepared_statements: Dict[Any, Dict[str, sql.Composed]] = {}
             
             logger.info(f"Kết nối PostgreSQL thành công - {self.host}:{self.port}/{self.database}")
             
@@ -79,6 +264,150 @@ class PostgreSQLConnector:
             logger.error(f"Lỗi kết nối PostgreSQL: {e}")
             raise
     
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        """
+        Mượn một connection (autocommit) từ pool, trả lại pool khi xong kể cả khi
+        lỗi; connection đã bị đóng/đứt thì bị loại khỏi pool. Khi cả
+        POOL_MAX_CONNECTIONS connection đang được mượn thì chờ đến lượt.
+        
+        Yields:
+            psycopg2 connection
+        """
+        self._pool_slots.acquire()
+        try:
+            conn = self.pool.getconn()
+        except Exception:
+            self._pool_slots.release()
+            raise
+        try:
+            if not conn.autocommit:
+                conn.autocommit = True
+            yield conn
+        finally:
+            try:
+                self.pool.putconn(conn, close=bool(conn.closed))
+                # Pool tự đóng connection dư (vượt minconn) khi putconn, nên kiểm tra
+                # sau khi trả để bỏ prepared statements của session đã đóng
+                if conn.closed:
+                    self._prepared_statements.pop(conn, None)
+            finally:
+                self._pool_slots.release()
+    
+    @contextmanager
+    def _cursor(self, cursor_factory=None) -> Iterator[Any]:
+        """
+        Mượn connection từ pool và mở một cursor trên đó; cursor luôn được đóng
+        và connection trả về pool kể cả khi query lỗi.
+        
+        Args:
+            cursor_factory: Cursor class (vd. RealDictCursor); None dùng cursor mặc định
+            
+        Yields:
+            psycopg2 cursor (connection lấy qua cursor.connection)
+        """
+        with self._connection() as conn, conn.cursor(cursor_factory=cursor_factory) as cursor:
+            yield cursor
+    
+    def _execute_prepared(self, cursor, name: str, query: str, params: Tuple) -> None:
+        """
+        Chạy query hot qua prepared statement của session
+        
+        Lần đầu PREPARE (parse + plan một lần), các lần sau chỉ EXECUTE.
+        
+        Args:
+            cursor: Cursor đang dùng
+            name: Tên prepared statement
+            query: Câu query với placeholder $1, $2, ...
+            params: Tham số theo thứ tự placeholder
+        """
+        statements = self._prepared_statements.setdefault(cursor.connection, {})
+        execute_stmt = statements.get(name)
+        if execute_stmt is None:
+            cursor.execute(sql.SQL("PREPARE {} AS {}").format(sql.Identifier(name), sql.SQL(query)))
+            execute_stmt = sql.SQL("EXECUTE {} ({});").format(
+                sql.Identifier(name),
+                sql.SQL(', ').join(sql.Placeholder() * len(params))
+            )
+            statements[name] = execute_stmt
+        cursor.execute(execute_stmt, params)
+    
+    def _iter_rows(self, query: str, params: Tuple = (), itersize: int = 1000) -> Iterator[Tuple]:
+        """
+        Duyệt kết quả lớn bằng server-side (named) cursor, fetch theo từng lô
+        
+        Chỉ dùng cho các query quét rộng (schema, danh sách lớn); các lookup
+        nhỏ vẫn dùng client-side cursor thông thường.
+        
+        Args:
+            query: Câu query
+            params: Tham số cho query
+            itersize: Số rows mỗi lần fetch từ server
+            
+        Yields:
+            Từng row của kết quả
+        """
+        # withhold=True để named cursor dùng được khi connection ở chế độ autocommit
+        with self._connection() as conn, conn.cursor(name=f"srv_{uuid4().hex}", withhold=True) as cursor:
+            cursor.itersize = itersize
+            cursor.execute(query, params)
+            yield from cursor
+    
+    def _load_existing_tables(self) -> set:
+        """
+        Lấy tập tên tables trong schema public (chạy một lần khi khởi tạo)
+        
+        Returns:
+            Set tên tables; rỗng nếu query lỗi (khi đó mọi destination dùng helpdesk_ticket)
+        """
+        try:
+            with self._cursor() as cursor:
+                cursor.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public';")
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.warning(f"Không lấy được danh sách tables: {e}")
+            return set()
+    
+    def _ticket_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Chuẩn hóa row ticket từ RealDictCursor thành dict trả về cho listing
+        
+        stage_name và ngày đã được query trả về dạng text (->>'en_US', to_char),
+        ở đây chỉ fallback stage_name khi ticket không JOIN được stage. Listing không
+        SELECT description (HTML có thể vài KB/ticket) nên description luôn là '';
+        chi tiết ticket lấy qua get_ticket.
+        
+        Args:
+            row: Row dict (có stage_id, stage_name từ LEFT JOIN helpdesk_ticket_stage)
+            
+        Returns:
+            Chính row đó, đã bỏ cột phụ (stage_id, total_count) và chuẩn hóa stage_name
+        """
+        stage_id = row.pop('stage_id', None)
+        row.pop('total_count', None)
+        if not row['stage_name']:
+            row['stage_name'] = self.get_stage_name(stage_id) if stage_id else 'Unknown'
+        row['description'] = ''
+        return row
+    
+    def _ticket_has_additional_info(self, cursor) -> bool:
+        """
+        Kiểm tra helpdesk_ticket có cột additional_info không (chỉ query lần đầu)
+        
+        Schema không đổi trong vòng đời connector nên kết quả được cache,
+        tránh một round trip information_schema cho mỗi ticket.
+        
+        Args:
+            cursor: Cursor đang dùng trong transaction hiện tại
+            
+        Returns:
+            True nếu cột additional_info tồn tại
+        """
+        if self._has_additional_info is None:
+            cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name = 'helpdesk_ticket' AND column_name = 'additional_info'")
+            self._has_additional_info = cursor.fetchone() is not None
+        return self._has_additional_info
+    
     def test_connection(self) -> bool:
         """
         Kiểm tra kết nối với PostgreSQL
@@ -87,12 +416,11 @@ class PostgreSQLConnector:
             True nếu kết nối thành công
         """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT version();")
-            version = cursor.fetchone()
-            cursor.close()
+            with self._cursor() as cursor:
+                cursor.execute("SELECT 1;")
+                server_version = cursor.connection.server_version
             
-            logger.info(f"PostgreSQL version: {version[0]}")
+            logger.info(f"PostgreSQL connection OK (server version {server_version})")
             return True
             
         except Exception as e:
@@ -107,16 +435,12 @@ class PostgreSQLConnector:
             Danh sách tên tables
         """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
+            tables = [row[0] for row in self._iter_rows("""
                 SELECT table_name 
                 FROM information_schema.tables 
                 WHERE table_schema = 'public' 
                 ORDER BY table_name;
-            """)
-            
-            tables = [row[0] for row in cursor.fetchall()]
-            cursor.close()
+            """)]
             
             logger.info(f"Found {len(tables)} tables in database")
             return tables
@@ -133,18 +457,18 @@ class PostgreSQLConnector:
             Danh sách tables có thể chứa tickets
         """
         try:
-            tables = self.list_tables()
-            
-            # Tìm tables có tên liên quan đến helpdesk, ticket, support
-            helpdesk_keywords = ['helpdesk', 'ticket', 'support', 'issue', 'request']
-            helpdesk_tables = []
-            
-            for table in tables:
-                for keyword in helpdesk_keywords:
-                    if keyword in table.lower():
-                        helpdesk_tables.append(table)
-                        break
-            
+            with self._cursor() as cursor:
+                # Lọc tables liên quan đến helpdesk, ticket, support ngay trong SQL
+                cursor.execute("""
+                    SELECT table_name
+                    FROM information_schema.tables
+                    WHERE table_schema = 'public'
+                      AND table_name ILIKE ANY (%s)
+                    ORDER BY table_name;
+                """, ([f"%{keyword}%" for keyword in HELPDESK_TABLE_KEYWORDS],))
+                
+                helpdesk_tables = [row[0] for row in cursor.fetchall()]
+
             logger.info(f"Found potential helpdesk tables: {helpdesk_tables}")
             return helpdesk_tables
             
@@ -163,24 +487,16 @@ class PostgreSQLConnector:
             Danh sách columns với thông tin
         """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                SELECT column_name, data_type, is_nullable, column_default
-                FROM information_schema.columns
-                WHERE table_name = %s
-                ORDER BY ordinal_position;
-            """, (table_name,))
-            
-            columns = []
-            for row in cursor.fetchall():
-                columns.append({
-                    'column_name': row[0],
-                    'data_type': row[1],
-                    'is_nullable': row[2],
-                    'column_default': row[3]
-                })
-            
-            cursor.close()
+            with self._cursor(RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT column_name, data_type, is_nullable, column_default
+                    FROM information_schema.columns
+                    WHERE table_name = %s
+                    ORDER BY ordinal_position;
+                """, (table_name,))
+                
+                columns = cursor.fetchall()
+            
             logger.info(f"Table {table_name} has {len(columns)} columns")
             return columns
             
@@ -196,30 +512,28 @@ class PostgreSQLConnector:
             Dictionary chứa kết quả test
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # Test read access
-            cursor.execute("SELECT COUNT(*) FROM helpdesk_ticket;")
-            count = cursor.fetchone()[0]
-            
-            # Get latest Vietnam tickets
-            cursor.execute("""
-                SELECT id, number, name, description, create_date 
-                FROM helpdesk_ticket 
-                WHERE name LIKE '%TKVN%' OR number LIKE 'HT%'
-                ORDER BY id DESC 
-                LIMIT 5;
-            """)
-            vietnam_tickets = cursor.fetchall()
-            
-            cursor.close()
+            with self._cursor() as cursor:
+                # Test read access (số records lấy từ ước lượng của planner, tránh seq scan COUNT(*))
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = 'helpdesk_ticket';")
+                estimate = cursor.fetchone()
+                count = max(estimate[0], 0) if estimate else 0
+                
+                # Get latest Vietnam tickets
+                cursor.execute("""
+                    SELECT id, number, name, description, create_date 
+                    FROM helpdesk_ticket 
+                    WHERE name LIKE '%TKVN%' OR number LIKE 'HT%'
+                    ORDER BY id DESC 
+                    LIMIT 5;
+                """)
+                vietnam_tickets = cursor.fetchall()
             
             return {
                 'success': True,
                 'has_read_access': True,
                 'record_count': count,
                 'vietnam_tickets': vietnam_tickets,
-                'message': f'Có quyền truy cập helpdesk_ticket với {count} records, {len(vietnam_tickets)} Vietnam tickets'
+                'message': f'Có quyền truy cập helpdesk_ticket với ~{count} records, {len(vietnam_tickets)} Vietnam tickets'
             }
             
         except Exception as e:
@@ -230,130 +544,319 @@ class PostgreSQLConnector:
                 'message': f'Lỗi truy cập helpdesk_ticket: {e}'
             }
 
-    def generate_vietnam_ticket_number(self) -> str:
+    def _get_cached_partner(self, email: str) -> Optional[Tuple[int, str]]:
         """
-        Tạo số ticket VN theo format mới
+        Lấy partner (id, name) đã cache theo email nếu còn hạn
         
+        Args:
+            email: Email của partner
+            
         Returns:
-            Ticket number theo format VN[DDMMYY][XXX] (VN220925001)
+            (partner_id, partner_name) hoặc None nếu chưa cache / đã hết hạn
         """
-        try:
-            # Use the new format for Vietnam tickets
-            return self.generate_ticket_number("Vietnam")
+        with self._partner_cache_lock:
+            entry = self._partner_cache.get(email)
+            if entry is None:
+                return None
             
-        except Exception as e:
-            logger.error(f"Lỗi tạo Vietnam ticket number: {e}")
-            # Fallback with new format
-            from datetime import datetime
-            import random
-            date_part = datetime.now().strftime('%d%m%y')
-            return f"VN{date_part}{str(random.randint(1, 999)).zfill(3)}"
+            cached_at, partner_id, partner_name = entry
+            if time.monotonic() - cached_at > PARTNER_CACHE_TTL:
+                del self._partner_cache[email]
+                return None
+            
+            self._partner_cache.move_to_end(email)
+            return partner_id, partner_name
+    
+    def _cache_partner(self, email: str, partner_id: int, partner_name: str) -> None:
+        """Cache partner tìm được theo email (LRU, giới hạn PARTNER_CACHE_MAXSIZE)"""
+        with self._partner_cache_lock:
+            self._partner_cache[email] = (time.monotonic(), partner_id, partner_name)
+            self._partner_cache.move_to_end(email)
+            if len(self._partner_cache) > PARTNER_CACHE_MAXSIZE:
+                self._partner_cache.popitem(last=False)
+    
+    def invalidate_partner_cache(self, email: Optional[str] = None) -> None:
+        """
+        Xóa cache res_partner (ví dụ sau khi admin sửa/gộp partner)
+        
+        Args:
+            email: Chỉ xóa entry của email này; None để xóa toàn bộ
+        """
+        with self._partner_cache_lock:
+            if email is None:
+                self._partner_cache.clear()
+            else:
+                self._partner_cache.pop(email, None)
     
-    def generate_ticket_number(self, country: str, table_name: str = None) -> str:
+    @staticmethod
+    def _number_sequence(prefix: str) -> str:
         """
-        Tạo số ticket theo quốc gia (Multi-destination support)
+        Lấy tên sequence sinh số ticket của quốc gia
+        
+        Sequence được tạo sẵn (và seed qua các số đã dùng) bởi migration
+        src/telegram_bot/sql/helpdesk_ticket_number.sql.
         
         Args:
-            country: Tên quốc gia (Vietnam, Thailand, India, etc.)
-            table_name: Tên bảng (optional, sẽ lấy từ config)
+            prefix: Prefix quốc gia (VN, TH, ...)
             
         Returns:
-            Ticket number theo format [COUNTRY_CODE][DDMMYY][XXX] (VN22092501, TH22092502, etc.)
+            Tên sequence (helpdesk_ticket_vn_seq, helpdesk_ticket_th_seq, ...)
         """
-        try:
-            # Load country config with fallback
-            try:
-                from ..config.country_config import get_country_config
-            except ImportError:
-                # Inline config as fallback - UPDATED to include all countries
-                COUNTRY_CONFIG = {
-                    'Vietnam': {'code': 'VN', 'table': 'helpdesk_ticket', 'prefix': 'VN'},
-                    'Thailand': {'code': 'TH', 'table': 'helpdesk_ticket_thailand', 'prefix': 'TH'},
-                    'India': {'code': 'IN', 'table': 'helpdesk_ticket_india', 'prefix': 'IN'},
-                    'Singapore': {'code': 'SG', 'table': 'helpdesk_ticket_singapore', 'prefix': 'SG'},
-                    'Philippines': {'code': 'PH', 'table': 'helpdesk_ticket_philippines', 'prefix': 'PH'},
-                    'Malaysia': {'code': 'MY', 'table': 'helpdesk_ticket_malaysia', 'prefix': 'MY'},
-                    'Indonesia': {'code': 'ID', 'table': 'helpdesk_ticket_indonesia', 'prefix': 'ID'}
-                }
-                
-                def get_country_config(country_name):
-                    if country_name not in COUNTRY_CONFIG:
-                        raise ValueError(f"Quốc gia '{country_name}' không được hỗ trợ")
-                    return COUNTRY_CONFIG[country_name]
-            
-            config = get_country_config(country)
-            prefix = config['prefix']
-            target_table = table_name or config['table']
-            
-            # Generate date part DDMMYY
-            from datetime import datetime
-            now = datetime.now()
-            date_part = now.strftime('%d%m%y')  # Format: DDMMYY (22/09/25 -> 220925)
-            
-            # Generate unique ticket number with microsecond precision to avoid collisions
-            import time
-            import random
-            
-            # Use microsecond timestamp + random number for uniqueness
-            microsecond = int(time.time() * 1000000) % 1000  # Last 3 digits of microseconds
-            random_part = random.randint(0, 99)  # Random 2 digits
-            
-            # Combine to create unique 3-digit sequence
-            unique_sequence = (microsecond + random_part) % 1000
-            if unique_sequence == 0:
-                unique_sequence = 1
-                
-            today_prefix = f"{prefix}{date_part}"
-            ticket_number = f"{today_prefix}{str(unique_sequence).zfill(3)}"
+        return f"helpdesk_ticket_{prefix.lower()}_seq"
+    
+    def _get_insert_query(self, table_name: str, columns: Tuple[str, ...], link_partner: bool) -> sql.Composed:
+        """
+        Lấy câu INSERT ticket đã compose sẵn cho (table, columns, link_partner)
+        
+        Tập columns của mỗi destination rất nhỏ và cố định nên query được
+        compose một lần (quote identifier an toàn qua psycopg2.sql) rồi cache lại.
+        
+        Args:
+            table_name: Table đích của destination
+            columns: Danh sách cột theo đúng thứ tự values
+            link_partner: True nếu cần link res_partner theo email (portal user)
             
-            # Fallback: if somehow still collision, add more randomness
-            cursor = self.connection.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM {target_table} WHERE number = %s", (ticket_number,))
-            if cursor.fetchone()[0] > 0:
-                # Collision detected, use random number
-                random_seq = random.randint(100, 999)
-                ticket_number = f"{today_prefix}{random_seq}"
+        Returns:
+            Câu INSERT ... RETURNING id, number, name, partner_id, partner_full_name
             
-            cursor.close()
-            logger.info(f"Generated {country} Ticket number: {ticket_number}")
-            return ticket_number
+        Số ticket được sinh ngay trong INSERT: [PREFIX][DDMMYY][XXX], với XXX lấy
+        từ sequence của quốc gia (001-999) và bỏ qua số đã tồn tại trong table,
+        nên tham số đầu tiên của phần VALUES là "[PREFIX][DDMMYY]" và tham số thứ
+        hai là tên sequence.
+        """
+        key = (table_name, columns, link_partner)
+        query = self._INSERT_TEMPLATES.get(key)
+        if query is None:
+            columns_sql = sql.SQL(', ').join(map(sql.Identifier, columns))
+            placeholders = sql.SQL(', ').join(sql.Placeholder() * len(columns))
+            
+            if link_partner:
+                # Link to existing partner (like ticket TH230925353) trong cùng câu INSERT;
+                # nếu partner không tồn tại vẫn lưu email/name để tham chiếu
+                template = sql.SQL("""
+                    WITH p AS (
+                        SELECT id, name FROM res_partner 
+                        WHERE email = %s AND active = true
+                        LIMIT 1
+                    )
+                    INSERT INTO {table} (number, {columns}, partner_id, commercial_partner_id, partner_name)
+                    VALUES ({number}, {placeholders}, (SELECT id FROM p), (SELECT id FROM p),
+                            COALESCE(%s, (SELECT name FROM p), %s))
+                    RETURNING id, number, name, partner_id, (SELECT name FROM p);
+                """)
+            else:
+                template = sql.SQL("""
+                    INSERT INTO {table} (number, {columns})
+                    VALUES ({number}, {placeholders})
+                    RETURNING id, number, name, partner_id, NULL;
+                """)
+            
+            query = template.format(
+                table=sql.Identifier(table_name),
+                number=TICKET_NUMBER_SQL.format(table=sql.Literal(table_name)),
+                columns=columns_sql,
+                placeholders=placeholders
+            )
+            self._INSERT_TEMPLATES[key] = query
+        
+        return query
+    
+    def _prepare_ticket_insert(self, cursor, ticket_data: Dict[str, Any], destination: str,
+                               config: Dict[str, Any]) -> Tuple[Tuple[str, Tuple[str, ...], bool], List[Any], Optional[str]]:
+        """
+        Chuẩn bị câu INSERT và tham số cho ticket của destination
+        
+        Dùng chung cho create_ticket (psycopg2) và create_ticket_async (asyncpg).
+        
+        Args:
+            cursor: Cursor psycopg2 cho probe schema chạy lần đầu (None được khi
+                probe đã cache)
+            ticket_data: Dictionary chứa thông tin ticket
+            destination: Điểm đến
+            config: Country config của destination
             
-        except Exception as e:
-            logger.error(f"Lỗi tạo {country} ticket number: {e}")
-            # Fallback - generate random number with CORRECT prefix from config
-            import random
-            from datetime import datetime
+        Returns:
+            (insert_key, params, link_email) - insert_key là (table, columns,
+            link_partner) của _get_insert_query; link_email là email được link
+            res_partner ngay trong INSERT (None nếu không link)
+        """
+        # Chuẩn bị dữ liệu theo config của destination
+        current_time = datetime.now()
+        
+        # Số ticket được sinh trong INSERT từ prefix ngày + sequence của destination
+        number_prefix = f"{config['prefix']}{current_time.strftime('%d%m%y')}"
+        number_sequence = self._number_sequence(config['prefix'])
+        
+        # Format description theo template của destination
+        user_description = ticket_data.get("description", f"User request from {destination}")
+        description_text = config['description_template'].format(description=user_description)
+        description_html = ''.join((ODOO_HTML_OPEN, description_text, ODOO_HTML_CLOSE))
+        
+        # Tạo data structure cho ticket
+        # Thêm user identifier vào name template (luôn ưu tiên Telegram username)
+        telegram_username = ticket_data.get('telegram_username', '').strip()
+        if telegram_username and telegram_username != 'None':
+            user_identifier = f"user:@{telegram_username}"
+        else:
+            # Fallback: sử dụng authenticated email hoặc unknown
+            user_identifier = ticket_data.get('partner_email') or ticket_data.get('email', 'unknown@email.com')
+        
+        ticket_name_with_identifier = f"{config['name_template']} - {user_identifier}"
+        priority = ticket_data.get('priority', '1')
+        
+        helpdesk_data = {
+            'name': ticket_name_with_identifier,  # From Telegram Vietnam - user:@Leo2479 or user@email.com
+            'description': description_html,
+            'priority': PRIORITY_STR.get(priority) or str(priority),
+            'stage_id': config['stage_id'],  # Stage cho destination
+            'team_id': config['team_id'],    # Team cho destination
+            'company_id': 1,  # Required field
+            'create_uid': 1,  # Default user
+            'write_uid': 1,   # Default user
+            'create_date': current_time,
+            'write_date': current_time,
+            'active': True,
+            'unattended': True,
+            'sequence': 10
+        }
+        
+        # Add user type tracking fields if available
+        user_type = ticket_data.get('user_type')
+        auth_method = ticket_data.get('auth_method')
+        source = ticket_data.get('source')
+        
+        if user_type:
+            # Store user type information in description or additional_info field
+            additional_info = {
+                'user_type': user_type,
+                'auth_method': auth_method,
+                'source': source,
+                'created_via': ticket_data.get('created_via', 'telegram_bot'),
+                'requires_approval': ticket_data.get('requires_approval', False),
+                'auto_assign': ticket_data.get('auto_assign', True)
+            }
             
-            # Use the correct prefix from config, not country name
+            # Try to add to additional_info field if it exists, otherwise add to description
             try:
-                # Try to get correct prefix from config
-                try:
-                    from ..config.country_config import get_country_config
-                except ImportError:
-                    # Inline config as fallback
-                    COUNTRY_CONFIG = {
-                        'Vietnam': {'code': 'VN', 'table': 'helpdesk_ticket', 'prefix': 'VN'},
-                        'Thailand': {'code': 'TH', 'table': 'helpdesk_ticket_thailand', 'prefix': 'TH'},
-                        'India': {'code': 'IN', 'table': 'helpdesk_ticket_india', 'prefix': 'IN'},
-                        'Singapore': {'code': 'SG', 'table': 'helpdesk_ticket_singapore', 'prefix': 'SG'},
-                        'Philippines': {'code': 'PH', 'table': 'helpdesk_ticket_philippines', 'prefix': 'PH'},
-                        'Malaysia': {'code': 'MY', 'table': 'helpdesk_ticket_malaysia', 'prefix': 'MY'},
-                        'Indonesia': {'code': 'ID', 'table': 'helpdesk_ticket_indonesia', 'prefix': 'ID'}
-                    }
-                    
-                    def get_country_config(country_name):
-                        if country_name not in COUNTRY_CONFIG:
-                            raise ValueError(f"Quốc gia '{country_name}' không được hỗ trợ")
-                        return COUNTRY_CONFIG[country_name]
+                if self._ticket_has_additional_info(cursor):
+                    helpdesk_data['additional_info'] = json.dumps(additional_info)
+                else:
+                    # Append to description if no additional_info field
+                    user_type_info = f"<!-- User Type: {user_type}, Auth: {auth_method}, Source: {source} -->"
+                    helpdesk_data['description'] = description_html + user_type_info
+            except Exception as e:
+                logger.warning(f"Could not check additional_info field: {e}")
+                # Fallback: append to description
+                user_type_info = f"<!-- User Type: {user_type}, Auth: {auth_method}, Source: {source} -->"
+                helpdesk_data['description'] = description_html + user_type_info
+            
+            logger.info(f"Added user type tracking: {user_type} via {auth_method} from {source}")
+            
+            # Handle portal user special requirements
+            if user_type == 'portal_user':
+                # Portal users might need different stage or special handling
+                if ticket_data.get('requires_approval'):
+                    # Set to a "pending approval" stage if it exists
+                    # For now, keep default stage but log the requirement
+                    logger.info(f"Portal user {destination} ticket requires approval")
                 
-                config = get_country_config(country)
-                fallback_prefix = config['prefix']
-            except:
-                # Last resort fallback
-                fallback_prefix = country[:2].upper() if len(country) >= 2 else "XX"
-            
-            date_part = datetime.now().strftime('%d%m%y')
-            return f"{fallback_prefix}{date_part}{str(random.randint(1, 999)).zfill(3)}"
+                if not ticket_data.get('auto_assign', True):
+                    # Don't auto-assign to any user - keep user_id as None
+                    logger.info(f"Portal user {destination} ticket will not be auto-assigned")
+        
+        # Handle partner/contact information with special processing for portal users
+        partner_email = ticket_data.get('partner_email')
+        partner_name = ticket_data.get('partner_name')
+        user_type = ticket_data.get('user_type')
+        link_partner = False
+        
+        if partner_email:
+            helpdesk_data['partner_email'] = partner_email
+            logger.info(f"Adding partner_email: {partner_email}")
+            
+            # For portal users, automatically link to existing partner or create contact reference
+            if user_type == 'portal_user':
+                logger.info(f"Processing portal user contact linking for {partner_email}")
+                
+                cached_partner = self._get_cached_partner(partner_email)
+                if cached_partner:
+                    partner_id, partner_full_name = cached_partner
+                    
+                    # Link to existing partner (like ticket TH230925353) từ cache
+                    helpdesk_data['partner_id'] = partner_id
+                    helpdesk_data['commercial_partner_id'] = partner_id
+                    helpdesk_data['partner_name'] = partner_name or partner_full_name
+                    
+                    logger.info(f"Portal user ticket linked to cached partner ID {partner_id} ({partner_full_name})")
+                else:
+                    # Partner lookup được gộp vào INSERT (CTE) bên dưới để bỏ một round trip
+                    link_partner = True
+            else:
+                # For admin/helpdesk users, just set the email/name without auto-linking
+                if partner_name:
+                    helpdesk_data['partner_name'] = partner_name
+                    logger.info(f"Admin user ticket with contact info: {partner_email}")
+        
+        elif user_type == 'portal_user':
+            # Portal user but no email provided - this shouldn't happen but handle gracefully
+            logger.warning(f"Portal user ticket created without partner email - this may indicate an authentication issue")
+        
+        # Tạo INSERT query cho table của destination
+        table_name = config['table']
+        columns = tuple(helpdesk_data.keys())
+        values = list(helpdesk_data.values())
+        
+        # Kiểm tra xem table có tồn tại không (fallback về helpdesk_ticket)
+        if table_name not in self._existing_tables:
+            logger.warning(f"Table {table_name} không tồn tại, fallback về helpdesk_ticket")
+            table_name = 'helpdesk_ticket'
+        
+        insert_key = (table_name, columns, link_partner)
+        if link_partner:
+            params = [partner_email, number_prefix, number_sequence, *values, partner_name or None, partner_email]
+        else:
+            params = [number_prefix, number_sequence, *values]
+        
+        return insert_key, params, (partner_email if link_partner else None)
+    
+    def _ticket_created_result(self, row: Tuple, destination: str, config: Dict[str, Any],
+                               link_email: Optional[str]) -> Dict[str, Any]:
+        """
+        Tạo kết quả trả về từ row RETURNING của câu INSERT ticket
+        
+        Args:
+            row: (id, number, name, partner_id, partner_full_name)
+            destination: Điểm đến
+            config: Country config của destination
+            link_email: Email đã link res_partner trong INSERT (None nếu không link)
+            
+        Returns:
+            Dictionary chứa kết quả tạo ticket
+        """
+        ticket_id, returned_number, ticket_name, partner_id, partner_full_name = row
+        
+        if link_email:
+            if partner_id:
+                self._cache_partner(link_email, partner_id, partner_full_name)
+                logger.info(f"Portal user ticket linked to existing partner ID {partner_id} ({partner_full_name})")
+            else:
+                # Note: In production, you might want to create a new partner here
+                # or handle this case differently based on business rules
+                logger.info(f"Portal user ticket created with email reference (no existing partner found)")
+        
+        logger.info(f"Tạo {destination} Ticket thành công: ID={ticket_id}, Number={returned_number}, Name={ticket_name}")
+        
+        return {
+            'success': True,
+            'ticket_id': ticket_id,
+            'ticket_number': returned_number,
+            'ticket_name': ticket_name,
+            'destination': destination,
+            'destination_code': config['code'],
+            'ticket_full_id': f"{returned_number} - {ticket_name}",
+            'state': 'created',
+            'message': f'{destination} Ticket {returned_number} - {ticket_name} (#{ticket_id}) đã được tạo thành công'
+        }
     
     def create_ticket(self, ticket_data: Dict[str, Any], destination: str = "Vietnam") -> Dict[str, Any]:
         """
@@ -371,246 +874,19 @@ class PostgreSQLConnector:
             Dictionary chứa kết quả tạo ticket
         """
         try:
-            # Load country configuration with fallback
-            try:
-                from ..config.country_config import get_country_config
-            except ImportError:
-                # Inline config as fallback - COMPLETE with all countries
-                COUNTRY_CONFIG = {
-                    'Vietnam': {
-                        'code': 'VN', 'table': 'helpdesk_ticket', 'prefix': 'VN',
-                        'name_template': 'From Telegram Vietnam',
-                        'description_template': 'Ticket từ Vietnam cho user request. {description}',
-                        'team_id': 1, 'stage_id': 1
-                    },
-                    'Thailand': {
-                        'code': 'TH', 'table': 'helpdesk_ticket_thailand', 'prefix': 'TH',
-                        'name_template': 'From Telegram Thailand',
-                        'description_template': 'Ticket từ Thailand cho user request. {description}',
-                        'team_id': 2, 'stage_id': 1
-                    },
-                    'India': {
-                        'code': 'IN', 'table': 'helpdesk_ticket_india', 'prefix': 'IN',
-                        'name_template': 'From Telegram India',
-                        'description_template': 'Ticket từ India cho user request. {description}',
-                        'team_id': 3, 'stage_id': 1
-                    },
-                    'Singapore': {
-                        'code': 'SG', 'table': 'helpdesk_ticket_singapore', 'prefix': 'SG',
-                        'name_template': 'From Telegram Singapore',
-                        'description_template': 'Ticket từ Singapore cho user request. {description}',
-                        'team_id': 4, 'stage_id': 1
-                    },
-                    'Philippines': {
-                        'code': 'PH', 'table': 'helpdesk_ticket_philippines', 'prefix': 'PH',
-                        'name_template': 'From Telegram Philippines',
-                        'description_template': 'Ticket từ Philippines cho user request. {description}',
-                        'team_id': 4, 'stage_id': 1
-                    },
-                    'Malaysia': {
-                        'code': 'MY', 'table': 'helpdesk_ticket_malaysia', 'prefix': 'MY',
-                        'name_template': 'From Telegram Malaysia',
-                        'description_template': 'Ticket từ Malaysia cho user request. {description}',
-                        'team_id': 5, 'stage_id': 1
-                    },
-                    'Indonesia': {
-                        'code': 'ID', 'table': 'helpdesk_ticket_indonesia', 'prefix': 'ID',
-                        'name_template': 'From Telegram Indonesia',
-                        'description_template': 'Ticket từ Indonesia cho user request. {description}',
-                        'team_id': 6, 'stage_id': 1
-                    }
-                }
-                
-                def get_country_config(country_name):
-                    if country_name not in COUNTRY_CONFIG:
-                        raise ValueError(f"Quốc gia '{country_name}' không được hỗ trợ")
-                    return COUNTRY_CONFIG[country_name]
-            
             # Get destination configuration
             config = get_country_config(destination)
             
-            cursor = self.connection.cursor()
-            
-            # Generate ticket number cho destination này
-            ticket_number = self.generate_ticket_number(destination, config['table'])
-            
-            # Chuẩn bị dữ liệu theo config của destination
-            current_time = datetime.now()
-            
-            # Format description theo template của destination
-            user_description = ticket_data.get("description", f"User request from {destination}")
-            description_text = config['description_template'].format(description=user_description)
-            description_html = f'<div data-oe-version="1.2">{description_text}</div>'
-            
-            # Tạo data structure cho ticket
-            # Thêm user identifier vào name template (luôn ưu tiên Telegram username)
-            telegram_username = ticket_data.get('telegram_username', '').strip()
-            if telegram_username and telegram_username != 'None' and telegram_username != '':
-                user_identifier = f"user:@{telegram_username}"
-            else:
-                # Fallback: sử dụng authenticated email hoặc unknown
-                user_email = ticket_data.get('partner_email') or ticket_data.get('email', 'unknown@email.com')
-                user_identifier = user_email
-            
-            ticket_name_with_identifier = f"{config['name_template']} - {user_identifier}"
-            
-            helpdesk_data = {
-                'number': ticket_number,  # VN00001, TH00001, etc.
-                'name': ticket_name_with_identifier,  # From Telegram Vietnam - user:@Leo2479 or user@email.com
-                'description': description_html,
-                'priority': str(ticket_data.get('priority', '1')),
-                'stage_id': config['stage_id'],  # Stage cho destination
-                'team_id': config['team_id'],    # Team cho destination
-                'company_id': 1,  # Required field
-                'create_uid': 1,  # Default user
-                'write_uid': 1,   # Default user
-                'create_date': current_time,
-                'write_date': current_time,
-                'active': True,
-                'unattended': True,
-                'sequence': 10
-            }
-            
-            # Add user type tracking fields if available
-            user_type = ticket_data.get('user_type')
-            auth_method = ticket_data.get('auth_method')
-            source = ticket_data.get('source')
-            
-            if user_type:
-                # Store user type information in description or additional_info field
-                additional_info = {
-                    'user_type': user_type,
-                    'auth_method': auth_method,
-                    'source': source,
-                    'created_via': ticket_data.get('created_via', 'telegram_bot'),
-                    'requires_approval': ticket_data.get('requires_approval', False),
-                    'auto_assign': ticket_data.get('auto_assign', True)
-                }
-                
-                # Try to add to additional_info field if it exists, otherwise add to description
-                try:
-                    cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name = 'helpdesk_ticket' AND column_name = 'additional_info'")
-                    if cursor.fetchone():
-                        import json
-                        helpdesk_data['additional_info'] = json.dumps(additional_info)
-                    else:
-                        # Append to description if no additional_info field
-                        user_type_info = f"<!-- User Type: {user_type}, Auth: {auth_method}, Source: {source} -->"
-                        helpdesk_data['description'] = description_html + user_type_info
-                except Exception as e:
-                    logger.warning(f"Could not check additional_info field: {e}")
-                    # Fallback: append to description
-                    user_type_info = f"<!-- User Type: {user_type}, Auth: {auth_method}, Source: {source} -->"
-                    helpdesk_data['description'] = description_html + user_type_info
+            with self._cursor() as cursor:
+                insert_key, params, link_email = self._prepare_ticket_insert(cursor, ticket_data, destination, config)
                 
-                logger.info(f"Added user type tracking: {user_type} via {auth_method} from {source}")
-                
-                # Handle portal user special requirements
-                if user_type == 'portal_user':
-                    # Portal users might need different stage or special handling
-                    if ticket_data.get('requires_approval'):
-                        # Set to a "pending approval" stage if it exists
-                        # For now, keep default stage but log the requirement
-                        logger.info(f"Portal user ticket {ticket_number} requires approval")
-                    
-                    if not ticket_data.get('auto_assign', True):
-                        # Don't auto-assign to any user - keep user_id as None
-                        logger.info(f"Portal user ticket {ticket_number} will not be auto-assigned")
-            
-            # Handle partner/contact information with special processing for portal users
-            partner_email = ticket_data.get('partner_email')
-            partner_name = ticket_data.get('partner_name')
-            user_type = ticket_data.get('user_type')
-            
-            if partner_email:
-                helpdesk_data['partner_email'] = partner_email
-                logger.info(f"Adding partner_email: {partner_email}")
-                
-                # For portal users, automatically link to existing partner or create contact reference
-                if user_type == 'portal_user':
-                    logger.info(f"Processing portal user contact linking for {partner_email}")
-                    
-                    # Find existing partner by email
-                    cursor.execute("""
-                        SELECT id, name FROM res_partner 
-                        WHERE email = %s AND active = true
-                    """, (partner_email,))
-                    
-                    existing_partner = cursor.fetchone()
-                    if existing_partner:
-                        partner_id, partner_full_name = existing_partner
-                        
-                        # Link to existing partner (like ticket TH230925353)
-                        helpdesk_data['partner_id'] = partner_id
-                        helpdesk_data['commercial_partner_id'] = partner_id
-                        helpdesk_data['partner_name'] = partner_name or partner_full_name
-                        
-                        logger.info(f"Portal user ticket linked to existing partner ID {partner_id} ({partner_full_name})")
-                    else:
-                        # Partner doesn't exist - still set email/name for reference
-                        helpdesk_data['partner_name'] = partner_name or partner_email
-                        logger.info(f"Portal user ticket created with email reference (no existing partner found)")
-                        
-                        # Note: In production, you might want to create a new partner here
-                        # or handle this case differently based on business rules
-                else:
-                    # For admin/helpdesk users, just set the email/name without auto-linking
-                    if partner_name:
-                        helpdesk_data['partner_name'] = partner_name
-                        logger.info(f"Admin user ticket with contact info: {partner_email}")
-            
-            elif user_type == 'portal_user':
-                # Portal user but no email provided - this shouldn't happen but handle gracefully
-                logger.warning(f"Portal user ticket created without partner email - this may indicate an authentication issue")
-            
-            # Tạo INSERT query cho table của destination
-            table_name = config['table']
-            columns = list(helpdesk_data.keys())
-            values = list(helpdesk_data.values())
-            columns_str = ', '.join(columns)
-            placeholders = ', '.join(['%s'] * len(values))
-            
-            # Kiểm tra xem table có tồn tại không (fallback về helpdesk_ticket)
-            try:
-                cursor.execute(f"SELECT 1 FROM {table_name} LIMIT 1;")
-            except Exception:
-                logger.warning(f"Table {table_name} không tồn tại, fallback về helpdesk_ticket")
-                table_name = 'helpdesk_ticket'
-            
-            insert_query = f"""
-                INSERT INTO {table_name} ({columns_str})
-                VALUES ({placeholders})
-                RETURNING id, number, name;
-            """
-            
-            cursor.execute(insert_query, values)
-            result = cursor.fetchone()
-            ticket_id, returned_number, ticket_name = result
+                cursor.execute(self._get_insert_query(*insert_key), params)
+                result = cursor.fetchone()
             
-            self.connection.commit()
-            cursor.close()
-            
-            logger.info(f"Tạo {destination} Ticket thành công: ID={ticket_id}, Number={returned_number}, Name={ticket_name}")
-            
-            return {
-                'success': True,
-                'ticket_id': ticket_id,
-                'ticket_number': returned_number,
-                'ticket_name': ticket_name,
-                'destination': destination,
-                'destination_code': config['code'],
-                'ticket_full_id': f"{returned_number} - {ticket_name}",
-                'state': 'created',
-                'message': f'{destination} Ticket {returned_number} - {ticket_name} (#{ticket_id}) đã được tạo thành công'
-            }
+            return self._ticket_created_result(result, destination, config, link_email)
             
         except Exception as e:
             logger.error(f"Lỗi tạo {destination} ticket: {e}")
-            if hasattr(self, 'connection'):
-                try:
-                    self.connection.rollback()
-                except:
-                    pass
             return {
                 'success': False,
                 'error': str(e),
@@ -618,6 +894,23 @@ class PostgreSQLConnector:
                 'message': f'Không thể tạo {destination} ticket. Vui lòng thử lại.'
             }
     
+    async def create_ticket_async(self, ticket_data: Dict[str, Any], destination: str = "Vietnam") -> Dict[str, Any]:
+        """
+        Tạo ticket từ async handler mà không block event loop
+        
+        create_ticket mượn connection riêng từ pool psycopg2 nên chạy được trong
+        thread pool; AsyncPostgreSQLConnector override bằng asyncpg pool.
+        
+        Args:
+            ticket_data: Dictionary chứa thông tin ticket
+            destination: Điểm đến
+            
+        Returns:
+            Dictionary chứa kết quả tạo ticket
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.create_ticket, ticket_data, destination)
+    
     # Destination-specific wrapper methods for easy access
     def create_vietnam_ticket(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
         """Tạo Vietnam ticket (VN00XXX - From Telegram Vietnam)"""
@@ -645,11 +938,7 @@ class PostgreSQLConnector:
     
     def get_supported_destinations(self) -> List[str]:
         """Trả về danh sách các destination được hỗ trợ"""
-        try:
-            from ..config.country_config import get_supported_countries
-            return get_supported_countries()
-        except ImportError:
-            return ['Vietnam', 'Thailand', 'India', 'Philippines', 'Malaysia', 'Indonesia']
+        return get_supported_countries()
     
     def get_ticket(self, ticket_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -662,8 +951,6 @@ class PostgreSQLConnector:
             Dictionary chứa thông tin ticket hoặc None nếu không tìm thấy
         """
         try:
-            cursor = self.connection.cursor()
-            
             # Query từ project_task với join để lấy thêm thông tin
             query = """
                 SELECT 
@@ -674,7 +961,7 @@ class PostgreSQLConnector:
                     pt.priority,
                     pt.project_id,
                     pt.stage_id,
-                    pt.x_tracking_id,
+                    pt.x_tracking_id as tracking_id,
                     pt.create_date,
                     pt.write_date,
                     pp.name as project_name,
@@ -682,33 +969,22 @@ class PostgreSQLConnector:
                 FROM project_task pt
                 LEFT JOIN project_project pp ON pt.project_id = pp.id
                 LEFT JOIN project_project_stage pps ON pt.stage_id = pps.id
-                WHERE pt.id = %s;
+                WHERE pt.id = $1
             """
             
-            cursor.execute(query, (ticket_id,))
-            row = cursor.fetchone()
+            with self._cursor(RealDictCursor) as cursor:
+                self._execute_prepared(cursor, 'get_ticket_ps', query, (ticket_id,))
+                row = cursor.fetchone()
             
             if not row:
-                cursor.close()
                 return None
             
-            # Map kết quả
-            ticket_info = {
-                'id': row[0],
-                'name': row[1],
-                'description': row[2] or '',
-                'state': row[3],
-                'priority': row[4],
-                'project_id': row[5],
-                'stage_id': row[6],
-                'tracking_id': row[7],
-                'create_date': row[8],
-                'write_date': row[9],
-                'project_name': row[10] if isinstance(row[10], str) else (row[10].get('en_US', '') if row[10] else ''),
-                'stage_name': row[11] if isinstance(row[11], str) else (row[11].get('en_US', '') if row[11] else '')
-            }
+            # Row đã là dict; chỉ chuẩn hóa các field có thể NULL / jsonb
+            ticket_info = row
+            ticket_info['description'] = row['description'] or ''
+            ticket_info['project_name'] = self._translated_name(row['project_name'])
+            ticket_info['stage_name'] = self._translated_name(row['stage_name'])
             
-            cursor.close()
             logger.info(f"Lấy thông tin ticket {ticket_id} thành công")
             return ticket_info
             
@@ -727,53 +1003,47 @@ class PostgreSQLConnector:
             Danh sách tickets đã hoàn thành
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # Query tickets có stage "Done" (stage_id = 3)
+            # Query tickets có stage "Done" (whitelist stage_id, index-friendly)
             base_query = """
                 SELECT 
                     pt.id,
                     pt.name,
-                    pt.description,
                     pt.state,
                     pt.priority,
                     pt.x_tracking_id,
                     pt.create_date,
                     pt.write_date,
-                    pps.name as stage_name
+                    COALESCE(to_jsonb(pps.name)->>'en_US', pps.name::text, '') as stage_name
                 FROM project_task pt
                 LEFT JOIN project_project_stage pps ON pt.stage_id = pps.id
-                WHERE pt.stage_id = 3  -- Done stage
+                WHERE pt.stage_id = ANY(%s)  -- Done stage(s)
             """
             
             # Thêm filter theo tracking_id nếu có
-            params = []
+            params = [COMPLETED_TASK_STAGE_IDS]
             if telegram_chat_id:
                 base_query += " AND pt.x_tracking_id = %s"
                 params.append(f"TG_{telegram_chat_id}")
             
             base_query += " ORDER BY pt.write_date DESC LIMIT 20;"
             
-            cursor.execute(base_query, params)
-            rows = cursor.fetchall()
-            
+            # Stream qua server-side cursor (task monitor chạy định kỳ, map từng row độc lập)
             tickets = []
-            for row in rows:
+            for row in self._iter_rows(base_query, tuple(params), itersize=50):
                 ticket_info = {
                     'id': row[0],
                     'name': row[1],
-                    'description': row[2] or '',
-                    'state': row[3],
-                    'priority': row[4],
-                    'tracking_id': row[5],
-                    'create_date': row[6],
-                    'write_date': row[7],
-                    'stage_name': row[8] if isinstance(row[8], str) else (row[8].get('en_US', '') if row[8] else ''),
-                    'telegram_chat_id': row[5].replace('TG_', '') if row[5] and row[5].startswith('TG_') else ''
+                    'description': '',
+                    'state': row[2],
+                    'priority': row[3],
+                    'tracking_id': row[4],
+                    'create_date': row[5],
+                    'write_date': row[6],
+                    'stage_name': row[7],
+                    'telegram_chat_id': row[4].replace('TG_', '') if row[4] and row[4].startswith('TG_') else ''
                 }
                 tickets.append(ticket_info)
             
-            cursor.close()
             # Chỉ log khi có tickets hoàn thành để tránh spam logs
             if len(tickets) > 0:
                 logger.info(f"Tìm thấy {len(tickets)} tickets hoàn thành")
@@ -785,6 +1055,90 @@ class PostgreSQLConnector:
             logger.error(f"Lỗi lấy completed tickets: {e}")
             return []
     
+    def _build_user_ticket_query(self, user_email: str, status: Optional[str] = None,
+                                 priority: Optional[int] = None, search: Optional[str] = None,
+                                 limit: int = 20, offset: int = 0,
+                                 with_count: bool = False) -> Tuple[sql.Composed, List[Any]]:
+        """
+        Dựng query listing tickets của user (dùng chung cho mọi method listing)
+        
+        Cùng SELECT/FROM/WHERE/ORDER BY, chỉ khác các điều kiện AND tùy chọn, nên
+        PostgreSQL cache ít plan hơn và các method trả về cùng một format.
+        
+        Args:
+            user_email: Email của user
+            status: Tên stage ('new', 'in_progress', 'done', ...); không khớp stage nào thì bỏ qua
+            priority: Priority cần lọc
+            search: Từ khóa tìm trong name/description
+            limit: Số tickets tối đa
+            offset: Bỏ qua bao nhiêu tickets (pagination)
+            with_count: Thêm cột total_count = COUNT(*) OVER ()
+            
+        Returns:
+            (query, params) để truyền cho cursor.execute
+        """
+        columns = [sql.SQL("""
+                ht.id,
+                ht.name,
+                'draft' as state,
+                ht.priority,
+                ht.number as tracking_id,
+                COALESCE(to_char(ht.create_date, 'YYYY-MM-DD HH24:MI'), 'N/A') as create_date,
+                COALESCE(to_char(ht.write_date, 'YYYY-MM-DD HH24:MI'), 'N/A') as write_date,
+                ht.stage_id,
+                COALESCE(to_jsonb(hts.name)->>'en_US', hts.name::text) as stage_name""")]
+        if with_count:
+            columns.append(sql.SQL("COUNT(*) OVER () as total_count"))
+        
+        conditions = [sql.SQL("lower(ht.partner_email) = lower(%s)")]
+        params: List[Any] = [user_email]
+        
+        if status:
+            _, reverse_mapping = self._get_stage_map()
+            stage_id = reverse_mapping.get(status.replace('_', ' ').lower())
+            if stage_id:
+                conditions.append(sql.SQL("ht.stage_id = %s"))
+                params.append(stage_id)
+        
+        if priority:
+            conditions.append(sql.SQL("ht.priority = %s"))
+            params.append(str(priority))
+        
+        if search:
+            conditions.append(sql.SQL("(ht.name ILIKE %s OR ht.description ILIKE %s)"))
+            search_pattern = f"%{search}%"
+            params.extend([search_pattern, search_pattern])
+        
+        query = sql.SQL("""
+            SELECT {columns}
+            FROM helpdesk_ticket ht
+            LEFT JOIN helpdesk_ticket_stage hts ON ht.stage_id = hts.id
+            WHERE {conditions}
+            ORDER BY ht.create_date DESC, ht.id DESC
+            LIMIT %s OFFSET %s
+        """).format(
+            columns=sql.SQL(',\n                ').join(columns),
+            conditions=sql.SQL(' AND ').join(conditions)
+        )
+        params.extend([limit, offset])
+        return query, params
+    
+    def _fetch_user_tickets(self, query: sql.Composed, params: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Chạy query từ _build_user_ticket_query và chuẩn hóa từng row
+        
+        Args:
+            query: Query đã dựng
+            params: Tham số đi kèm
+            
+        Returns:
+            Danh sách tickets (rows đã qua _ticket_row)
+        """
+        with self._cursor(RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        return [self._ticket_row(row) for row in rows]
+    
     def get_user_tickets(self, user_email: str) -> List[Dict[str, Any]]:
         """
         Lấy tất cả tickets của một user theo email
@@ -796,44 +1150,8 @@ class PostgreSQLConnector:
             Danh sách tickets của user
         """
         try:
-            cursor = self.connection.cursor()
-            
-            query = """
-                SELECT 
-                    ht.id,
-                    ht.name,
-                    ht.description,
-                    'draft' as state,
-                    ht.priority,
-                    ht.number as tracking_id,
-                    ht.create_date,
-                    ht.write_date,
-                    ht.stage_id
-                FROM helpdesk_ticket ht
-                WHERE ht.partner_email = %s OR ht.partner_email ILIKE %s
-                ORDER BY ht.create_date DESC
-                LIMIT 10;
-            """
-            
-            cursor.execute(query, (user_email, f"%{user_email}%"))
-            rows = cursor.fetchall()
-            
-            tickets = []
-            for row in rows:
-                ticket_info = {
-                    'id': row[0],
-                    'name': row[1],
-                    'description': row[2] or '',
-                    'state': row[3],
-                    'priority': row[4],
-                    'tracking_id': row[5],
-                    'create_date': row[6],
-                    'write_date': row[7],
-                    'stage_name': self.get_stage_name(row[8]) if row[8] else 'Unknown'
-                }
-                tickets.append(ticket_info)
+            tickets = self._fetch_user_tickets(*self._build_user_ticket_query(user_email, limit=10))
             
-            cursor.close()
             logger.info(f"Tìm thấy {len(tickets)} tickets cho user {user_email}")
             return tickets
             
@@ -854,57 +1172,10 @@ class PostgreSQLConnector:
             Danh sách tickets được filter
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # Base query
-            query = """
-                SELECT 
-                    ht.id,
-                    ht.name,
-                    ht.description,
-                    'draft' as state,
-                    ht.priority,
-                    ht.number as tracking_id,
-                    ht.create_date,
-                    ht.write_date,
-                    ht.stage_id
-                FROM helpdesk_ticket ht
-                WHERE (ht.partner_email = %s OR ht.partner_email ILIKE %s)
-            """
-            
-            params = [user_email, f"%{user_email}%"]
-            
-            # Add filters
-            if status_filter:
-                # Since we don't have stage table, just ignore status filter for now
-                pass
-            
-            if priority_filter:
-                query += " AND ht.priority = %s"
-                params.append(str(priority_filter))
-            
-            query += " ORDER BY ht.create_date DESC LIMIT 20;"
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            tickets = []
-            for row in rows:
-                ticket_info = {
-                    'id': row[0],
-                    'name': row[1],
-                    'description': row[2],
-                    'state': row[3],
-                    'priority': row[4],
-                    'tracking_id': row[5],
-                    'create_date': row[6].strftime('%Y-%m-%d %H:%M') if row[6] else 'N/A',
-                    'write_date': row[7].strftime('%Y-%m-%d %H:%M') if row[7] else 'N/A',
-                    'stage_name': self.get_stage_name(row[8]) if row[8] else 'Unknown'
-                }
-                tickets.append(ticket_info)
-            
-            cursor.close()
-            return tickets
+            query, params = self._build_user_ticket_query(
+                user_email, status=status_filter, priority=priority_filter, limit=20
+            )
+            return self._fetch_user_tickets(query, params)
             
         except Exception as e:
             logger.error(f"Lỗi lấy filtered tickets: {e}")
@@ -922,47 +1193,7 @@ class PostgreSQLConnector:
             Danh sách tickets khớp với từ khóa
         """
         try:
-            cursor = self.connection.cursor()
-            
-            query = """
-                SELECT 
-                    ht.id,
-                    ht.name,
-                    ht.description,
-                    'draft' as state,
-                    ht.priority,
-                    ht.number as tracking_id,
-                    ht.create_date,
-                    ht.write_date,
-                    ht.stage_id
-                FROM helpdesk_ticket ht
-                WHERE (ht.partner_email = %s OR ht.partner_email ILIKE %s)
-                AND (ht.name ILIKE %s OR ht.description ILIKE %s)
-                ORDER BY ht.create_date DESC
-                LIMIT 15;
-            """
-            
-            search_pattern = f"%{search_term}%"
-            cursor.execute(query, (user_email, f"%{user_email}%", search_pattern, search_pattern))
-            rows = cursor.fetchall()
-            
-            tickets = []
-            for row in rows:
-                ticket_info = {
-                    'id': row[0],
-                    'name': row[1],
-                    'description': row[2],
-                    'state': row[3],
-                    'priority': row[4],
-                    'tracking_id': row[5],
-                    'create_date': row[6].strftime('%Y-%m-%d %H:%M') if row[6] else 'N/A',
-                    'write_date': row[7].strftime('%Y-%m-%d %H:%M') if row[7] else 'N/A',
-                    'stage_name': self.get_stage_name(row[8]) if row[8] else 'Unknown'
-                }
-                tickets.append(ticket_info)
-            
-            cursor.close()
-            return tickets
+            return self._fetch_user_tickets(*self._build_user_ticket_query(user_email, search=search_term, limit=15))
             
         except Exception as e:
             logger.error(f"Lỗi search tickets: {e}")
@@ -981,66 +1212,19 @@ class PostgreSQLConnector:
             Dict chứa tickets và thông tin pagination
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # Count total tickets (limit to max 20 most recent)
-            count_query = """
-                SELECT COUNT(*) FROM (
-                    SELECT ht.id 
-                    FROM helpdesk_ticket ht
-                    WHERE ht.partner_email = %s OR ht.partner_email ILIKE %s
-                    ORDER BY ht.create_date DESC
-                    LIMIT 20
-                ) as limited_tickets
-            """
-            cursor.execute(count_query, (user_email, f"%{user_email}%"))
-            total_count = cursor.fetchone()[0]
+            # Lấy trang hiện tại cùng tổng số tickets bằng COUNT(*) OVER () trong một query
+            query, params = self._build_user_ticket_query(
+                user_email, limit=per_page, offset=(page - 1) * per_page, with_count=True
+            )
+            with self._cursor(RealDictCursor) as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
             
             # Calculate pagination
+            total_count = rows[0]['total_count'] if rows else 0
             total_pages = (total_count + per_page - 1) // per_page
-            offset = (page - 1) * per_page
-            
-            # Get tickets for current page (from max 20 most recent)
-            query = """
-                SELECT 
-                    ht.id,
-                    ht.name,
-                    ht.description,
-                    'draft' as state,
-                    ht.priority,
-                    ht.number as tracking_id,
-                    ht.create_date,
-                    ht.write_date,
-                    ht.stage_id
-                FROM (
-                    SELECT * FROM helpdesk_ticket ht2
-                    WHERE ht2.partner_email = %s OR ht2.partner_email ILIKE %s
-                    ORDER BY ht2.create_date DESC
-                    LIMIT 20
-                ) ht
-                ORDER BY ht.create_date DESC
-                LIMIT %s OFFSET %s;
-            """
-            
-            cursor.execute(query, (user_email, f"%{user_email}%", per_page, offset))
-            rows = cursor.fetchall()
-            
-            tickets = []
-            for row in rows:
-                ticket_info = {
-                    'id': row[0],
-                    'name': row[1],
-                    'description': row[2],
-                    'state': row[3],
-                    'priority': row[4],
-                    'tracking_id': row[5],
-                    'create_date': row[6].strftime('%Y-%m-%d %H:%M') if row[6] else 'N/A',
-                    'write_date': row[7].strftime('%Y-%m-%d %H:%M') if row[7] else 'N/A',
-                    'stage_name': self.get_stage_name(row[8]) if row[8] else 'Unknown'
-                }
-                tickets.append(ticket_info)
             
-            cursor.close()
+            tickets = [self._ticket_row(row) for row in rows]
             
             return {
                 'tickets': tickets,
@@ -1071,45 +1255,39 @@ class PostgreSQLConnector:
             List of comments
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # First, find the ticket by tracking number
-            ticket_query = """
-                SELECT id, name 
-                FROM helpdesk_ticket 
-                WHERE number = %s
-                LIMIT 1
-            """
-            cursor.execute(ticket_query, (ticket_number,))
-            ticket = cursor.fetchone()
-            
-            if not ticket:
-                logger.info(f"No ticket found with number: {ticket_number}")
-                return []
-            
-            ticket_id = ticket[0]
-            ticket_name = ticket[1]
-            
-            # Get comments (messages) for this ticket
+            # Resolve ticket theo number và lấy comments trong cùng một query
             comments_query = """
                 SELECT 
                     mm.id,
                     mm.body,
                     mm.create_date,
                     mm.author_id,
-                    rp.name as author_name,
+                    COALESCE(
+                        rp.name, rp.email,
+                        (SELECT ru.login FROM res_users ru WHERE ru.partner_id = rp.id LIMIT 1),
+                        'Unknown'
+                    ) as author_name,
                     mm.message_type,
-                    mm.subtype_id
-                FROM mail_message mm
-                LEFT JOIN res_partner rp ON mm.author_id = rp.id
-                WHERE mm.res_id = %s 
+                    mm.subtype_id,
+                    ht.id as ticket_id
+                FROM helpdesk_ticket ht
+                JOIN mail_message mm ON mm.res_id = ht.id
                     AND mm.model = 'helpdesk.ticket'
                     AND mm.message_type = 'comment'
+                LEFT JOIN res_partner rp ON mm.author_id = rp.id
+                WHERE ht.number = %s
                 ORDER BY mm.create_date ASC
             """
             
-            cursor.execute(comments_query, (ticket_id,))
-            rows = cursor.fetchall()
+            with self._cursor() as cursor:
+                cursor.execute(comments_query, (ticket_number,))
+                rows = cursor.fetchall()
+            
+            if not rows:
+                logger.info(f"No comments found for ticket number: {ticket_number}")
+                return []
+            
+            ticket_id = rows[0][7]
             
             comments = []
             for row in rows:
@@ -1118,13 +1296,12 @@ class PostgreSQLConnector:
                     'body': row[1] or 'No content',
                     'create_date': row[2].strftime('%Y-%m-%d %H:%M:%S') if row[2] else 'Unknown date',
                     'author_id': row[3],
-                    'author_name': row[4] or 'Unknown',
+                    'author_name': row[4],
                     'message_type': row[5],
                     'subtype_id': row[6]
                 }
                 comments.append(comment)
             
-            cursor.close()
             logger.info(f"Found {len(comments)} comments for ticket {ticket_number} (ID: {ticket_id})")
             return comments
             
@@ -1145,49 +1322,99 @@ class PostgreSQLConnector:
             True if successful, False otherwise
         """
         try:
-            # First get the ticket ID from the ticket number
-            ticket_query = """
-            SELECT id FROM helpdesk_ticket 
-            WHERE number = %s
-            """
-            
-            cursor = self.connection.cursor()
-            cursor.execute(ticket_query, (ticket_number,))
-            ticket_result = cursor.fetchone()
-            
-            if not ticket_result:
-                logger.error(f"Ticket not found: {ticket_number}")
-                return False
-            
-            ticket_id = ticket_result[0]
-            
-            # Insert comment into mail_message table
-            # This follows Odoo's structure for ticket comments
+            # Resolve ticket + author và insert comment vào mail_message trong một câu
+            # (theo cấu trúc comment ticket của Odoo); không có row nào khi ticket không tồn tại
             insert_comment_query = """
+            WITH t AS (
+                SELECT id FROM helpdesk_ticket WHERE number = %s LIMIT 1
+            ),
+            p AS (
+                SELECT id FROM res_partner
+                WHERE email = %s AND active = true
+                LIMIT 1
+            )
             INSERT INTO mail_message (
                 model, res_id, body, message_type, subtype_id, 
                 author_id, email_from, create_date, write_date
-            ) VALUES (
-                'helpdesk.ticket', %s, %s, 'comment', NULL,
-                NULL, %s, NOW(), NOW()
             )
+            SELECT 'helpdesk.ticket', t.id, %s, 'comment', NULL,
+                   (SELECT id FROM p), %s, NOW(), NOW()
+            FROM t
+            RETURNING id, res_id
             """
             
             # Format comment as HTML (Odoo format)
-            html_comment = f'<div data-oe-version="1.2">{comment_text}</div>'
+            html_comment = ''.join((ODOO_HTML_OPEN, comment_text, ODOO_HTML_CLOSE))
             
-            cursor.execute(insert_comment_query, (ticket_id, html_comment, user_email))
-            self.connection.commit()
+            with self._cursor() as cursor:
+                cursor.execute(insert_comment_query, (ticket_number, user_email, html_comment, user_email))
+                inserted = cursor.fetchone()
             
-            logger.info(f"Comment added successfully to ticket {ticket_number} (ID: {ticket_id}) by {user_email}")
+            if not inserted:
+                logger.error(f"Ticket not found: {ticket_number}")
+                return False
+            
+            logger.info(f"Comment added successfully to ticket {ticket_number} (ID: {inserted[1]}) by {user_email}")
             return True
             
         except Exception as e:
             logger.error(f"Error adding comment to ticket {ticket_number}: {e}")
-            if self.connection:
-                self.connection.rollback()
             return False
 
+    async def add_comments(self, ticket_numbers: List[str], comment_texts: List[str],
+                           user_emails: List[str]) -> int:
+        """
+        Add several comments in one INSERT ... SELECT (batch replies)
+        
+        Args:
+            ticket_numbers: Ticket numbers, same order as comment_texts/user_emails
+            comment_texts: Comment contents
+            user_emails: Email of the user adding each comment
+            
+        Returns:
+            Number of comments inserted (comments for unknown tickets are skipped)
+        """
+        try:
+            # Format comments as HTML (Odoo format) before borrowing a connection
+            rows = [
+                (ticket_number, ''.join((ODOO_HTML_OPEN, comment_text, ODOO_HTML_CLOSE)), user_email)
+                for ticket_number, comment_text, user_email in zip(ticket_numbers, comment_texts, user_emails)
+            ]
+            if not rows:
+                return 0
+            
+            insert_comments_query = """
+            INSERT INTO mail_message (
+                model, res_id, body, message_type, subtype_id,
+                author_id, email_from, create_date, write_date
+            )
+            SELECT 'helpdesk.ticket', t.id, v.body, 'comment', NULL,
+                   p.id, v.email, NOW(), NOW()
+            FROM (VALUES %s) AS v(number, body, email)
+            JOIN helpdesk_ticket t ON t.number = v.number
+            LEFT JOIN LATERAL (
+                SELECT id FROM res_partner
+                WHERE email = v.email AND active = true
+                LIMIT 1
+            ) p ON true
+            RETURNING id
+            """
+            
+            with self._cursor() as cursor:
+                inserted = execute_values(
+                    cursor, insert_comments_query, rows,
+                    template="(%s, %s, %s)", page_size=len(rows), fetch=True
+                )
+            
+            if len(inserted) < len(rows):
+                logger.warning(f"Skipped {len(rows) - len(inserted)} comment(s) for unknown tickets")
+            logger.info(f"Added {len(inserted)} comment(s) in batch")
+            return len(inserted)
+            
+        except Exception as e:
+            logger.error(f"Error adding comments in batch: {e}")
+            return 0
+
     def get_recent_tickets_by_email(self, user_email: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get recent tickets for a user by email
@@ -1200,41 +1427,25 @@ class PostgreSQLConnector:
             List of recent tickets with basic info
         """
         try:
-            cursor = self.connection.cursor()
-            
             query = """
-            SELECT ht.id, ht.name, ht.number, 
-                   CASE 
-                       WHEN ht.stage_id = 1 THEN 'New'
-                       WHEN ht.stage_id = 2 THEN 'In Progress'
-                       WHEN ht.stage_id = 3 THEN 'Solved'
-                       WHEN ht.stage_id = 4 THEN 'Cancelled'
-                       ELSE 'Unknown'
-                   END as stage_name, 
-                   ht.create_date
+            SELECT ht.id, ht.name, ht.number as tracking_id,
+                   COALESCE(to_jsonb(hts.name)->>'en_US', hts.name::text, 'Unknown') as stage_name,
+                   COALESCE(to_char(ht.create_date, 'YYYY-MM-DD HH24:MI'), 'Unknown') as create_date
             FROM helpdesk_ticket ht
-            WHERE ht.partner_email = %s OR ht.partner_email ILIKE %s
+            LEFT JOIN helpdesk_ticket_stage hts ON ht.stage_id = hts.id
+            WHERE lower(ht.partner_email) = lower($1)
             ORDER BY ht.create_date DESC
-            LIMIT %s
+            LIMIT $2
             """
             
             logger.info(f"Querying recent tickets for email: {user_email}")
-            cursor.execute(query, (user_email, f"%{user_email}%", limit))
-            rows = cursor.fetchall()
+            with self._cursor(RealDictCursor) as cursor:
+                self._execute_prepared(cursor, 'recent_tickets_ps', query, (user_email, limit))
+                rows = cursor.fetchall()
             logger.info(f"Query returned {len(rows)} rows")
             
-            tickets = []
-            for row in rows:
-                ticket_info = {
-                    'id': row[0],
-                    'name': row[1],
-                    'tracking_id': row[2],  # This is the number field
-                    'stage_name': row[3] if row[3] else 'Unknown',
-                    'create_date': row[4].strftime('%Y-%m-%d %H:%M') if row[4] else 'Unknown'
-                }
-                tickets.append(ticket_info)
+            tickets = [self._ticket_row(row) for row in rows]
             
-            cursor.close()
             logger.info(f"Retrieved {len(tickets)} recent tickets for {user_email}")
             return tickets
             
@@ -1242,7 +1453,7 @@ class PostgreSQLConnector:
             logger.error(f"Error getting recent tickets for {user_email}: {e}")
             return []
 
-    async def update_ticket_status(self, ticket_number: str, new_status: str) -> bool:
+    async def update_ticket_status(self, ticket_number: str, new_status: str) -> List[Dict[str, Any]]:
         """
         Update ticket status by ticket number
         
@@ -1251,26 +1462,15 @@ class PostgreSQLConnector:
             new_status: New status to set
             
         Returns:
-            True if successful, False otherwise
+            Các dòng đã cập nhật (id, stage_id); danh sách rỗng nếu thất bại
         """
         try:
-            if not self.connection:
+            if not self.pool:
                 logger.error("No database connection available")
-                return False
-            
-            cursor = self.connection.cursor()
-            
-            # Map status names to stage_id using existing stage mapping
-            stage_mapping = {
-                1: "New",
-                2: "In Progress", 
-                3: "Waiting",
-                4: "Done",
-                5: "Cancelled"
-            }
+                return []
             
-            # Reverse mapping: stage name -> stage_id
-            reverse_mapping = {v.lower(): k for k, v in stage_mapping.items()}
+            # Reverse mapping: stage name -> stage_id (từ cache helpdesk_ticket_stage)
+            _, reverse_mapping = self._get_stage_map()
             
             # Common status mappings
             status_mappings = {
@@ -1287,41 +1487,176 @@ class PostgreSQLConnector:
             
             # Get the normalized status
             normalized_status = status_mappings.get(new_status.lower(), new_status.lower())
-            stage_id = reverse_mapping.get(normalized_status)
+            stage_id = reverse_mapping.get(normalized_status) or reverse_mapping.get(new_status.lower())
             
             if not stage_id:
                 logger.error(f"Stage not found for status: {new_status} (normalized: {normalized_status})")
-                cursor.close()
-                return False
+                return []
             
             # Update ticket status
             update_query = """
                 UPDATE helpdesk_ticket 
                 SET stage_id = %s
-                WHERE number = %s OR name LIKE %s
+                WHERE number = %s
+                RETURNING id, stage_id
             """
             
-            cursor.execute(update_query, (stage_id, ticket_number, f'%{ticket_number}%'))
-            rows_affected = cursor.rowcount
+            with self._cursor(RealDictCursor) as cursor:
+                cursor.execute(update_query, (stage_id, ticket_number))
+                rows = [dict(row) for row in cursor.fetchall()]
             
-            if rows_affected > 0:
-                self.connection.commit()
-                logger.info(f"Successfully updated {rows_affected} ticket(s) with number {ticket_number} to status {new_status}")
-                cursor.close()
-                return True
+            if rows:
+                logger.info(f"Successfully updated {len(rows)} ticket(s) with number {ticket_number} to status {new_status}")
             else:
                 logger.warning(f"No tickets found with number {ticket_number}")
-                cursor.close()
-                return False
+            return rows
                 
         except Exception as e:
             logger.error(f"Error updating ticket status for {ticket_number}: {e}")
-            if self.connection:
-                self.connection.rollback()
-            return False
+            return []
 
     def close(self) -> None:
         """Đóng kết nối database"""
-        if self.connection:
-            self.connection.close()
-            logger.info("Đã đóng kết nối PostgreSQL")
\ No newline at end of file
+        if self.pool:
+            self.pool.closeall()
+            self._prepared_statements.clear()
+            logger.info("Đã đóng kết nối PostgreSQL")
+
+
+class AsyncPostgreSQLConnector(PostgreSQLConnector):
+    """
+    PostgreSQLConnector với đường tạo ticket async qua asyncpg pool
+    
+    Các method sync vẫn dùng pool psycopg2 của class cha; riêng
+    create_ticket_async chạy INSERT trên asyncpg pool để nhiều chat tạo
+    ticket đồng thời trên cùng event loop mà không chiếm thread.
+    """
+    
+    def __init__(self, host: str, port: int, database: str, username: str, password: str,
+                 min_pool_size: int = 2, max_pool_size: int = 20):
+        """
+        Khởi tạo connector; pool asyncpg được tạo ở lần gọi async đầu tiên
+        
+        Args:
+            host: Host của PostgreSQL server
+            port: Port (15432)
+            database: Tên database
+            username: Tên đăng nhập
+            password: Mật khẩu
+            min_pool_size: Số connection tối thiểu của pool
+            max_pool_size: Số connection tối đa của pool
+        """
+        if asyncpg is None:
+            raise ImportError("asyncpg chưa được cài đặt - cần cho AsyncPostgreSQLConnector")
+        
+        super().__init__(host, port, database, username, password)
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self.async_pool = None
+        
+        # Câu INSERT đã render sang placeholder asyncpg: (table, columns, link_partner) -> str
+        self._async_queries: Dict[Tuple[str, Tuple[str, ...], bool], str] = {}
+    
+    async def _get_pool(self):
+        """Lấy asyncpg pool, tạo mới nếu chưa có"""
+        if self.async_pool is None:
+            self.async_pool = await asyncpg.create_pool(
+                host=self.host,
+                port=self.port,
+                database=self.database,
+                user=self.username,
+                password=self.password,
+                min_size=self.min_pool_size,
+                max_size=self.max_pool_size
+            )
+            logger.info(f"Tạo asyncpg pool thành công - {self.host}:{self.port}/{self.database}")
+        return self.async_pool
+    
+    def _async_query(self, insert_key: Tuple[str, Tuple[str, ...], bool]) -> str:
+        """
+        Render câu INSERT psycopg2.sql sang string với placeholder $n của asyncpg
+        
+        Args:
+            insert_key: (table, columns, link_partner) của câu INSERT trong _INSERT_TEMPLATES
+            
+        Returns:
+            Câu query dùng được với asyncpg
+        """
+        query_str = self._async_queries.get(insert_key)
+        if query_str is None:
+            query = self._get_insert_query(*insert_key)
+            with self._connection() as conn:
+                rendered = query.as_string(conn)
+            counter = itertools.count(1)
+            query_str = PYFORMAT_PLACEHOLDER_RE.sub(
+                lambda m: '%' if m.group() == '%%' else f"${next(counter)}",
+                rendered
+            )
+            self._async_queries[insert_key] = query_str
+        return query_str
+    
+    def _prepare_async_insert(self, ticket_data: Dict[str, Any], destination: str,
+                              config: Dict[str, Any]) -> Tuple[str, List[Any], Optional[str]]:
+        """
+        Chuẩn bị câu INSERT dạng asyncpg cho create_ticket_async
+        
+        Probe schema lần đầu và render query (cache miss) đều mượn connection
+        psycopg2 (blocking) nên method này được chạy trong thread pool; khi cả
+        hai đã cache thì không mượn connection nào.
+        
+        Args:
+            ticket_data: Dictionary chứa thông tin ticket
+            destination: Điểm đến
+            config: Country config của destination
+            
+        Returns:
+            (query asyncpg, params, link_email)
+        """
+        if self._has_additional_info is None:
+            with self._cursor() as cursor:
+                self._ticket_has_additional_info(cursor)
+        
+        insert_key, params, link_email = self._prepare_ticket_insert(None, ticket_data, destination, config)
+        return self._async_query(insert_key), params, link_email
+    
+    async def create_ticket_async(self, ticket_data: Dict[str, Any], destination: str = "Vietnam") -> Dict[str, Any]:
+        """
+        Tạo ticket mới qua asyncpg (cùng logic với create_ticket)
+        
+        Args:
+            ticket_data: Dictionary chứa thông tin ticket
+            destination: Điểm đến
+            
+        Returns:
+            Dictionary chứa kết quả tạo ticket
+        """
+        try:
+            config = get_country_config(destination)
+            
+            # Phần chuẩn bị dùng pool psycopg2 (blocking) nên chạy ngoài event loop
+            loop = asyncio.get_running_loop()
+            query, params, link_email = await loop.run_in_executor(
+                None, self._prepare_async_insert, ticket_data, destination, config
+            )
+            
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(query, *params)
+            
+            return self._ticket_created_result(tuple(row), destination, config, link_email)
+            
+        except Exception as e:
+            logger.error(f"Lỗi tạo {destination} ticket (async): {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'destination': destination,
+                'message': f'Không thể tạo {destination} ticket. Vui lòng thử lại.'
+            }
+    
+    async def close_pool(self) -> None:
+        """Đóng asyncpg pool"""
+        if self.async_pool:
+            await self.async_pool.close()
+            self.async_pool = None
+            logger.info("Đã đóng asyncpg pool")
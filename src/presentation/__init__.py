@@ -9,7 +9,7 @@ from .formatters.ticket_formatter import TicketFormatter
 
 # Keyboards
 from .keyboards.comment_keyboards import CommentKeyboards
-from .keyboards.ticket_keyboards import TicketKeyboards
+from .keyboards.ticket_keyboards import TicketKeyboards, ticket_keyboards
 
 # Handlers
 from .handlers.comment_handler import CommentHandler
@@ -22,6 +22,7 @@ __all__ = [
     # Keyboards
     'CommentKeyboards', 
     'TicketKeyboards',
+    'ticket_keyboards',
     
     # Handlers
     'CommentHandler'
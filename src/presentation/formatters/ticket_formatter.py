@@ -3,231 +3,244 @@ Ticket message formatters for Telegram UI.
 Handles all ticket-related message formatting with proper styling.
 """
 from typing import List, Optional
+from bisect import bisect_right
 from datetime import datetime
-from ...application.dto import TicketDTO
+from functools import lru_cache
+from itertools import islice
+from ...application.dto import TicketDTO, STATUS_EMOJIS
+from ..utils import ellipsize
+
+
+_MAX_DESCRIPTION_LENGTH = 200
+
+_TICKET_SEPARATOR = "\n" + "─" * 30 + "\n\n"
+
+_SUMMARY_TEMPLATE = (
+    "{status_emoji} **{number}** - {priority_emoji}\n"
+    "📝 **{title}**\n"
+    "💬 {description}\n"
+    "👤 {creator} • 📅 {created}\n"
+    "{overdue}"
+)
+_COMPACT_SUMMARY_TEMPLATE = (
+    "{status_emoji} **{number}** - {priority_emoji}\n"
+    "📝 **{title}**\n"
+    "👤 {creator} • 📅 {created}\n"
+    "{overdue}"
+)
+
+# Relative date buckets by diff.days: <0, 0, 1, 2-6, 7-29; None = absolute date (>= 30)
+_REL_THRESHOLDS = (0, 1, 2, 7, 30)
+_REL_FORMATTERS = (
+    lambda diff: f"{diff.days}d ago",
+    lambda diff: f"{diff.seconds // 3600}h ago" if diff.seconds >= 3600 else f"{diff.seconds // 60}m ago",
+    lambda diff: "Yesterday",
+    lambda diff: f"{diff.days}d ago",
+    lambda diff: f"{diff.days // 7}w ago",
+    None
+)
+
+
+@lru_cache(maxsize=16)
+def _render_ticket_filters(current_status: Optional[str], current_priority: Optional[str]) -> str:
+    """Render the current-filters message (few status/priority combinations, so cached)"""
+    return (
+        "🔍 **Current Filters:**\n\n"
+        f"📊 **Status:** {current_status or 'All'}\n"
+        f"⚡ **Priority:** {current_priority or 'All'}\n"
+        "\n💡 **Use the buttons below to change filters.**"
+    )
+
+
+def _format_email(email: str) -> str:
+    """Format email for display (show name part only)"""
+    if not email or '@' not in email:
+        return email or 'Unknown'
+
+    local = email.split('@', 1)[0]
+    if '.' not in local:
+        return local.title()
+
+    return local.replace('.', ' ').title()
+
+
+def _format_relative_date(date: datetime, now: Optional[datetime] = None) -> str:
+    """Format date relative to now"""
+    now = now or datetime.now()
+    diff = now - date
+
+    formatter = _REL_FORMATTERS[bisect_right(_REL_THRESHOLDS, diff.days)]
+    if formatter is None:
+        return f"{date:%m/%d/%Y}"
+
+    return formatter(diff)
+
+
+def _truncate_text(text: str, max_length: int) -> str:
+    """Truncate text with ellipsis"""
+    if not text:
+        return "No description"
+
+    return ellipsize(text, max_length)
+
+
+def _render_selection_row(ticket: TicketDTO, now: datetime) -> str:
+    """Render one ticket entry of the selection list"""
+    return (
+        f"{ticket.status_emoji} **{ticket.number}**\n"
+        f"📝 {ellipsize(ticket.title, 50)}\n"
+        f"🏷️ {ticket.priority} • 📅 {_format_relative_date(ticket.created_date, now)}\n\n"
+    )
+
+
+def _render_activity_row(ticket: TicketDTO, now: datetime) -> str:
+    """Render one ticket entry of the recent activity list"""
+    days_ago = (now - ticket.updated_date).days
+    
+    if days_ago == 0:
+        time_text = "Today"
+    elif days_ago == 1:
+        time_text = "Yesterday"
+    else:
+        time_text = f"{days_ago} days ago"
+    
+    return (
+        f"{ticket.status_emoji} **{ticket.number}** - {time_text}\n"
+        f"   {ellipsize(ticket.title, 40)}\n\n"
+    )
 
 
 class TicketFormatter:
     """Formats ticket-related messages for Telegram"""
     
     def __init__(self):
-        self.max_description_length = 200
+        self.max_description_length = _MAX_DESCRIPTION_LENGTH
     
     def format_ticket_list(self, tickets: List[TicketDTO], title: str = "🎫 Your Tickets") -> str:
         """Format list of tickets"""
         if not tickets:
             return f"{title}\n\n❌ No tickets found.\n\n💡 Create your first ticket to get started!"
         
-        message = f"{title}\n\n"
+        parts = [f"{title}\n\n"]
+        now = datetime.now()
         
         for ticket in tickets:
-            message += self._format_ticket_summary(ticket)
-            message += "\n" + "─" * 30 + "\n\n"
+            parts.append(self._format_ticket_summary(ticket, now=now))
+            parts.append(_TICKET_SEPARATOR)
         
-        message += f"📊 **Total:** {len(tickets)} ticket(s)"
+        parts.append(f"📊 **Total:** {len(tickets)} ticket(s)")
         
-        return message
+        return "".join(parts)
     
     def format_ticket_details(self, ticket: TicketDTO, comment_count: int = 0) -> str:
         """Format detailed ticket information"""
-        message = f"🎫 **Ticket Details**\n\n"
-        message += f"**#{ticket.number}** {ticket.status_emoji}\n"
-        message += f"📝 **Title:** {ticket.title}\n\n"
-        
-        # Description
-        description = self._truncate_text(ticket.description, self.max_description_length)
-        message += f"📄 **Description:**\n{description}\n\n"
-        
-        # Status and Priority
-        message += f"🏷️ **Status:** {ticket.status} {ticket.status_emoji}\n"
-        message += f"⚡ **Priority:** {ticket.priority} {ticket.priority_emoji}\n\n"
-        
-        # People
-        message += f"👤 **Created by:** {self._format_email(ticket.creator_email)}\n"
-        if ticket.assignee_email:
-            message += f"👨‍💼 **Assigned to:** {self._format_email(ticket.assignee_email)}\n"
-        else:
-            message += f"👨‍💼 **Assigned to:** Unassigned\n"
-        
-        message += "\n"
-        
-        # Dates
-        message += f"📅 **Created:** {ticket.created_date.strftime('%Y-%m-%d %H:%M')}\n"
-        message += f"🔄 **Updated:** {ticket.updated_date.strftime('%Y-%m-%d %H:%M')}\n"
-        
-        if ticket.resolved_date:
-            message += f"✅ **Resolved:** {ticket.resolved_date.strftime('%Y-%m-%d %H:%M')}\n"
-        
-        # Additional info
-        if ticket.is_overdue:
-            message += f"\n⚠️ **Status:** OVERDUE\n"
-        
-        if comment_count > 0:
-            message += f"\n💬 **Comments:** {comment_count}\n"
-        
-        return message
+        return (
+            f"🎫 **Ticket Details**\n\n"
+            f"**#{ticket.number}** {ticket.status_emoji}\n"
+            f"📝 **Title:** {ticket.title}\n\n"
+            f"📄 **Description:**\n{_truncate_text(ticket.description, self.max_description_length)}\n\n"
+            f"🏷️ **Status:** {ticket.status} {ticket.status_emoji}\n"
+            f"⚡ **Priority:** {ticket.priority} {ticket.priority_emoji}\n\n"
+            f"👤 **Created by:** {_format_email(ticket.creator_email)}\n"
+            f"👨‍💼 **Assigned to:** "
+            f"{_format_email(ticket.assignee_email) if ticket.assignee_email else 'Unassigned'}\n\n"
+            f"📅 **Created:** {ticket.formatted_created_long}\n"
+            f"🔄 **Updated:** {ticket.formatted_updated}\n"
+            + (f"✅ **Resolved:** {ticket.resolved_date:%Y-%m-%d %H:%M}\n" if ticket.resolved_date else "")
+            + ("\n⚠️ **Status:** OVERDUE\n" if ticket.is_overdue else "")
+            + (f"\n💬 **Comments:** {comment_count}\n" if comment_count > 0 else "")
+        )
     
     def format_ticket_summary_for_selection(self, tickets: List[TicketDTO]) -> str:
         """Format tickets for selection (shorter format)"""
         if not tickets:
             return "📋 **No tickets available for selection.**"
         
-        message = "📋 **Select a ticket:**\n\n"
-        
-        for ticket in tickets[:10]:  # Limit display
-            message += f"{ticket.status_emoji} **{ticket.number}**\n"
-            message += f"📝 {ticket.title[:50]}{'...' if len(ticket.title) > 50 else ''}\n"
-            message += f"🏷️ {ticket.priority} • 📅 {self._format_relative_date(ticket.created_date)}\n\n"
-        
-        if len(tickets) > 10:
-            message += f"... and {len(tickets) - 10} more tickets\n\n"
-        
-        message += "💡 **Select a ticket from the options below.**"
-        
-        return message
+        now = datetime.now()
+        rows = "".join(_render_selection_row(ticket, now) for ticket in islice(tickets, 10))  # Limit display
+        more = f"... and {len(tickets) - 10} more tickets\n\n" if len(tickets) > 10 else ""
+        
+        return (
+            "📋 **Select a ticket:**\n\n"
+            f"{rows}{more}"
+            "💡 **Select a ticket from the options below.**"
+        )
     
     def format_ticket_search_results(self, tickets: List[TicketDTO], query: str) -> str:
         """Format search results"""
         if not tickets:
             return f"🔍 **No tickets found for:** '{query}'\n\nTry different keywords or check your spelling."
         
-        message = f"🔍 **Search Results for:** '{query}'\n"
-        message += f"Found {len(tickets)} ticket(s)\n\n"
+        parts = [
+            f"🔍 **Search Results for:** '{query}'\n",
+            f"Found {len(tickets)} ticket(s)\n\n"
+        ]
+        now = datetime.now()
         
-        for ticket in tickets[:5]:  # Show top 5
-            message += self._format_ticket_summary(ticket, compact=True)
-            message += "\n"
+        for ticket in islice(tickets, 5):  # Show top 5
+            parts.append(self._format_ticket_summary(ticket, compact=True, now=now))
+            parts.append("\n")
         
         if len(tickets) > 5:
-            message += f"\n... and {len(tickets) - 5} more result(s)\n"
+            parts.append(f"\n... and {len(tickets) - 5} more result(s)\n")
         
-        message += "\n💡 **Select a ticket to view details**"
+        parts.append("\n💡 **Select a ticket to view details**")
         
-        return message
+        return "".join(parts)
     
     def format_ticket_status_summary(self, status_counts: dict, overdue_count: int = 0) -> str:
         """Format ticket status summary"""
-        message = "📊 **Your Ticket Summary**\n\n"
-        
         if not status_counts:
-            message += "❌ No tickets found.\n\n💡 Create your first ticket!"
-            return message
-        
-        # Status breakdown
-        status_emojis = {
-            'Open': '🟢',
-            'In Progress': '🟡',
-            'Resolved': '🔵',
-            'Closed': '⚫'
-        }
-        
-        total = sum(status_counts.values())
-        
-        for status, count in status_counts.items():
-            if count > 0:
-                emoji = status_emojis.get(status, '❓')
-                percentage = (count / total * 100) if total > 0 else 0
-                message += f"{emoji} **{status}:** {count} ({percentage:.0f}%)\n"
-        
-        message += f"\n📈 **Total Tickets:** {total}\n"
-        
-        if overdue_count > 0:
-            message += f"⚠️ **Overdue:** {overdue_count}\n"
-        
-        return message
+            return "📊 **Your Ticket Summary**\n\n❌ No tickets found.\n\n💡 Create your first ticket!"
+        
+        # Status breakdown: only positive counts are listed (and summed), so total > 0
+        # whenever a row is rendered
+        counts = [(status, count) for status, count in status_counts.items() if count > 0]
+        total = sum(count for _, count in counts)
+        
+        breakdown = "".join(
+            f"{STATUS_EMOJIS.get(status, '❓')} **{status}:** {count} ({count / total * 100:.0f}%)\n"
+            for status, count in counts
+        )
+        
+        overdue = f"⚠️ **Overdue:** {overdue_count}\n" if overdue_count > 0 else ""
+        
+        return (
+            f"📊 **Your Ticket Summary**\n\n"
+            f"{breakdown}"
+            f"\n📈 **Total Tickets:** {total}\n"
+            f"{overdue}"
+        )
     
     def format_ticket_filters(self, current_status: Optional[str] = None, current_priority: Optional[str] = None) -> str:
         """Format current filter information"""
-        message = "🔍 **Current Filters:**\n\n"
-        
-        if current_status:
-            message += f"📊 **Status:** {current_status}\n"
-        else:
-            message += f"📊 **Status:** All\n"
-        
-        if current_priority:
-            message += f"⚡ **Priority:** {current_priority}\n"
-        else:
-            message += f"⚡ **Priority:** All\n"
-        
-        message += "\n💡 **Use the buttons below to change filters.**"
-        
-        return message
+        return _render_ticket_filters(current_status, current_priority)
     
     def format_recent_activity(self, tickets: List[TicketDTO]) -> str:
         """Format recent ticket activity"""
         if not tickets:
             return "📊 **Recent Activity**\n\n❌ No recent activity."
         
-        message = "📊 **Recent Activity**\n\n"
-        
-        for ticket in tickets[:5]:
-            days_ago = (datetime.now() - ticket.updated_date).days
-            
-            if days_ago == 0:
-                time_text = "Today"
-            elif days_ago == 1:
-                time_text = "Yesterday"
-            else:
-                time_text = f"{days_ago} days ago"
-            
-            message += f"{ticket.status_emoji} **{ticket.number}** - {time_text}\n"
-            message += f"   {ticket.title[:40]}{'...' if len(ticket.title) > 40 else ''}\n\n"
-        
-        return message
-    
-    def _format_ticket_summary(self, ticket: TicketDTO, compact: bool = False) -> str:
-        """Format a single ticket summary"""
-        summary = f"{ticket.status_emoji} **{ticket.number}** - {ticket.priority_emoji}\n"
-        summary += f"📝 **{ticket.title}**\n"
-        
-        if not compact:
-            description = self._truncate_text(ticket.description, 100)
-            summary += f"💬 {description}\n"
-        
-        summary += f"👤 {self._format_email(ticket.creator_email)} • "
-        summary += f"📅 {self._format_relative_date(ticket.created_date)}\n"
-        
-        if ticket.is_overdue:
-            summary += "⚠️ **OVERDUE**\n"
-        
-        return summary
-    
-    def _format_email(self, email: str) -> str:
-        """Format email for display (show name part only)"""
-        if not email or '@' not in email:
-            return email or 'Unknown'
-        
-        return email.split('@')[0].replace('.', ' ').title()
-    
-    def _format_relative_date(self, date: datetime) -> str:
-        """Format date relative to now"""
         now = datetime.now()
-        diff = now - date
-        
-        if diff.days == 0:
-            if diff.seconds < 3600:
-                minutes = diff.seconds // 60
-                return f"{minutes}m ago"
-            else:
-                hours = diff.seconds // 3600
-                return f"{hours}h ago"
-        elif diff.days == 1:
-            return "Yesterday"
-        elif diff.days < 7:
-            return f"{diff.days}d ago"
-        elif diff.days < 30:
-            weeks = diff.days // 7
-            return f"{weeks}w ago"
-        else:
-            return date.strftime('%m/%d/%Y')
+        rows = "".join(_render_activity_row(ticket, now) for ticket in islice(tickets, 5))
+        
+        return f"📊 **Recent Activity**\n\n{rows}"
     
-    def _truncate_text(self, text: str, max_length: int) -> str:
-        """Truncate text with ellipsis"""
-        if not text:
-            return "No description"
+    def _format_ticket_summary(self, ticket: TicketDTO, compact: bool = False,
+                               now: Optional[datetime] = None) -> str:
+        """Format a single ticket summary"""
+        fields = {
+            'status_emoji': ticket.status_emoji,
+            'number': ticket.number,
+            'priority_emoji': ticket.priority_emoji,
+            'title': ticket.title,
+            'creator': _format_email(ticket.creator_email),
+            'created': _format_relative_date(ticket.created_date, now),
+            'overdue': "⚠️ **OVERDUE**\n" if ticket.is_overdue else ""
+        }
         
-        if len(text) <= max_length:
-            return text
+        if compact:
+            return _COMPACT_SUMMARY_TEMPLATE.format_map(fields)
         
-        return text[:max_length - 3] + "..."
\ No newline at end of file
+        fields['description'] = _truncate_text(ticket.description, 100)
+        return _SUMMARY_TEMPLATE.format_map(fields)
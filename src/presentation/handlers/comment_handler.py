@@ -2,22 +2,53 @@
 Focused comment handler for Telegram bot.
 Handles comment-related interactions with clean separation of concerns.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set, Tuple
+from dataclasses import dataclass
 from telegram import Update, ReplyKeyboardRemove
-from telegram.ext import ContextTypes
+from telegram.constants import ParseMode
+from telegram.ext import CallbackQueryHandler, ContextTypes
+import asyncio
 import logging
+import re
+import time
 
 from ...application import (
     ViewCommentsUseCase, 
     AddCommentUseCase,
     ViewCommentsRequest,
-    AddCommentRequest
+    AddCommentRequest,
+    TicketDTO
 )
 from ..formatters.comment_formatter import CommentFormatter
 from ..keyboards.comment_keyboards import CommentKeyboards
 
 logger = logging.getLogger(__name__)
 
+_MD = ParseMode.MARKDOWN
+_REMOVE_KB = ReplyKeyboardRemove()  # stateless, shared by every cancel reply
+
+_TEMPLATE_CACHE_TTL = 600  # seconds a fetched template list stays selectable
+
+_REVIEW_TMPL = (
+    "📝 **Review your comment:**\n\n"
+    "🎫 **Ticket:** {ticket}\n\n"
+    "💬 **Comment:**\n{body}\n\n"
+    "✅ **Post this comment?**"
+)
+
+_TYPE_PROMPT_TMPL = (
+    "✏️ **Type your {kind}:**\n\n"
+    "🎫 **Ticket:** {ticket}\n\n"
+    "💡 **Tip:** {tip}"
+)
+
+
+@dataclass(slots=True, frozen=True)
+class CommentDraftCtx:
+    """Ticket and comment type of the comment being written (kept in user_data)"""
+    ticket_number: str
+    comment_type: str
+
 
 class CommentHandler:
     """Focused handler for comment operations"""
@@ -33,6 +64,10 @@ class CommentHandler:
         self.add_comment_use_case = add_comment_use_case
         self.formatter = formatter
         self.keyboards = keyboards
+        # Strong references to in-flight background posts (asyncio keeps only weak ones)
+        self._pending_posts: Set[asyncio.Task] = set()
+        # Comment templates keyed by (user_email, ticket_number); user_data only keeps the key
+        self._template_cache: Dict[Tuple[str, str], Tuple[float, List[str]]] = {}
     
     async def handle_view_comments_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
         """Handle initial request to view comments"""
@@ -66,20 +101,21 @@ class CommentHandler:
             await update.message.reply_text(
                 message, 
                 reply_markup=keyboard, 
-                parse_mode='Markdown'
+                parse_mode=_MD
             )
             
-            # Store tickets in context for quick access
-            context.user_data['recent_tickets'] = [t.to_dict() for t in recent_tickets]
+            # Store tickets in context for quick access (DTOs as-is, no dict copies)
+            context.user_data['recent_tickets'] = recent_tickets
             
             return "WAITING_TICKET_SELECTION"
             
         except Exception as e:
-            logger.error(f"Error in handle_view_comments_start: {e}")
+            logger.error("Error in handle_view_comments_start: %s", e, exc_info=True)
             await update.message.reply_text("❌ Error loading tickets. Please try again.")
             return "END"
     
-    async def handle_ticket_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+    async def handle_ticket_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                      prefix: Optional[str] = None, args: str = "") -> str:
         """Handle ticket selection for viewing comments"""
         query = update.callback_query
         await query.answer()
@@ -88,11 +124,13 @@ class CommentHandler:
             user_email = context.user_data.get('email')
             
             # Parse callback data: "view_comments:TICKET_NUMBER"
-            if not query.data.startswith("view_comments:"):
+            if prefix is None:
+                prefix, _, args = query.data.partition(":")
+            if prefix != "view_comments":
                 await query.edit_message_text("❌ Invalid selection. Please try again.")
                 return "END"
             
-            ticket_number = query.data.split(":")[1]
+            ticket_number = args
             
             # Get comments for the ticket
             request = ViewCommentsRequest(
@@ -111,39 +149,36 @@ class CommentHandler:
                 can_add_internal=response.user_can_add_internal_comment
             )
             
-            await query.edit_message_text(
-                message,
-                reply_markup=keyboard,
-                parse_mode='Markdown'
-            )
+            await self._edit(query, message, keyboard)
             
             # Store current ticket in context
-            context.user_data['current_ticket'] = response.ticket.to_dict()
-            context.user_data['current_comments'] = [c.to_dict() for c in response.comments]
+            context.user_data['current_ticket'] = response.ticket
+            context.user_data['current_comments'] = response.comments
+            # Version is only recorded by refresh, which probes before reloading
+            context.user_data.pop('current_ticket_version', None)
             
             return "VIEWING_COMMENTS"
             
         except Exception as e:
-            logger.error(f"Error in handle_ticket_selection: {e}")
+            logger.error("Error in handle_ticket_selection: %s", e, exc_info=True)
             await query.edit_message_text("❌ Error loading comments. Please try again.")
             return "END"
     
-    async def handle_add_comment_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+    async def handle_add_comment_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                       prefix: Optional[str] = None, args: str = "") -> str:
         """Handle request to add a comment"""
         query = update.callback_query
         await query.answer()
         
         try:
             # Parse callback data: "add_comment:TICKET_NUMBER" or "add_internal:TICKET_NUMBER"
-            callback_parts = query.data.split(":")
-            comment_type = "internal" if callback_parts[0] == "add_internal" else "public"
-            ticket_number = callback_parts[1]
+            if prefix is None:
+                prefix, _, args = query.data.partition(":")
+            comment_type = "internal" if prefix == "add_internal" else "public"
+            ticket_number = args
             
             # Store comment context
-            context.user_data['adding_comment'] = {
-                'ticket_number': ticket_number,
-                'comment_type': comment_type
-            }
+            context.user_data['adding_comment'] = CommentDraftCtx(ticket_number, comment_type)
             
             # Get comment templates
             user_email = context.user_data.get('email')
@@ -154,75 +189,86 @@ class CommentHandler:
                 message = self.formatter.format_comment_templates(templates)
                 keyboard = self.keyboards.get_comment_templates_keyboard(ticket_number, templates)
                 
-                await query.edit_message_text(
-                    message,
-                    reply_markup=keyboard,
-                    parse_mode='Markdown'
-                )
+                await self._edit(query, message, keyboard)
                 
-                context.user_data['comment_templates'] = templates
+                context.user_data['comment_templates_key'] = self._cache_templates(
+                    user_email, ticket_number, templates
+                )
                 return "SELECTING_TEMPLATE"
             else:
                 # Go straight to text input
                 await query.edit_message_text(
-                    f"✏️ **Type your {'internal note' if comment_type == 'internal' else 'comment'}:**\n\n"
-                    f"🎫 **Ticket:** {ticket_number}\n\n"
-                    "💡 **Tip:** Keep it clear and helpful!",
+                    _TYPE_PROMPT_TMPL.format_map({
+                        "kind": 'internal note' if comment_type == 'internal' else 'comment',
+                        "ticket": ticket_number,
+                        "tip": "Keep it clear and helpful!"
+                    }),
                     reply_markup=self.keyboards.get_reply_keyboard_for_input(),
-                    parse_mode='Markdown'
+                    parse_mode=_MD
                 )
                 
                 return "TYPING_COMMENT"
                 
         except Exception as e:
-            logger.error(f"Error in handle_add_comment_start: {e}")
+            logger.error("Error in handle_add_comment_start: %s", e, exc_info=True)
             await query.edit_message_text("❌ Error starting comment addition. Please try again.")
             return "END"
     
-    async def handle_template_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+    async def handle_template_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                        prefix: Optional[str] = None, args: str = "") -> str:
         """Handle comment template selection"""
         query = update.callback_query
         await query.answer()
         
         try:
-            if query.data.startswith("use_template:"):
+            if prefix is None:
+                prefix, _, args = query.data.partition(":")
+            
+            if prefix == "use_template":
                 # Parse: "use_template:TICKET_NUMBER:INDEX"
-                parts = query.data.split(":")
-                ticket_number = parts[1]
-                template_index = int(parts[2])
+                ticket_number, _, index = args.partition(":")
+                template_index = int(index)
                 
-                templates = context.user_data.get('comment_templates', [])
-                if template_index < len(templates):
-                    selected_template = templates[template_index]
-                    
-                    # Store selected template as comment draft
-                    context.user_data['comment_draft'] = selected_template
-                    
-                    # Show confirmation
-                    message = f"📝 **Review your comment:**\n\n"
-                    message += f"🎫 **Ticket:** {ticket_number}\n\n"
-                    message += f"💬 **Comment:**\n{selected_template}\n\n"
-                    message += "✅ **Post this comment?**"
-                    
-                    keyboard = self.keyboards.get_comment_confirmation_keyboard(ticket_number)
-                    
-                    await query.edit_message_text(
-                        message,
-                        reply_markup=keyboard,
-                        parse_mode='Markdown'
+                templates_key = context.user_data.get('comment_templates_key')
+                templates = self._get_cached_templates(templates_key)
+                if not templates:
+                    # Cache entry expired (or never made it here): load the templates again
+                    templates = await self.add_comment_use_case.get_comment_templates(
+                        context.user_data.get('email'), ticket_number
                     )
-                    
-                    return "CONFIRMING_COMMENT"
-                    
-            elif query.data.startswith("custom_comment:"):
+                
+                if template_index >= len(templates):
+                    await query.edit_message_text("❌ Template no longer available. Please try again.")
+                    return "END"
+                
+                selected_template = templates[template_index]
+                
+                # Only the chosen template is needed from here on
+                self._template_cache.pop(context.user_data.pop('comment_templates_key', None), None)
+                
+                # Store selected template as comment draft
+                context.user_data['comment_draft'] = selected_template
+                
+                # Show confirmation
+                message = _REVIEW_TMPL.format_map({"ticket": ticket_number, "body": selected_template})
+                
+                keyboard = self.keyboards.get_comment_confirmation_keyboard(ticket_number)
+                
+                await self._edit(query, message, keyboard)
+                
+                return "CONFIRMING_COMMENT"
+                
+            elif prefix == "custom_comment":
                 # User wants to type custom comment
-                ticket_number = query.data.split(":")[1]
+                ticket_number = args
                 
                 await query.edit_message_text(
-                    f"✏️ **Type your comment:**\n\n"
-                    f"🎫 **Ticket:** {ticket_number}\n\n"
-                    "💡 **Tip:** Be specific and helpful!",
-                    parse_mode='Markdown'
+                    _TYPE_PROMPT_TMPL.format_map({
+                        "kind": 'comment',
+                        "ticket": ticket_number,
+                        "tip": "Be specific and helpful!"
+                    }),
+                    parse_mode=_MD
                 )
                 
                 # Remove inline keyboard and show reply keyboard
@@ -234,7 +280,7 @@ class CommentHandler:
                 return "TYPING_COMMENT"
                 
         except Exception as e:
-            logger.error(f"Error in handle_template_selection: {e}")
+            logger.error("Error in handle_template_selection: %s", e, exc_info=True)
             await query.edit_message_text("❌ Error processing template selection.")
             return "END"
     
@@ -245,13 +291,13 @@ class CommentHandler:
         if message_text == "❌ Cancel":
             await update.message.reply_text(
                 "❌ Comment cancelled.",
-                reply_markup=ReplyKeyboardRemove()
+                reply_markup=_REMOVE_KB
             )
             return "END"
         
         try:
-            comment_context = context.user_data.get('adding_comment', {})
-            ticket_number = comment_context.get('ticket_number')
+            comment_context = context.user_data.get('adding_comment')
+            ticket_number = comment_context.ticket_number if comment_context else None
             user_email = context.user_data.get('email')
             
             if not ticket_number:
@@ -266,50 +312,41 @@ class CommentHandler:
             
             if warnings:
                 # Show warnings
-                warning_message = self.formatter.format_comment_validation_warning(warnings)
-                keyboard = self.keyboards.get_comment_confirmation_keyboard(ticket_number, has_warnings=True)
-                
-                await update.message.reply_text(
-                    warning_message,
-                    reply_markup=keyboard,
-                    parse_mode='Markdown'
-                )
-                
-                return "CONFIRMING_COMMENT"
+                message = self.formatter.format_comment_validation_warning(warnings)
             else:
                 # No warnings, show direct confirmation
-                message = f"📝 **Review your comment:**\n\n"
-                message += f"🎫 **Ticket:** {ticket_number}\n\n"
-                message += f"💬 **Comment:**\n{message_text}\n\n"
-                message += "✅ **Post this comment?**"
-                
-                keyboard = self.keyboards.get_comment_confirmation_keyboard(ticket_number)
-                
-                await update.message.reply_text(
-                    message,
-                    reply_markup=keyboard,
-                    parse_mode='Markdown'
-                )
-                
-                return "CONFIRMING_COMMENT"
+                message = _REVIEW_TMPL.format_map({"ticket": ticket_number, "body": message_text})
+            
+            keyboard = self.keyboards.get_comment_confirmation_keyboard(ticket_number, has_warnings=bool(warnings))
+            
+            await update.message.reply_text(
+                message,
+                reply_markup=keyboard,
+                parse_mode=_MD
+            )
+            
+            return "CONFIRMING_COMMENT"
                 
         except Exception as e:
-            logger.error(f"Error in handle_comment_text_input: {e}")
+            logger.error("Error in handle_comment_text_input: %s", e, exc_info=True)
             await update.message.reply_text("❌ Error processing your comment. Please try again.")
             return "END"
     
-    async def handle_comment_confirmation(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+    async def handle_comment_confirmation(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                          prefix: Optional[str] = None, args: str = "") -> str:
         """Handle comment confirmation and posting"""
         query = update.callback_query
         await query.answer()
         
         try:
-            if not query.data.startswith("confirm_comment:"):
+            if prefix is None:
+                prefix, _, args = query.data.partition(":")
+            if prefix != "confirm_comment":
                 await query.edit_message_text("❌ Invalid action.")
                 return "END"
             
-            ticket_number = query.data.split(":")[1]
-            comment_context = context.user_data.get('adding_comment', {})
+            ticket_number = args
+            comment_context = context.user_data.get('adding_comment')
             comment_draft = context.user_data.get('comment_draft')
             user_email = context.user_data.get('email')
             
@@ -322,46 +359,105 @@ class CommentHandler:
                 ticket_number=ticket_number,
                 content=comment_draft,
                 author_email=user_email,
-                comment_type=comment_context.get('comment_type', 'public')
+                comment_type=comment_context.comment_type if comment_context else 'public'
             )
             
+            # One post per chat at a time: ignore repeated confirm taps while posting
+            post_lock = context.chat_data.setdefault('comment_post_lock', asyncio.Lock())
+            if post_lock.locked():
+                return "COMMENT_POSTED"
+            await post_lock.acquire()
+            
+            try:
+                # Ack right away, the Odoo write happens in the background
+                await query.edit_message_text("⏳ Posting comment…")
+                
+                current_ticket = context.user_data.get('current_ticket')
+                task = asyncio.create_task(
+                    self._post_and_notify(query, context.user_data, request, current_ticket, post_lock)
+                )
+            except BaseException:
+                post_lock.release()
+                raise
+            
+            self._pending_posts.add(task)
+            task.add_done_callback(self._pending_posts.discard)
+            
+            # The draft stays in user_data until the post succeeds so a failed post can be retried
+            return "COMMENT_POSTED"
+            
+        except Exception as e:
+            logger.error("Error in handle_comment_confirmation: %s", e, exc_info=True)
+            await query.edit_message_text("❌ Error posting comment. Please try again.")
+            return "END"
+    
+    async def _post_and_notify(self, query, user_data: dict, request: AddCommentRequest,
+                               current_ticket: Optional[TicketDTO], post_lock: asyncio.Lock) -> None:
+        """Post the comment, clear the draft once it is saved and replace the "Posting…" status with the outcome"""
+        try:
             response = await self.add_comment_use_case.execute(request)
             
+            # Clean up context (unless a new draft was started meanwhile)
+            if user_data.get('comment_draft') == request.content:
+                user_data.pop('adding_comment', None)
+                user_data.pop('comment_draft', None)
+                self._template_cache.pop(user_data.pop('comment_templates_key', None), None)
+            
             # Show success message
-            current_ticket = context.user_data.get('current_ticket', {})
             success_message = self.formatter.format_comment_added_success(
                 response.comment, 
                 current_ticket
             )
-            keyboard = self.keyboards.get_comment_success_keyboard(ticket_number)
+            keyboard = self.keyboards.get_comment_success_keyboard(request.ticket_number)
             
-            await query.edit_message_text(
-                success_message,
-                reply_markup=keyboard,
-                parse_mode='Markdown'
-            )
-            
-            # Clean up context
-            context.user_data.pop('adding_comment', None)
-            context.user_data.pop('comment_draft', None)
-            context.user_data.pop('comment_templates', None)
-            
-            return "COMMENT_POSTED"
+            await self._edit(query, success_message, keyboard)
             
         except Exception as e:
-            logger.error(f"Error in handle_comment_confirmation: {e}")
-            await query.edit_message_text("❌ Error posting comment. Please try again.")
-            return "END"
+            logger.error("Error posting comment to %s: %s", request.ticket_number, e, exc_info=True)
+            try:
+                await query.edit_message_text("❌ Error posting comment. Please try again.")
+            except Exception as notify_error:
+                logger.error("Error reporting comment failure: %s", notify_error, exc_info=True)
+        finally:
+            post_lock.release()
     
-    async def handle_refresh_comments(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+    async def handle_refresh_comments(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                      prefix: Optional[str] = None, args: str = "") -> str:
         """Handle refresh comments request"""
         query = update.callback_query
-        await query.answer("🔄 Refreshing...")
+        if prefix is None:
+            prefix, _, args = query.data.partition(":")
+        
+        # Ignore repeated taps on the same refresh button while one is still running
+        inflight = context.chat_data.setdefault('inflight_callbacks', set())
+        if query.data in inflight:
+            await query.answer()
+            return "VIEWING_COMMENTS"
+        inflight.add(query.data)
         
         try:
-            ticket_number = query.data.split(":")[1]
+            return await self._refresh_comments(query, context, args)
+        finally:
+            inflight.discard(query.data)
+    
+    async def _refresh_comments(self, query, context: ContextTypes.DEFAULT_TYPE, ticket_number: str) -> str:
+        """Reload and redisplay a ticket's comments unless they are unchanged"""
+        try:
             user_email = context.user_data.get('email')
             
+            # Probe the comment version first; skip the full reload if nothing changed.
+            # The displayed thread already passed the access check, so the probe is one query
+            current_ticket = context.user_data.get('current_ticket')
+            version = await self.view_comments_use_case.get_comment_version(
+                ticket_number, user_email,
+                access_checked=current_ticket is not None and current_ticket.number == ticket_number
+            )
+            if context.user_data.get('current_ticket_version') == (ticket_number, version):
+                await query.answer("✅ No new comments")
+                return "VIEWING_COMMENTS"
+            
+            await query.answer("🔄 Refreshing...")
+            
             # Refresh comments
             request = ViewCommentsRequest(
                 ticket_number=ticket_number,
@@ -379,19 +475,91 @@ class CommentHandler:
                 can_add_internal=response.user_can_add_internal_comment
             )
             
-            await query.edit_message_text(
-                message,
-                reply_markup=keyboard,
-                parse_mode='Markdown'
-            )
+            await self._edit(query, message, keyboard)
+            
+            context.user_data['current_ticket'] = response.ticket
+            context.user_data['current_comments'] = response.comments
+            context.user_data['current_ticket_version'] = (ticket_number, version)
             
             return "VIEWING_COMMENTS"
             
         except Exception as e:
-            logger.error(f"Error in handle_refresh_comments: {e}")
+            logger.error("Error in handle_refresh_comments: %s", e, exc_info=True)
             await query.edit_message_text("❌ Error refreshing comments.")
             return "END"
     
+    async def handle_cancel_comment(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                    prefix: Optional[str] = None, args: str = "") -> str:
+        """Handle the inline Cancel button of the comment confirmation"""
+        query = update.callback_query
+        await query.answer()
+        
+        context.user_data.pop('adding_comment', None)
+        context.user_data.pop('comment_draft', None)
+        self._template_cache.pop(context.user_data.pop('comment_templates_key', None), None)
+        
+        await query.edit_message_text("❌ Comment cancelled.")
+        return "END"
+    
+    # Callback-data prefix -> (handler, argument shape); handle_callback routes with a single dict lookup
+    _PREFIX_HANDLERS = {
+        "view_comments": (handle_ticket_selection, r":[^:]+"),
+        "add_comment": (handle_add_comment_start, r":[^:]+"),
+        "add_internal": (handle_add_comment_start, r":[^:]+"),
+        "use_template": (handle_template_selection, r":[^:]+:\d+"),
+        "custom_comment": (handle_template_selection, r":[^:]+"),
+        "confirm_comment": (handle_comment_confirmation, r":[^:]+"),
+        "refresh_comments": (handle_refresh_comments, r":[^:]+"),
+        "cancel_comment": (handle_cancel_comment, "")
+    }
+    
+    # One named alternative per prefix, each anchored to that prefix's argument shape;
+    # the matched group's name is the prefix, anything else is rejected in one match
+    _CALLBACK_RE = re.compile("|".join(
+        f"(?P<{prefix}>{re.escape(prefix)}{shape})" for prefix, (_, shape) in _PREFIX_HANDLERS.items()
+    ))
+    
+    def callback_handler(self) -> CallbackQueryHandler:
+        """Single CallbackQueryHandler for every comment callback, routed by handle_callback"""
+        return CallbackQueryHandler(self.handle_callback, pattern=self._CALLBACK_RE)
+    
+    async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+        """Route a comment callback to its handler by callback-data prefix"""
+        query = update.callback_query
+        match = self._CALLBACK_RE.fullmatch(query.data)
+        if match is None:
+            await query.answer()
+            await query.edit_message_text("❌ Invalid action.")
+            return "END"
+        
+        prefix = match.lastgroup
+        handler, _ = self._PREFIX_HANDLERS[prefix]
+        return await handler(self, update, context, prefix, query.data[len(prefix) + 1:])
+    
+    async def _edit(self, query, text: str, keyboard=None) -> None:
+        """Edit the callback message as Markdown with an optional inline keyboard"""
+        await query.edit_message_text(text, reply_markup=keyboard, parse_mode=_MD)
+    
+    def _cache_templates(self, user_email: str, ticket_number: str, templates: List[str]) -> Tuple[str, str]:
+        """Cache templates offered for a ticket and return the key to keep in user_data"""
+        self._sweep_template_cache()
+        key = (user_email, ticket_number)
+        self._template_cache[key] = (time.monotonic() + _TEMPLATE_CACHE_TTL, templates)
+        return key
+    
+    def _get_cached_templates(self, key: Optional[Tuple[str, str]]) -> List[str]:
+        """Get cached templates by key (empty list if missing or expired)"""
+        self._sweep_template_cache()
+        entry = self._template_cache.get(key) if key else None
+        return entry[1] if entry else []
+    
+    def _sweep_template_cache(self) -> None:
+        """Drop template entries whose TTL has passed"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._template_cache.items() if expires_at <= now]
+        for key in expired:
+            del self._template_cache[key]
+    
     def get_user_email(self, context: ContextTypes.DEFAULT_TYPE) -> Optional[str]:
         """Helper to get user email from context"""
         return context.user_data.get('email')
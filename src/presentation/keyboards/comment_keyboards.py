@@ -3,31 +3,144 @@ Comment-related keyboards for Telegram UI.
 Handles all comment navigation and action keyboards.
 """
 from typing import List, Optional
+from functools import lru_cache
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 from ...application.dto import TicketDTO, CommentDTO
+from ..utils import ellipsize
+
+
+_CANCEL_COMMENT_BUTTON = InlineKeyboardButton("❌ Cancel", callback_data="cancel_comment")
+_BACK_TO_TICKETS_ROW = (InlineKeyboardButton("🔙 Back to Tickets", callback_data="back_to_ticket_list"),)
+
+# Markups are frozen by PTB after __init__, so every memoized builder below
+# returns one shared instance per argument tuple
+
+
+@lru_cache(maxsize=1024)
+def _build_ticket_comments_keyboard(
+    ticket_number: str,
+    has_comments: bool,
+    can_add_comment: bool,
+    can_add_internal: bool
+) -> InlineKeyboardMarkup:
+    """Build the comments view keyboard for a ticket and permission flags"""
+    keyboard = []
+    
+    # Comments actions
+    if has_comments:
+        keyboard.append([
+            InlineKeyboardButton("📖 View All Comments", callback_data=f"view_all_comments:{ticket_number}"),
+            InlineKeyboardButton("🔍 Search Comments", callback_data=f"search_comments:{ticket_number}")
+        ])
+    
+    # Add comment buttons
+    if can_add_comment:
+        add_buttons = [InlineKeyboardButton("➕ Add Comment", callback_data=f"add_comment:{ticket_number}")]
+    
+        if can_add_internal:
+            add_buttons.append(InlineKeyboardButton("🔒 Internal Note", callback_data=f"add_internal:{ticket_number}"))
+    
+        keyboard.append(add_buttons)
+    
+    # Quick templates
+    if can_add_comment:
+        keyboard.append([InlineKeyboardButton("📝 Quick Templates", callback_data=f"comment_templates:{ticket_number}")])
+    
+    # Navigation
+    keyboard.append([
+        InlineKeyboardButton("🎫 Ticket Details", callback_data=f"ticket_details:{ticket_number}"),
+        InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_comments:{ticket_number}")
+    ])
+    
+    keyboard.append(_BACK_TO_TICKETS_ROW)
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+@lru_cache(maxsize=256)
+def _build_comment_templates_tail(ticket_number: str) -> tuple:
+    """Build the custom-comment and navigation rows under a ticket's template buttons"""
+    return (
+        (InlineKeyboardButton("✏️ Type Custom Comment", callback_data=f"custom_comment:{ticket_number}"),),
+        (
+            InlineKeyboardButton("🔙 Back to Comments", callback_data=f"view_comments:{ticket_number}"),
+            _CANCEL_COMMENT_BUTTON
+        )
+    )
+
+
+@lru_cache(maxsize=512)
+def _build_comment_type_keyboard(ticket_number: str) -> InlineKeyboardMarkup:
+    """Build the comment type keyboard for a ticket"""
+    keyboard = [
+        [InlineKeyboardButton("💬 Public Comment", callback_data=f"comment_type:{ticket_number}:public")],
+        [InlineKeyboardButton("🔒 Internal Note", callback_data=f"comment_type:{ticket_number}:internal")],
+        [InlineKeyboardButton("🔙 Back", callback_data=f"view_comments:{ticket_number}")]
+    ]
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+@lru_cache(maxsize=512)
+def _build_comment_success_keyboard(ticket_number: str) -> InlineKeyboardMarkup:
+    """Build the post-comment keyboard for a ticket"""
+    keyboard = [
+        [
+            InlineKeyboardButton("📖 View Comments", callback_data=f"view_comments:{ticket_number}"),
+            InlineKeyboardButton("➕ Add Another", callback_data=f"add_comment:{ticket_number}")
+        ],
+        [
+            InlineKeyboardButton("🎫 Ticket Details", callback_data=f"ticket_details:{ticket_number}"),
+            InlineKeyboardButton("🔙 Back to Tickets", callback_data="back_to_ticket_list")
+        ]
+    ]
+    
+    return InlineKeyboardMarkup(keyboard)
 
 
 class CommentKeyboards:
     """Generates keyboards for comment-related actions"""
     
-    def get_recent_tickets_keyboard(self, tickets: List[TicketDTO]) -> InlineKeyboardMarkup:
-        """Get keyboard for recent tickets selection"""
-        keyboard = []
-        
-        # Add ticket selection buttons (max 10)
-        for ticket in tickets[:10]:
-            button_text = f"{ticket.status_emoji} {ticket.number} - {ticket.title[:25]}..."
-            callback_data = f"view_comments:{ticket.number}"
-            keyboard.append([InlineKeyboardButton(button_text, callback_data=callback_data)])
-        
-        # Add navigation buttons
-        keyboard.append([
+    # Buttons and rows that never depend on the ticket are built once and
+    # spliced into every keyboard that uses them
+    _RECENT_TICKETS_TAIL = (
+        (
             InlineKeyboardButton("🔍 Search Tickets", callback_data="search_tickets_for_comments"),
             InlineKeyboardButton("🔄 Refresh", callback_data="refresh_recent_tickets")
-        ])
-        
-        # Add back button
-        keyboard.append([InlineKeyboardButton("🔙 Back to Menu", callback_data="back_to_main_menu")])
+        ),
+        (InlineKeyboardButton("🔙 Back to Menu", callback_data="back_to_main_menu"),),
+    )
+    
+    def __init__(self):
+        # Static reply keyboards are built once and shared across updates
+        self._reply_input_kb = ReplyKeyboardMarkup(
+            [
+                [KeyboardButton("❌ Cancel")],
+                [KeyboardButton("📝 Templates"), KeyboardButton("💡 Help")]
+            ],
+            resize_keyboard=True,
+            one_time_keyboard=True
+        )
+        self._quick_actions_kb = ReplyKeyboardMarkup(
+            [
+                [KeyboardButton("💬 Add Comment"), KeyboardButton("📖 View Comments")],
+                [KeyboardButton("🎫 Ticket Details"), KeyboardButton("🔍 Search")],
+                [KeyboardButton("🔙 Back to Menu")]
+            ],
+            resize_keyboard=True
+        )
+    
+    def get_recent_tickets_keyboard(self, tickets: List[TicketDTO]) -> InlineKeyboardMarkup:
+        """Get keyboard for recent tickets selection"""
+        # Ticket selection buttons (max 10), followed by the shared navigation rows
+        keyboard = [
+            [InlineKeyboardButton(
+                f"{ticket.status_emoji} {ticket.number} - {ellipsize(ticket.title, 26)}",
+                callback_data=ticket.callback_view
+            )]
+            for ticket in tickets[:10]
+        ]
+        keyboard.extend(self._RECENT_TICKETS_TAIL)
         
         return InlineKeyboardMarkup(keyboard)
     
@@ -39,68 +152,27 @@ class CommentKeyboards:
         can_add_internal: bool = False
     ) -> InlineKeyboardMarkup:
         """Get keyboard for ticket comments view"""
-        keyboard = []
-        
-        # Comments actions
-        if has_comments:
-            keyboard.append([
-                InlineKeyboardButton("📖 View All Comments", callback_data=f"view_all_comments:{ticket_number}"),
-                InlineKeyboardButton("🔍 Search Comments", callback_data=f"search_comments:{ticket_number}")
-            ])
-        
-        # Add comment buttons
-        if can_add_comment:
-            add_buttons = [InlineKeyboardButton("➕ Add Comment", callback_data=f"add_comment:{ticket_number}")]
-            
-            if can_add_internal:
-                add_buttons.append(InlineKeyboardButton("🔒 Internal Note", callback_data=f"add_internal:{ticket_number}"))
-            
-            keyboard.append(add_buttons)
-        
-        # Quick templates
-        if can_add_comment:
-            keyboard.append([InlineKeyboardButton("📝 Quick Templates", callback_data=f"comment_templates:{ticket_number}")])
-        
-        # Navigation
-        keyboard.append([
-            InlineKeyboardButton("🎫 Ticket Details", callback_data=f"ticket_details:{ticket_number}"),
-            InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_comments:{ticket_number}")
-        ])
-        
-        keyboard.append([InlineKeyboardButton("🔙 Back to Tickets", callback_data="back_to_ticket_list")])
-        
-        return InlineKeyboardMarkup(keyboard)
+        return _build_ticket_comments_keyboard(ticket_number, has_comments, can_add_comment, can_add_internal)
     
     def get_comment_templates_keyboard(self, ticket_number: str, templates: List[str]) -> InlineKeyboardMarkup:
         """Get keyboard for comment templates"""
-        keyboard = []
-        
         # Template buttons (max 8)
-        for i, template in enumerate(templates[:8]):
-            button_text = f"{i+1}️⃣ {template[:30]}..."
-            callback_data = f"use_template:{ticket_number}:{i}"
-            keyboard.append([InlineKeyboardButton(button_text, callback_data=callback_data)])
+        keyboard = [
+            [InlineKeyboardButton(
+                f"{i+1}️⃣ {ellipsize(template, 31)}",
+                callback_data=f"use_template:{ticket_number}:{i}"
+            )]
+            for i, template in enumerate(templates[:8])
+        ]
         
-        # Custom comment option
-        keyboard.append([InlineKeyboardButton("✏️ Type Custom Comment", callback_data=f"custom_comment:{ticket_number}")])
-        
-        # Navigation
-        keyboard.append([
-            InlineKeyboardButton("🔙 Back to Comments", callback_data=f"view_comments:{ticket_number}"),
-            InlineKeyboardButton("❌ Cancel", callback_data="cancel_comment")
-        ])
+        # Custom comment option and navigation
+        keyboard.extend(_build_comment_templates_tail(ticket_number))
         
         return InlineKeyboardMarkup(keyboard)
     
     def get_comment_type_keyboard(self, ticket_number: str) -> InlineKeyboardMarkup:
         """Get keyboard for selecting comment type"""
-        keyboard = [
-            [InlineKeyboardButton("💬 Public Comment", callback_data=f"comment_type:{ticket_number}:public")],
-            [InlineKeyboardButton("🔒 Internal Note", callback_data=f"comment_type:{ticket_number}:internal")],
-            [InlineKeyboardButton("🔙 Back", callback_data=f"view_comments:{ticket_number}")]
-        ]
-        
-        return InlineKeyboardMarkup(keyboard)
+        return _build_comment_type_keyboard(ticket_number)
     
     def get_comment_actions_keyboard(
         self, 
@@ -181,8 +253,6 @@ class CommentKeyboards:
         total_pages: int
     ) -> InlineKeyboardMarkup:
         """Get keyboard for comment pagination"""
-        keyboard = []
-        
         # Pagination buttons
         nav_buttons = []
         
@@ -194,42 +264,25 @@ class CommentKeyboards:
         if current_page < total_pages:
             nav_buttons.append(InlineKeyboardButton("➡️ Next", callback_data=f"comments_page:{ticket_number}:{current_page+1}"))
         
-        keyboard.append(nav_buttons)
-        
-        # Action buttons
-        keyboard.append([
-            InlineKeyboardButton("➕ Add Comment", callback_data=f"add_comment:{ticket_number}"),
-            InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_comments:{ticket_number}")
-        ])
-        
-        # Navigation
-        keyboard.append([InlineKeyboardButton("🔙 Back to Tickets", callback_data="back_to_ticket_list")])
-        
-        return InlineKeyboardMarkup(keyboard)
-    
-    def get_comment_success_keyboard(self, ticket_number: str) -> InlineKeyboardMarkup:
-        """Get keyboard after successful comment addition"""
+        # Fixed three-row layout: page navigation, actions, back
         keyboard = [
+            nav_buttons,
             [
-                InlineKeyboardButton("📖 View Comments", callback_data=f"view_comments:{ticket_number}"),
-                InlineKeyboardButton("➕ Add Another", callback_data=f"add_comment:{ticket_number}")
+                InlineKeyboardButton("➕ Add Comment", callback_data=f"add_comment:{ticket_number}"),
+                InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_comments:{ticket_number}")
             ],
-            [
-                InlineKeyboardButton("🎫 Ticket Details", callback_data=f"ticket_details:{ticket_number}"),
-                InlineKeyboardButton("🔙 Back to Tickets", callback_data="back_to_ticket_list")
-            ]
+            _BACK_TO_TICKETS_ROW
         ]
         
         return InlineKeyboardMarkup(keyboard)
     
+    def get_comment_success_keyboard(self, ticket_number: str) -> InlineKeyboardMarkup:
+        """Get keyboard after successful comment addition"""
+        return _build_comment_success_keyboard(ticket_number)
+    
     def get_reply_keyboard_for_input(self) -> ReplyKeyboardMarkup:
         """Get reply keyboard for text input"""
-        keyboard = [
-            [KeyboardButton("❌ Cancel")],
-            [KeyboardButton("📝 Templates"), KeyboardButton("💡 Help")]
-        ]
-        
-        return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=True)
+        return self._reply_input_kb
     
     def get_thread_keyboard(
         self, 
@@ -253,11 +306,5 @@ class CommentKeyboards:
         return InlineKeyboardMarkup(keyboard)
     
     def get_quick_actions_keyboard(self, ticket_number: str) -> ReplyKeyboardMarkup:
-        """Get quick actions reply keyboard"""
-        keyboard = [
-            [KeyboardButton("💬 Add Comment"), KeyboardButton("📖 View Comments")],
-            [KeyboardButton("🎫 Ticket Details"), KeyboardButton("🔍 Search")],
-            [KeyboardButton("🔙 Back to Menu")]
-        ]
-        
-        return ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
\ No newline at end of file
+        """Get quick actions reply keyboard (same layout for every ticket)"""
+        return self._quick_actions_kb
\ No newline at end of file
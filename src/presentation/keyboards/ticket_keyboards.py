@@ -2,275 +2,347 @@
 Ticket-related keyboards for Telegram UI.
 Handles all ticket navigation and action keyboards.
 """
-from typing import List, Optional
+from typing import Iterable, Optional
+from functools import lru_cache
+from itertools import islice
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 from ...application.dto import TicketDTO
+from ..utils import ellipsize
 
 
-class TicketKeyboards:
-    """Generates keyboards for ticket-related actions"""
+# Callback data shared by several keyboards (identifier-like literals are interned
+# by the compiler, so every keyboard references the same string object)
+_CB_VIEW_MY_TICKETS = "view_my_tickets"
+_CB_TICKETS_MENU = "tickets_menu"
+_CB_OVERDUE_TICKETS = "overdue_tickets"
+_CB_CREATE_TICKET = "create_ticket"
+
+
+def _mark(label: str, active: bool) -> str:
+    """Tick a filter button label when its value is the active one"""
+    return label + " ✓" if active else label
+
+
+# (button label, value) pairs offered by the filters keyboard, two buttons per row
+_FILTER_STATUSES_ROW1 = (("🟢 Open", "Open"), ("🟡 In Progress", "In Progress"))
+_FILTER_STATUSES_ROW2 = (("🔵 Resolved", "Resolved"), ("⚫ Closed", "Closed"))
+_FILTER_PRIORITIES_ROW1 = (("🟢 Low", "Low"), ("🟡 Medium", "Medium"))
+_FILTER_PRIORITIES_ROW2 = (("🟠 High", "High"), ("🔴 Urgent", "Urgent"))
+
+# Current status -> (button label, target status) pairs offered by the status change keyboard
+_STATUS_TRANSITIONS = {
+    "Open": (("🟡 In Progress", "In Progress"), ("🔵 Resolved", "Resolved")),
+    "In Progress": (("🟢 Open", "Open"), ("🔵 Resolved", "Resolved")),
+    "Resolved": (("🟢 Reopen", "Open"), ("⚫ Close", "Closed")),
+    "Closed": (("🟢 Reopen", "Open"),)
+}
+
+# Buttons that never vary, shared by every keyboard (and every call) that shows them
+_BTN_OVERDUE_TICKETS = InlineKeyboardButton("⚠️ Overdue Tickets", callback_data=_CB_OVERDUE_TICKETS)
+_BTN_BACK_TO_TICKETS = InlineKeyboardButton("🔙 Back to Tickets", callback_data=_CB_TICKETS_MENU)
+_BTN_FILTER_TICKETS = InlineKeyboardButton("🔍 Filter", callback_data="filter_tickets")
+_BTN_REFRESH_TICKETS = InlineKeyboardButton("🔄 Refresh", callback_data="refresh_tickets")
+_BTN_NEW_TICKET = InlineKeyboardButton("🆕 New", callback_data=_CB_CREATE_TICKET)
+_BACK_TO_TICKETS_MENU_ROW = (InlineKeyboardButton("🔙 Back to Tickets Menu", callback_data=_CB_TICKETS_MENU),)
+
+# PTB (>= 20) stores inline_keyboard/keyboard as tuples of tuples and freezes
+# markups and buttons after __init__, so the memoized builders below and the
+# static keyboards built at import hand out shared instances that no caller can
+# mutate; no read-only wrapper or defensive copy is needed.
+
+
+@lru_cache(maxsize=1024)
+def _build_ticket_details_keyboard(ticket_number: str, can_modify: bool, has_comments: bool) -> InlineKeyboardMarkup:
+    """Build the details keyboard for a ticket"""
+    keyboard = []
     
-    def get_main_tickets_keyboard(self) -> InlineKeyboardMarkup:
-        """Get main tickets menu keyboard"""
-        keyboard = [
-            [
-                InlineKeyboardButton("📋 My Tickets", callback_data="view_my_tickets"),
-                InlineKeyboardButton("🆕 Create Ticket", callback_data="create_ticket")
-            ],
-            [
-                InlineKeyboardButton("🔍 Search Tickets", callback_data="search_tickets"),
-                InlineKeyboardButton("📊 Dashboard", callback_data="ticket_dashboard")
-            ],
-            [
-                InlineKeyboardButton("💬 Recent Comments", callback_data="recent_comments"),
-                InlineKeyboardButton("⚠️ Overdue Tickets", callback_data="overdue_tickets")
-            ],
-            [InlineKeyboardButton("🔙 Back to Main Menu", callback_data="back_to_main_menu")]
-        ]
-        
-        return InlineKeyboardMarkup(keyboard)
+    # Comment actions
+    comment_buttons = []
+    if has_comments:
+        comment_buttons.append(InlineKeyboardButton("💬 View Comments", callback_data="view_comments:" + ticket_number))
     
-    def get_ticket_list_keyboard(
-        self, 
-        tickets: List[TicketDTO],
-        current_page: int = 1,
-        total_pages: int = 1,
-        show_filters: bool = True
-    ) -> InlineKeyboardMarkup:
-        """Get keyboard for ticket list"""
-        keyboard = []
-        
-        # Ticket selection buttons (max 5 per page)
-        for ticket in tickets[:5]:
-            button_text = f"{ticket.status_emoji} {ticket.number} - {ticket.title[:25]}..."
-            callback_data = f"view_ticket:{ticket.number}"
-            keyboard.append([InlineKeyboardButton(button_text, callback_data=callback_data)])
-        
-        # Pagination if needed
-        if total_pages > 1:
-            nav_buttons = []
-            if current_page > 1:
-                nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"tickets_page:{current_page-1}"))
-            
-            nav_buttons.append(InlineKeyboardButton(f"📄 {current_page}/{total_pages}", callback_data="noop"))
-            
-            if current_page < total_pages:
-                nav_buttons.append(InlineKeyboardButton("➡️ Next", callback_data=f"tickets_page:{current_page+1}"))
-            
-            keyboard.append(nav_buttons)
-        
-        # Action buttons
-        action_buttons = []
-        if show_filters:
-            action_buttons.append(InlineKeyboardButton("🔍 Filter", callback_data="filter_tickets"))
-        
-        action_buttons.extend([
-            InlineKeyboardButton("🔄 Refresh", callback_data="refresh_tickets"),
-            InlineKeyboardButton("🆕 New", callback_data="create_ticket")
-        ])
-        
-        keyboard.append(action_buttons)
-        
-        # Navigation
-        keyboard.append([InlineKeyboardButton("🔙 Back to Tickets Menu", callback_data="tickets_menu")])
-        
-        return InlineKeyboardMarkup(keyboard)
+    comment_buttons.append(InlineKeyboardButton("➕ Add Comment", callback_data="add_comment:" + ticket_number))
+    
+    keyboard.append(comment_buttons)
     
-    def get_ticket_details_keyboard(
-        self, 
-        ticket_number: str,
-        can_modify: bool = False,
-        comment_count: int = 0
-    ) -> InlineKeyboardMarkup:
-        """Get keyboard for ticket details view"""
-        keyboard = []
-        
-        # Comment actions
-        comment_buttons = []
-        if comment_count > 0:
-            comment_buttons.append(InlineKeyboardButton("💬 View Comments", callback_data=f"view_comments:{ticket_number}"))
-        
-        comment_buttons.append(InlineKeyboardButton("➕ Add Comment", callback_data=f"add_comment:{ticket_number}"))
-        
-        keyboard.append(comment_buttons)
-        
-        # Ticket actions
-        if can_modify:
-            modify_buttons = [
-                InlineKeyboardButton("✏️ Edit", callback_data=f"edit_ticket:{ticket_number}"),
-                InlineKeyboardButton("🏷️ Change Status", callback_data=f"change_status:{ticket_number}")
-            ]
-            keyboard.append(modify_buttons)
-        
-        # Information actions
-        info_buttons = [
-            InlineKeyboardButton("📋 Full Details", callback_data=f"full_details:{ticket_number}"),
-            InlineKeyboardButton("📈 History", callback_data=f"ticket_history:{ticket_number}")
+    # Ticket actions
+    if can_modify:
+        modify_buttons = [
+            InlineKeyboardButton("✏️ Edit", callback_data="edit_ticket:" + ticket_number),
+            InlineKeyboardButton("🏷️ Change Status", callback_data="change_status:" + ticket_number)
         ]
-        keyboard.append(info_buttons)
-        
-        # Navigation
-        keyboard.append([
-            InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh_ticket:{ticket_number}"),
-            InlineKeyboardButton("🔙 Back to List", callback_data="view_my_tickets")
-        ])
-        
-        return InlineKeyboardMarkup(keyboard)
+        keyboard.append(modify_buttons)
+    
+    # Information actions
+    info_buttons = [
+        InlineKeyboardButton("📋 Full Details", callback_data="full_details:" + ticket_number),
+        InlineKeyboardButton("📈 History", callback_data="ticket_history:" + ticket_number)
+    ]
+    keyboard.append(info_buttons)
     
-    def get_ticket_filters_keyboard(
-        self,
-        current_status: Optional[str] = None,
-        current_priority: Optional[str] = None
-    ) -> InlineKeyboardMarkup:
-        """Get keyboard for ticket filtering"""
-        keyboard = []
-        
-        # Status filters
-        keyboard.append([InlineKeyboardButton("📊 Filter by Status", callback_data="filter_header_status")])
-        
-        status_buttons = []
-        statuses = [("🟢 Open", "Open"), ("🟡 In Progress", "In Progress"), ("🔵 Resolved", "Resolved"), ("⚫ Closed", "Closed")]
-        
-        for emoji_text, status in statuses:
-            callback_data = f"filter_status:{status}"
-            if current_status == status:
-                emoji_text += " ✓"
-            status_buttons.append(InlineKeyboardButton(emoji_text, callback_data=callback_data))
-        
-        # Split into 2 rows
-        keyboard.append(status_buttons[:2])
-        keyboard.append(status_buttons[2:])
-        
-        # Priority filters
-        keyboard.append([InlineKeyboardButton("⚡ Filter by Priority", callback_data="filter_header_priority")])
-        
-        priority_buttons = []
-        priorities = [("🟢 Low", "Low"), ("🟡 Medium", "Medium"), ("🟠 High", "High"), ("🔴 Urgent", "Urgent")]
-        
-        for emoji_text, priority in priorities:
-            callback_data = f"filter_priority:{priority}"
-            if current_priority == priority:
-                emoji_text += " ✓"
-            priority_buttons.append(InlineKeyboardButton(emoji_text, callback_data=callback_data))
-        
-        # Split into 2 rows
-        keyboard.append(priority_buttons[:2])
-        keyboard.append(priority_buttons[2:])
-        
+    # Navigation
+    keyboard.append([
+        InlineKeyboardButton("🔄 Refresh", callback_data="refresh_ticket:" + ticket_number),
+        InlineKeyboardButton("🔙 Back to List", callback_data=_CB_VIEW_MY_TICKETS)
+    ])
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+@lru_cache(maxsize=64)
+def _build_ticket_filters_keyboard(current_status: Optional[str], current_priority: Optional[str]) -> InlineKeyboardMarkup:
+    """Build the filters keyboard for the selected status/priority"""
+    keyboard = [
+        # Status filters, split into 2 rows
+        [InlineKeyboardButton("📊 Filter by Status", callback_data="filter_header_status")],
+        [
+            InlineKeyboardButton(_mark(text, status == current_status), callback_data="filter_status:" + status)
+            for text, status in _FILTER_STATUSES_ROW1
+        ],
+        [
+            InlineKeyboardButton(_mark(text, status == current_status), callback_data="filter_status:" + status)
+            for text, status in _FILTER_STATUSES_ROW2
+        ],
+        # Priority filters, split into 2 rows
+        [InlineKeyboardButton("⚡ Filter by Priority", callback_data="filter_header_priority")],
+        [
+            InlineKeyboardButton(_mark(text, priority == current_priority), callback_data="filter_priority:" + priority)
+            for text, priority in _FILTER_PRIORITIES_ROW1
+        ],
+        [
+            InlineKeyboardButton(_mark(text, priority == current_priority), callback_data="filter_priority:" + priority)
+            for text, priority in _FILTER_PRIORITIES_ROW2
+        ],
         # Clear and apply
-        keyboard.append([
+        [
             InlineKeyboardButton("🗑️ Clear Filters", callback_data="clear_filters"),
             InlineKeyboardButton("✅ Apply Filters", callback_data="apply_filters")
-        ])
-        
+        ],
         # Navigation
-        keyboard.append([InlineKeyboardButton("🔙 Back to Tickets", callback_data="view_my_tickets")])
-        
-        return InlineKeyboardMarkup(keyboard)
+        [InlineKeyboardButton("🔙 Back to Tickets", callback_data=_CB_VIEW_MY_TICKETS)]
+    ]
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+@lru_cache(maxsize=1024)
+def _build_ticket_status_change_keyboard(ticket_number: str, current_status: str) -> InlineKeyboardMarkup:
+    """Build the status change keyboard for a ticket"""
+    keyboard = []
+    
+    keyboard.append([InlineKeyboardButton("🏷️ Change Status", callback_data="status_header")])
+    
+    # Available status transitions (simplified)
+    for text, status in _STATUS_TRANSITIONS.get(current_status, ()):
+        callback_data = ":".join(("set_status", ticket_number, status))
+        keyboard.append([InlineKeyboardButton(text, callback_data=callback_data)])
     
-    def get_ticket_search_keyboard(self) -> InlineKeyboardMarkup:
-        """Get keyboard for ticket search"""
-        keyboard = [
-            [
-                InlineKeyboardButton("🔍 Search by Title", callback_data="search_by_title"),
-                InlineKeyboardButton("📝 Search by Content", callback_data="search_by_content")
-            ],
-            [
-                InlineKeyboardButton("🏷️ Search by Number", callback_data="search_by_number"),
-                InlineKeyboardButton("👤 Search by Creator", callback_data="search_by_creator")
-            ],
-            [
-                InlineKeyboardButton("🔄 Recent Searches", callback_data="recent_searches"),
-                InlineKeyboardButton("🌐 Advanced Search", callback_data="advanced_search")
-            ],
-            [InlineKeyboardButton("🔙 Back to Tickets", callback_data="tickets_menu")]
+    # Navigation
+    keyboard.append([
+        InlineKeyboardButton("❌ Cancel", callback_data="view_ticket:" + ticket_number),
+        InlineKeyboardButton("🔙 Back", callback_data="view_ticket:" + ticket_number)
+    ])
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+@lru_cache(maxsize=1024)
+def _build_ticket_actions_keyboard(ticket_number: str) -> InlineKeyboardMarkup:
+    """Build the quick actions keyboard for a ticket"""
+    keyboard = [
+        [
+            InlineKeyboardButton("👁️ View", callback_data="view_ticket:" + ticket_number),
+            InlineKeyboardButton("💬 Comments", callback_data="view_comments:" + ticket_number)
+        ],
+        [
+            InlineKeyboardButton("➕ Add Comment", callback_data="add_comment:" + ticket_number),
+            InlineKeyboardButton("📋 Details", callback_data="full_details:" + ticket_number)
         ]
-        
-        return InlineKeyboardMarkup(keyboard)
+    ]
     
-    def get_ticket_dashboard_keyboard(self) -> InlineKeyboardMarkup:
-        """Get keyboard for ticket dashboard"""
-        keyboard = [
-            [
-                InlineKeyboardButton("📊 Status Overview", callback_data="status_overview"),
-                InlineKeyboardButton("📈 My Statistics", callback_data="my_statistics")
-            ],
-            [
-                InlineKeyboardButton("⚠️ Overdue Tickets", callback_data="overdue_tickets"),
-                InlineKeyboardButton("🎯 High Priority", callback_data="high_priority_tickets")
-            ],
-            [
-                InlineKeyboardButton("📅 This Week", callback_data="tickets_this_week"),
-                InlineKeyboardButton("📆 This Month", callback_data="tickets_this_month")
-            ],
-            [
-                InlineKeyboardButton("🔄 Refresh Dashboard", callback_data="refresh_dashboard"),
-                InlineKeyboardButton("🔙 Back to Tickets", callback_data="tickets_menu")
-            ]
+    return InlineKeyboardMarkup(keyboard)
+
+
+# Keyboards that never vary are built once at import and shared across updates
+_MAIN_TICKETS_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("📋 My Tickets", callback_data=_CB_VIEW_MY_TICKETS),
+            InlineKeyboardButton("🆕 Create Ticket", callback_data=_CB_CREATE_TICKET)
+        ],
+        [
+            InlineKeyboardButton("🔍 Search Tickets", callback_data="search_tickets"),
+            InlineKeyboardButton("📊 Dashboard", callback_data="ticket_dashboard")
+        ],
+        [
+            InlineKeyboardButton("💬 Recent Comments", callback_data="recent_comments"),
+            _BTN_OVERDUE_TICKETS
+        ],
+        [InlineKeyboardButton("🔙 Back to Main Menu", callback_data="back_to_main_menu")]
+    ]
+)
+_SEARCH_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("🔍 Search by Title", callback_data="search_by_title"),
+            InlineKeyboardButton("📝 Search by Content", callback_data="search_by_content")
+        ],
+        [
+            InlineKeyboardButton("🏷️ Search by Number", callback_data="search_by_number"),
+            InlineKeyboardButton("👤 Search by Creator", callback_data="search_by_creator")
+        ],
+        [
+            InlineKeyboardButton("🔄 Recent Searches", callback_data="recent_searches"),
+            InlineKeyboardButton("🌐 Advanced Search", callback_data="advanced_search")
+        ],
+        [_BTN_BACK_TO_TICKETS]
+    ]
+)
+_DASHBOARD_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("📊 Status Overview", callback_data="status_overview"),
+            InlineKeyboardButton("📈 My Statistics", callback_data="my_statistics")
+        ],
+        [
+            _BTN_OVERDUE_TICKETS,
+            InlineKeyboardButton("🎯 High Priority", callback_data="high_priority_tickets")
+        ],
+        [
+            InlineKeyboardButton("📅 This Week", callback_data="tickets_this_week"),
+            InlineKeyboardButton("📆 This Month", callback_data="tickets_this_month")
+        ],
+        [
+            InlineKeyboardButton("🔄 Refresh Dashboard", callback_data="refresh_dashboard"),
+            _BTN_BACK_TO_TICKETS
         ]
-        
-        return InlineKeyboardMarkup(keyboard)
+    ]
+)
+_CREATE_TICKET_KB = ReplyKeyboardMarkup(
+    [
+        [KeyboardButton("❌ Cancel Creation")],
+        [KeyboardButton("💡 Help"), KeyboardButton("📝 Templates")]
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True
+)
+_QUICK_ACTIONS_KB = ReplyKeyboardMarkup(
+    [
+        [KeyboardButton("📋 My Tickets"), KeyboardButton("🆕 Create Ticket")],
+        [KeyboardButton("💬 Comments"), KeyboardButton("🔍 Search")],
+        [KeyboardButton("📊 Dashboard"), KeyboardButton("🔙 Main Menu")]
+    ],
+    resize_keyboard=True
+)
+
+
+def get_main_tickets_keyboard() -> InlineKeyboardMarkup:
+    """Get main tickets menu keyboard"""
+    return _MAIN_TICKETS_KB
+
+
+def get_ticket_list_keyboard(
+    tickets: Iterable[TicketDTO],
+    current_page: int = 1,
+    total_pages: int = 1,
+    show_filters: bool = True
+) -> InlineKeyboardMarkup:
+    """Get keyboard for ticket list"""
+    # Ticket selection buttons (max 5 per page)
+    keyboard = [
+        [InlineKeyboardButton(
+            f"{ticket.status_emoji} {ticket.number} - {ellipsize(ticket.title, 26)}",
+            callback_data="view_ticket:" + ticket.number
+        )]
+        for ticket in islice(tickets, 5)
+    ]
     
-    def get_ticket_status_change_keyboard(self, ticket_number: str, current_status: str) -> InlineKeyboardMarkup:
-        """Get keyboard for changing ticket status"""
-        keyboard = []
-        
-        keyboard.append([InlineKeyboardButton("🏷️ Change Status", callback_data="status_header")])
-        
-        # Available status transitions (simplified)
-        status_options = []
-        
-        if current_status == "Open":
-            status_options = [("🟡 In Progress", "In Progress"), ("🔵 Resolved", "Resolved")]
-        elif current_status == "In Progress":
-            status_options = [("🟢 Open", "Open"), ("🔵 Resolved", "Resolved")]
-        elif current_status == "Resolved":
-            status_options = [("🟢 Reopen", "Open"), ("⚫ Close", "Closed")]
-        elif current_status == "Closed":
-            status_options = [("🟢 Reopen", "Open")]
-        
-        for text, status in status_options:
-            callback_data = f"set_status:{ticket_number}:{status}"
-            keyboard.append([InlineKeyboardButton(text, callback_data=callback_data)])
-        
-        # Navigation
+    # Pagination if needed: Previous / page indicator / Next, edge buttons only when applicable
+    if total_pages > 1:
         keyboard.append([
-            InlineKeyboardButton("❌ Cancel", callback_data=f"view_ticket:{ticket_number}"),
-            InlineKeyboardButton("🔙 Back", callback_data=f"view_ticket:{ticket_number}")
+            button for button in (
+                InlineKeyboardButton("⬅️ Previous", callback_data=f"tickets_page:{current_page-1}")
+                if current_page > 1 else None,
+                InlineKeyboardButton(f"📄 {current_page}/{total_pages}", callback_data="noop"),
+                InlineKeyboardButton("➡️ Next", callback_data=f"tickets_page:{current_page+1}")
+                if current_page < total_pages else None
+            )
+            if button is not None
         ])
-        
-        return InlineKeyboardMarkup(keyboard)
     
-    def get_create_ticket_keyboard(self) -> ReplyKeyboardMarkup:
-        """Get keyboard for ticket creation process"""
-        keyboard = [
-            [KeyboardButton("❌ Cancel Creation")],
-            [KeyboardButton("💡 Help"), KeyboardButton("📝 Templates")]
-        ]
-        
-        return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=True)
+    # Action buttons, then navigation
+    keyboard.extend((
+        [_BTN_FILTER_TICKETS, _BTN_REFRESH_TICKETS, _BTN_NEW_TICKET]
+        if show_filters else [_BTN_REFRESH_TICKETS, _BTN_NEW_TICKET],
+        _BACK_TO_TICKETS_MENU_ROW
+    ))
     
-    def get_quick_actions_keyboard(self) -> ReplyKeyboardMarkup:
-        """Get quick actions keyboard"""
-        keyboard = [
-            [KeyboardButton("📋 My Tickets"), KeyboardButton("🆕 Create Ticket")],
-            [KeyboardButton("💬 Comments"), KeyboardButton("🔍 Search")],
-            [KeyboardButton("📊 Dashboard"), KeyboardButton("🔙 Main Menu")]
-        ]
-        
-        return ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
+    return InlineKeyboardMarkup(keyboard)
+
+
+def get_ticket_details_keyboard(
+    ticket_number: str,
+    can_modify: bool = False,
+    comment_count: int = 0
+) -> InlineKeyboardMarkup:
+    """Get keyboard for ticket details view"""
+    return _build_ticket_details_keyboard(ticket_number, can_modify, comment_count > 0)
+
+
+def get_ticket_filters_keyboard(
+    current_status: Optional[str] = None,
+    current_priority: Optional[str] = None
+) -> InlineKeyboardMarkup:
+    """Get keyboard for ticket filtering"""
+    return _build_ticket_filters_keyboard(current_status, current_priority)
+
+
+def get_ticket_search_keyboard() -> InlineKeyboardMarkup:
+    """Get keyboard for ticket search"""
+    return _SEARCH_KB
+
+
+def get_ticket_dashboard_keyboard() -> InlineKeyboardMarkup:
+    """Get keyboard for ticket dashboard"""
+    return _DASHBOARD_KB
+
+
+def get_ticket_status_change_keyboard(ticket_number: str, current_status: str) -> InlineKeyboardMarkup:
+    """Get keyboard for changing ticket status"""
+    return _build_ticket_status_change_keyboard(ticket_number, current_status)
+
+
+def get_create_ticket_keyboard() -> ReplyKeyboardMarkup:
+    """Get keyboard for ticket creation process"""
+    return _CREATE_TICKET_KB
+
+
+def get_quick_actions_keyboard() -> ReplyKeyboardMarkup:
+    """Get quick actions keyboard"""
+    return _QUICK_ACTIONS_KB
+
+
+def get_ticket_actions_inline_keyboard(ticket_number: str) -> InlineKeyboardMarkup:
+    """Get inline keyboard for quick ticket actions"""
+    return _build_ticket_actions_keyboard(ticket_number)
+
+
+class TicketKeyboards:
+    """Generates keyboards for ticket-related actions (delegates to the module-level functions)"""
     
-    def get_ticket_actions_inline_keyboard(self, ticket_number: str) -> InlineKeyboardMarkup:
-        """Get inline keyboard for quick ticket actions"""
-        keyboard = [
-            [
-                InlineKeyboardButton("👁️ View", callback_data=f"view_ticket:{ticket_number}"),
-                InlineKeyboardButton("💬 Comments", callback_data=f"view_comments:{ticket_number}")
-            ],
-            [
-                InlineKeyboardButton("➕ Add Comment", callback_data=f"add_comment:{ticket_number}"),
-                InlineKeyboardButton("📋 Details", callback_data=f"full_details:{ticket_number}")
-            ]
-        ]
-        
-        return InlineKeyboardMarkup(keyboard)
\ No newline at end of file
+    __slots__ = ()
+    
+    get_main_tickets_keyboard = staticmethod(get_main_tickets_keyboard)
+    get_ticket_list_keyboard = staticmethod(get_ticket_list_keyboard)
+    get_ticket_details_keyboard = staticmethod(get_ticket_details_keyboard)
+    get_ticket_filters_keyboard = staticmethod(get_ticket_filters_keyboard)
+    get_ticket_search_keyboard = staticmethod(get_ticket_search_keyboard)
+    get_ticket_dashboard_keyboard = staticmethod(get_ticket_dashboard_keyboard)
+    get_ticket_status_change_keyboard = staticmethod(get_ticket_status_change_keyboard)
+    get_create_ticket_keyboard = staticmethod(get_create_ticket_keyboard)
+    get_quick_actions_keyboard = staticmethod(get_quick_actions_keyboard)
+    get_ticket_actions_inline_keyboard = staticmethod(get_ticket_actions_inline_keyboard)
+
+
+# Stateless, so one shared instance serves every caller
+ticket_keyboards = TicketKeyboards()
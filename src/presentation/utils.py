@@ -0,0 +1,9 @@
+"""
+Shared text helpers for Telegram UI.
+Used by both formatters and keyboards.
+"""
+
+
+def ellipsize(text: str, max_length: int) -> str:
+    """Shorten text to max_length characters, ending with … when cut"""
+    return text if len(text) <= max_length else f"{text[:max_length - 1]}…"
@@ -87,7 +87,7 @@ class AwaitingTicketsHandler(BaseViewHandler):
         
         try:
             # Extract ticket ID from callback data
-            ticket_id = query.data.split('_')[-1]
+            ticket_id = query.data.rpartition('_')[2]
             
             # Store ticket ID in context for later use
             context.user_data['awaiting_comment_ticket_id'] = ticket_id
@@ -120,7 +120,7 @@ class AwaitingTicketsHandler(BaseViewHandler):
         
         try:
             # Extract ticket ID from callback data
-            ticket_id = query.data.split('_')[-1]
+            ticket_id = query.data.rpartition('_')[2]
             
             # Mark ticket as resolved/done
             success = await self.ticket_service.update_ticket_status(ticket_id, 'resolved')
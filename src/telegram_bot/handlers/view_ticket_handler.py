@@ -185,7 +185,7 @@ class ViewTicketHandler(BaseViewHandler):
             if callback_data.startswith("view_page_") and callback_data != "view_page_info":
                 await query.answer()
                 # Handle pagination
-                page = int(callback_data.split("_")[-1])
+                page = int(callback_data.rpartition("_")[2])
                 chat_id = str(query.message.chat_id)
                 return await self.ticket_list_handler.handle_pagination(query, chat_id, user_id, page)
             
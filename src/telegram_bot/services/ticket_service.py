@@ -357,10 +357,11 @@ class TicketService:
             logger.info(f"Updating ticket {ticket_number} to status {new_status}")
             
             # Use ticket manager to update status
-            success = await self.ticket_manager.pg_connector.update_ticket_status(
+            updated_rows = await self.ticket_manager.pg_connector.update_ticket_status(
                 ticket_number,
                 new_status
             )
+            success = bool(updated_rows)
             
             if success:
                 logger.info(f"Successfully updated ticket {ticket_number} to status {new_status}")
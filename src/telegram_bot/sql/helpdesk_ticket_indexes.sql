@@ -0,0 +1,9 @@
+-- Helpdesk Ticket Indexes
+-- Indexes backing the bot's ticket listing queries on helpdesk_ticket
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY does not lock helpdesk_ticket)
+
+-- Listing tickets by user email: matches both the lower(partner_email) filter
+-- and ORDER BY create_date DESC, so the planner reads the top-N rows straight
+-- from the index without a sort
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ht_partner_email_lower_date
+ON helpdesk_ticket (lower(partner_email), create_date DESC);
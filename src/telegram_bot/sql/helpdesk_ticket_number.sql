@@ -0,0 +1,51 @@
+-- Ticket Number Sequences
+-- Per-country sequences and the number generator used by the bot's ticket INSERT
+-- Ticket numbers have the format [PREFIX][DDMMYY][XXX], XXX = 001-999
+
+-- Create one sequence per country prefix (VN, TH, IN, SG, PH, MY, ID)
+-- and seed it past the suffixes already used today so new numbers never
+-- repeat tickets created before the sequence existed
+DO $$
+DECLARE
+    country_prefix TEXT;
+    sequence_name TEXT;
+    last_suffix INTEGER;
+BEGIN
+    FOREACH country_prefix IN ARRAY ARRAY['VN', 'TH', 'IN', 'SG', 'PH', 'MY', 'ID'] LOOP
+        sequence_name := 'helpdesk_ticket_' || lower(country_prefix) || '_seq';
+        EXECUTE format('CREATE SEQUENCE IF NOT EXISTS %I', sequence_name);
+
+        SELECT max(right(number, 3)::INTEGER) INTO last_suffix
+        FROM helpdesk_ticket
+        WHERE number ~ ('^' || country_prefix || to_char(now(), 'DDMMYY') || '[0-9]{3}$');
+
+        IF last_suffix IS NOT NULL THEN
+            PERFORM setval(sequence_name, last_suffix);
+        END IF;
+    END LOOP;
+END
+$$;
+
+-- Next free ticket number for a prefix: takes values from the country sequence
+-- (wrapping 999 -> 001) and skips numbers already present in the target table,
+-- so a wrapped sequence cannot produce a duplicate ticket number
+CREATE OR REPLACE FUNCTION telegram_next_ticket_number(number_prefix TEXT, sequence_name TEXT, table_name TEXT)
+RETURNS TEXT AS $$
+DECLARE
+    candidate TEXT;
+    taken BOOLEAN;
+BEGIN
+    FOR attempt IN 1..999 LOOP
+        candidate := number_prefix || lpad(((nextval(sequence_name) - 1) % 999 + 1)::TEXT, 3, '0');
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE number = $1)', table_name)
+            INTO taken USING candidate;
+        IF NOT taken THEN
+            RETURN candidate;
+        END IF;
+    END LOOP;
+    RAISE EXCEPTION 'No free ticket number left for prefix %', number_prefix;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add comment to function
+COMMENT ON FUNCTION telegram_next_ticket_number(TEXT, TEXT, TEXT) IS 'Next unused [PREFIX][DDMMYY][XXX] ticket number from the per-country sequence';
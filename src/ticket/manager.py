@@ -62,8 +62,8 @@ class TicketManager:
                     'message': 'Dữ liệu ticket không hợp lệ'
                 }
             
-            # Tạo ticket trong PostgreSQL với destination
-            result = self.pg_connector.create_ticket(ticket_data, destination)
+            # Tạo ticket trong PostgreSQL với destination (không block event loop)
+            result = await self.pg_connector.create_ticket_async(ticket_data, destination)
             
             if result['success']:
                 ticket_number = result.get('ticket_number', f"#{result['ticket_id']}")
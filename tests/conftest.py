@@ -65,6 +65,6 @@ async def cleanup_async_resources():
     """Cleanup async resources after each test"""
     yield
     # Close any remaining async resources
-    tasks = [task for task in asyncio.all_tasks() if not task.done()]
+    tasks = [task for task in asyncio.all_tasks() if not task.done() and task is not asyncio.current_task()]
     if tasks:
         await asyncio.gather(*tasks, return_exceptions=True)
\ No newline at end of file
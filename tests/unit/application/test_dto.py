@@ -0,0 +1,65 @@
+"""
+Unit tests for application DTOs.
+Tests derived display fields of the frozen ticket and comment DTOs.
+"""
+import pytest
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+from src.application.dto import TicketDTO, CommentDTO
+from src.domain.entities.ticket import Ticket, TicketStatus, TicketPriority
+from src.domain.entities.comment import Comment, CommentType
+
+
+class TestTicketDTO:
+    """Test TicketDTO"""
+    
+    @pytest.fixture
+    def ticket_dto(self):
+        """Create ticket DTO from a domain ticket"""
+        return TicketDTO.from_domain(Ticket(
+            number="TKT-001",
+            title="Test Ticket",
+            description="Test description",
+            status=TicketStatus.IN_PROGRESS,
+            priority=TicketPriority.URGENT,
+            creator_email="user@example.com",
+            created_date=datetime(2024, 3, 5, 9, 30)
+        ))
+    
+    def test_derived_fields(self, ticket_dto):
+        """Test emojis, dates and callback data are derived from the fields"""
+        assert ticket_dto.status_emoji == "🟡"
+        assert ticket_dto.priority_emoji == "🔴"
+        assert ticket_dto.formatted_created_long == "2024-03-05 09:30"
+        assert ticket_dto.callback_view == "view_comments:TKT-001"
+    
+    def test_is_frozen(self, ticket_dto):
+        """Test fields cannot be reassigned, so derived values cannot go stale"""
+        with pytest.raises(FrozenInstanceError):
+            ticket_dto.status = "Closed"
+
+
+class TestCommentDTO:
+    """Test CommentDTO"""
+    
+    @pytest.fixture
+    def comment_dto(self):
+        """Create comment DTO from a domain comment"""
+        return CommentDTO.from_domain(Comment(
+            ticket_number="TKT-001",
+            content="Internal investigation notes",
+            author_email="agent@example.com",
+            comment_type=CommentType.INTERNAL,
+            created_date=datetime(2024, 3, 5, 9, 30)
+        ))
+    
+    def test_derived_fields(self, comment_dto):
+        """Test type emoji and formatted date are derived from the fields"""
+        assert comment_dto.type_emoji == "🔒"
+        assert comment_dto.formatted_date == "2024-03-05 09:30"
+    
+    def test_is_frozen(self, comment_dto):
+        """Test fields cannot be reassigned"""
+        with pytest.raises(FrozenInstanceError):
+            comment_dto.comment_type = "public"
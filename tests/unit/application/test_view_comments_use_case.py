@@ -30,6 +30,7 @@ class TestViewCommentsUseCase:
         
         comment_repo.get_by_ticket_number = AsyncMock()
         comment_repo.get_comment_count_by_ticket = AsyncMock()
+        comment_repo.get_comment_version = AsyncMock()
         
         user_repo.get_by_email = AsyncMock()
         
@@ -257,6 +258,59 @@ class TestViewCommentsUseCase:
         assert ticket_numbers == ["TKT-001"]
         ticket_repo.get_recent_tickets.assert_called_once_with("user@example.com", 5)
     
+    @pytest.mark.asyncio
+    async def test_get_comment_version(self, use_case, mock_repositories, sample_ticket, sample_user):
+        """Test getting the comment version token for a ticket"""
+        ticket_repo, comment_repo, user_repo = mock_repositories
+        
+        # Setup mocks
+        ticket_repo.get_by_number.return_value = sample_ticket
+        user_repo.get_by_email.return_value = sample_user
+        comment_repo.get_comment_version.return_value = (42, 3, None)
+        
+        # Execute
+        version = await use_case.get_comment_version("TKT-001", "user@example.com")
+        
+        # Verify
+        assert version == (42, 3, None)
+        comment_repo.get_comment_version.assert_called_once_with("TKT-001")
+        comment_repo.get_by_ticket_number.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_get_comment_version_reuses_access_check(self, use_case, mock_repositories):
+        """Test the probe is a single repository query once the thread was shown to the user"""
+        ticket_repo, comment_repo, user_repo = mock_repositories
+        
+        # Setup mocks
+        comment_repo.get_comment_version.return_value = (42, 3, None)
+        
+        # Execute
+        version = await use_case.get_comment_version("TKT-001", "user@example.com", access_checked=True)
+        
+        # Verify
+        assert version == (42, 3, None)
+        ticket_repo.get_by_number.assert_not_called()
+        user_repo.get_by_email.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_get_comment_version_permission_denied(self, use_case, mock_repositories, sample_ticket):
+        """Test the version probe applies the same access check as viewing"""
+        ticket_repo, comment_repo, user_repo = mock_repositories
+        
+        # Setup mocks
+        ticket_repo.get_by_number.return_value = sample_ticket
+        user_repo.get_by_email.return_value = User(
+            email="other@example.com",
+            name="Other User",
+            role=UserRole.USER
+        )
+        
+        # Execute and verify permission error
+        with pytest.raises(PermissionError, match="User cannot access this ticket"):
+            await use_case.get_comment_version("TKT-001", "other@example.com")
+        
+        comment_repo.get_comment_version.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_search_tickets_for_comments(self, use_case, mock_repositories, sample_ticket, sample_user):
         """Test searching tickets for comment viewing"""
@@ -292,6 +346,8 @@ class TestViewCommentsUseCase:
         # Execute and verify error
         with pytest.raises(ValueError, match="User nonexistent@example.com not found"):
             await use_case.search_tickets_for_comments("nonexistent@example.com", "query")
+        
+        ticket_repo.search_tickets.assert_not_awaited()
     
     @pytest.mark.asyncio
     async def test_admin_can_view_all_tickets(self, use_case, mock_repositories, sample_ticket):
@@ -0,0 +1,104 @@
+"""
+Unit tests for BatchedCommentFetcher.
+Tests coalescing of concurrent lookups with a mocked bulk loader.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, call
+
+from src.infrastructure.repositories.batched_comment_fetcher import BatchedCommentFetcher
+from src.domain.entities.comment import Comment
+
+
+class TestBatchedCommentFetcher:
+    """Test BatchedCommentFetcher"""
+    
+    @pytest.fixture
+    def sample_comments(self):
+        """Create sample comments for two tickets"""
+        return {
+            "TKT-001": [Comment(ticket_number="TKT-001", content="First comment", author_email="user@example.com")],
+            "TKT-002": [Comment(ticket_number="TKT-002", content="Second comment", author_email="user@example.com")]
+        }
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_share_one_load(self, sample_comments):
+        """Test callers arriving together are resolved by a single bulk load"""
+        load_many = AsyncMock(return_value=sample_comments)
+        fetcher = BatchedCommentFetcher(load_many)
+        
+        first, second, first_again = await asyncio.gather(
+            fetcher.fetch("TKT-001"),
+            fetcher.fetch("TKT-002"),
+            fetcher.fetch("TKT-001")
+        )
+        
+        load_many.assert_awaited_once_with(["TKT-001", "TKT-002"])
+        assert first == sample_comments["TKT-001"]
+        assert second == sample_comments["TKT-002"]
+        assert first_again == sample_comments["TKT-001"]
+        # Each caller gets its own list
+        assert first is not first_again
+    
+    @pytest.mark.asyncio
+    async def test_missing_ticket_gets_empty_list(self):
+        """Test a ticket absent from the bulk result resolves to no comments"""
+        fetcher = BatchedCommentFetcher(AsyncMock(return_value={}))
+        
+        assert await fetcher.fetch("TKT-404") == []
+    
+    @pytest.mark.asyncio
+    async def test_lone_fetch_does_not_wait_for_window(self):
+        """Test an idle fetcher flushes on the next loop iteration"""
+        fetcher = BatchedCommentFetcher(AsyncMock(return_value={}), window=60)
+        
+        assert await asyncio.wait_for(fetcher.fetch("TKT-001"), timeout=1) == []
+    
+    @pytest.mark.asyncio
+    async def test_early_flush_at_max_batch(self):
+        """Test reaching max_batch distinct tickets flushes before the window"""
+        load_many = AsyncMock(return_value={})
+        fetcher = BatchedCommentFetcher(load_many)
+        tickets = [f"TKT-{i:03d}" for i in range(fetcher.max_batch + 1)]
+        
+        await asyncio.gather(*(fetcher.fetch(ticket) for ticket in tickets))
+        
+        assert fetcher.max_batch == 32
+        assert load_many.await_args_list == [call(tickets[:32]), call(tickets[32:])]
+    
+    @pytest.mark.asyncio
+    async def test_load_error_propagates_to_all_waiters(self):
+        """Test a failing bulk load raises in every waiting caller"""
+        fetcher = BatchedCommentFetcher(AsyncMock(side_effect=RuntimeError("db down")))
+        
+        results = await asyncio.gather(
+            fetcher.fetch("TKT-001"),
+            fetcher.fetch("TKT-002"),
+            fetcher.fetch("TKT-001"),
+            return_exceptions=True
+        )
+        
+        assert len(results) == 3
+        assert all(isinstance(result, RuntimeError) for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_break_batch(self, sample_comments):
+        """Test cancelling one caller leaves the others resolved"""
+        release = asyncio.Event()
+        
+        async def load_many(ticket_numbers):
+            await release.wait()
+            return sample_comments
+        
+        fetcher = BatchedCommentFetcher(load_many)
+        cancelled = asyncio.create_task(fetcher.fetch("TKT-001"))
+        kept = asyncio.create_task(fetcher.fetch("TKT-001"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        
+        cancelled.cancel()
+        release.set()
+        
+        assert await kept == sample_comments["TKT-001"]
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
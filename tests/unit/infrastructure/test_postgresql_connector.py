@@ -0,0 +1,277 @@
+"""
+Unit tests for PostgreSQLConnector.
+Tests pooling, statement caches and query rendering with mocked psycopg2 pools and cursors.
+"""
+import threading
+import pytest
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
+
+from psycopg2.pool import PoolError
+
+from src.odoo.postgresql_connector import (
+    PostgreSQLConnector,
+    AsyncPostgreSQLConnector,
+    POOL_MAX_CONNECTIONS
+)
+
+
+def _mock_connection(closed: int = 0) -> MagicMock:
+    """Create a mocked psycopg2 connection whose cursor() works as a context manager"""
+    conn = MagicMock()
+    conn.autocommit = False
+    conn.closed = closed
+    cursor = MagicMock()
+    cursor.connection = conn
+    conn.cursor.return_value.__enter__.return_value = cursor
+    return conn
+
+
+def _free_slots(connector: PostgreSQLConnector) -> int:
+    """Count pool slots that can still be taken without blocking (and give them back)"""
+    taken = 0
+    while connector._pool_slots.acquire(blocking=False):
+        taken += 1
+    for _ in range(taken):
+        connector._pool_slots.release()
+    return taken
+
+
+@pytest.fixture
+def connector():
+    """Create connector without touching a real database"""
+    with patch.object(PostgreSQLConnector, '_connect'), \
+         patch.object(PostgreSQLConnector, '_load_existing_tables', return_value={'helpdesk_ticket'}):
+        connector = PostgreSQLConnector('localhost', 15432, 'odoo', 'odoo', 'secret')
+    
+    # State normally created by _connect
+    connector.pool = Mock()
+    connector._pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+    connector._prepared_statements = {}
+    return connector
+
+
+class TestConnectionPool:
+    """Test _connection / _cursor context managers"""
+    
+    def test_connection_is_autocommit_and_returned(self, connector):
+        """Test borrowed connection is switched to autocommit and handed back"""
+        conn = _mock_connection()
+        connector.pool.getconn.return_value = conn
+        
+        with connector._connection() as borrowed:
+            assert borrowed is conn
+            assert conn.autocommit is True
+            assert _free_slots(connector) == POOL_MAX_CONNECTIONS - 1
+        
+        connector.pool.putconn.assert_called_once_with(conn, close=False)
+        assert _free_slots(connector) == POOL_MAX_CONNECTIONS
+    
+    def test_connection_returned_on_error(self, connector):
+        """Test connection goes back to the pool when the body raises"""
+        conn = _mock_connection()
+        connector.pool.getconn.return_value = conn
+        
+        with pytest.raises(RuntimeError):
+            with connector._connection():
+                raise RuntimeError("query failed")
+        
+        connector.pool.putconn.assert_called_once_with(conn, close=False)
+        assert _free_slots(connector) == POOL_MAX_CONNECTIONS
+    
+    def test_broken_connection_is_discarded(self, connector):
+        """Test a closed connection is removed from the pool with its prepared statements"""
+        conn = _mock_connection(closed=2)
+        connector.pool.getconn.return_value = conn
+        connector._prepared_statements[conn] = {'get_ticket_ps': Mock()}
+        
+        with connector._connection():
+            pass
+        
+        connector.pool.putconn.assert_called_once_with(conn, close=True)
+        assert conn not in connector._prepared_statements
+    
+    def test_connection_closed_by_pool_drops_prepared_statements(self, connector):
+        """Test statements are dropped when putconn closes a surplus connection"""
+        conn = _mock_connection()
+        connector.pool.getconn.return_value = conn
+        connector.pool.putconn.side_effect = lambda c, close: setattr(c, 'closed', 1)
+        connector._prepared_statements[conn] = {'get_ticket_ps': Mock()}
+        
+        with connector._connection():
+            pass
+        
+        assert conn not in connector._prepared_statements
+    
+    def test_getconn_failure_releases_slot(self, connector):
+        """Test a failed getconn does not leak a pool slot"""
+        connector.pool.getconn.side_effect = PoolError("connection pool exhausted")
+        
+        with pytest.raises(PoolError):
+            with connector._connection():
+                pass
+        
+        assert _free_slots(connector) == POOL_MAX_CONNECTIONS
+    
+    def test_cursor_uses_cursor_factory(self, connector):
+        """Test _cursor opens a cursor with the requested factory on a pooled connection"""
+        conn = _mock_connection()
+        connector.pool.getconn.return_value = conn
+        factory = Mock()
+        
+        with connector._cursor(factory) as cursor:
+            assert cursor.connection is conn
+        
+        conn.cursor.assert_called_once_with(cursor_factory=factory)
+        connector.pool.putconn.assert_called_once()
+
+
+class TestStatementCaches:
+    """Test prepared statement and INSERT template caches"""
+    
+    def test_prepare_runs_once_per_connection(self, connector):
+        """Test PREPARE is sent on first use only; later calls just EXECUTE"""
+        cursor = _mock_connection().cursor.return_value.__enter__.return_value
+        
+        connector._execute_prepared(cursor, 'get_ticket_ps', "SELECT 1 WHERE id = $1", (1,))
+        assert cursor.execute.call_count == 2
+        
+        connector._execute_prepared(cursor, 'get_ticket_ps', "SELECT 1 WHERE id = $1", (2,))
+        assert cursor.execute.call_count == 3
+        assert cursor.execute.call_args[0][1] == (2,)
+        assert list(connector._prepared_statements[cursor.connection]) == ['get_ticket_ps']
+    
+    def test_prepared_statements_are_per_connection(self, connector):
+        """Test a new session prepares the statement again"""
+        first = _mock_connection().cursor.return_value.__enter__.return_value
+        second = _mock_connection().cursor.return_value.__enter__.return_value
+        
+        connector._execute_prepared(first, 'get_ticket_ps', "SELECT 1 WHERE id = $1", (1,))
+        connector._execute_prepared(second, 'get_ticket_ps', "SELECT 1 WHERE id = $1", (1,))
+        
+        assert first.execute.call_count == 2
+        assert second.execute.call_count == 2
+    
+    def test_insert_query_is_cached_per_shape(self, connector):
+        """Test the composed INSERT is reused for the same table, columns and linking"""
+        columns = ('name', 'description', 'priority')
+        
+        with patch.dict(PostgreSQLConnector._INSERT_TEMPLATES, clear=True):
+            query = connector._get_insert_query('helpdesk_ticket', columns, False)
+            
+            assert connector._get_insert_query('helpdesk_ticket', columns, False) is query
+            assert connector._get_insert_query('helpdesk_ticket', columns, True) is not query
+            assert len(PostgreSQLConnector._INSERT_TEMPLATES) == 2
+
+
+class TestPartnerCache:
+    """Test the res_partner LRU cache"""
+    
+    def test_concurrent_access_from_executor_threads(self, connector):
+        """Test threads caching and reading partners at once leave a consistent LRU"""
+        def worker(offset):
+            for i in range(200):
+                email = f"user{(offset + i) % 50}@example.com"
+                connector._cache_partner(email, i, "User")
+                connector._get_cached_partner(email)
+        
+        threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(connector._partner_cache) == 50
+        assert connector._get_cached_partner("user0@example.com") is not None
+
+
+class TestAsyncQuery:
+    """Test rendering psycopg2 queries for asyncpg and the async insert path"""
+    
+    INSERT_KEY = ('helpdesk_ticket', ('name',), False)
+    
+    @pytest.fixture
+    def async_connector(self, connector):
+        """Create async connector sharing the mocked psycopg2 pool"""
+        async_connector = object.__new__(AsyncPostgreSQLConnector)
+        async_connector.__dict__.update(connector.__dict__)
+        async_connector._async_queries = {}
+        connector.pool.getconn.return_value = _mock_connection()
+        return async_connector
+    
+    @pytest.fixture
+    def async_pool(self, async_connector):
+        """Attach a mocked asyncpg pool whose INSERT returns one ticket row"""
+        conn = MagicMock()
+        conn.fetchrow = AsyncMock(return_value=(42, 'VN251025001', 'From Telegram Vietnam', None, None))
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+        async_connector.async_pool = pool
+        return conn
+    
+    def test_placeholders_rewritten(self, async_connector):
+        """Test %s become numbered $n placeholders and %% becomes a literal %"""
+        query = Mock()
+        query.as_string.return_value = "SELECT %s || lpad(x::text, 3, '0'), 'a%%b' WHERE id = %s"
+        
+        with patch.object(async_connector, '_get_insert_query', return_value=query):
+            rendered = async_connector._async_query(self.INSERT_KEY)
+        
+        assert rendered == "SELECT $1 || lpad(x::text, 3, '0'), 'a%b' WHERE id = $2"
+    
+    def test_rendered_query_is_cached(self, async_connector):
+        """Test each INSERT shape is rendered (and borrows a connection) only once"""
+        query = Mock()
+        query.as_string.return_value = "SELECT %s"
+        
+        with patch.object(async_connector, '_get_insert_query', return_value=query):
+            assert async_connector._async_query(self.INSERT_KEY) == "SELECT $1"
+            assert async_connector._async_query(self.INSERT_KEY) == "SELECT $1"
+        
+        query.as_string.assert_called_once()
+        async_connector.pool.getconn.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_create_ticket_async(self, async_connector, async_pool):
+        """Test the asyncpg INSERT runs with the rendered query and psycopg2 is only borrowed on first use"""
+        query = Mock()
+        query.as_string.return_value = "INSERT INTO helpdesk_ticket VALUES (%s, %s)"
+        ticket_data = {'description': 'Printer is down', 'priority': 1}
+        
+        with patch.object(async_connector, '_get_insert_query', return_value=query):
+            first = await async_connector.create_ticket_async(ticket_data, 'Vietnam')
+            second = await async_connector.create_ticket_async(ticket_data, 'Vietnam')
+        
+        assert first['success'] is True
+        assert first['ticket_number'] == 'VN251025001'
+        assert second['success'] is True
+        assert async_pool.fetchrow.await_args[0][0] == "INSERT INTO helpdesk_ticket VALUES ($1, $2)"
+        # Schema probe + render on the first ticket only
+        assert async_connector.pool.getconn.call_count == 2
+
+
+class TestUpdateTicketStatus:
+    """Test update_ticket_status"""
+    
+    @pytest.mark.asyncio
+    async def test_returns_updated_rows(self, connector):
+        """Test the RETURNING rows are handed back as a list of dicts"""
+        conn = _mock_connection()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [{'id': 7, 'stage_id': 4}]
+        connector.pool.getconn.return_value = conn
+        
+        with patch.object(connector, '_get_stage_map', return_value=({4: 'Done'}, {'done': 4})):
+            rows = await connector.update_ticket_status('TH230925353', 'resolved')
+        
+        assert rows == [{'id': 7, 'stage_id': 4}]
+        assert cursor.execute.call_args[0][1] == (4, 'TH230925353')
+    
+    @pytest.mark.asyncio
+    async def test_unknown_status_returns_empty_list(self, connector):
+        """Test an unmapped status updates nothing"""
+        with patch.object(connector, '_get_stage_map', return_value=({4: 'Done'}, {'done': 4})):
+            rows = await connector.update_ticket_status('TH230925353', 'archived')
+        
+        assert rows == []
+        connector.pool.getconn.assert_not_called()
@@ -0,0 +1,259 @@
+"""
+Unit tests for CommentHandler.
+Tests callback routing, the template cache and the per-chat post lock with mocked use cases.
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from src.presentation.handlers.comment_handler import CommentHandler, CommentDraftCtx
+
+
+class TestCommentHandler:
+    """Test CommentHandler"""
+    
+    @pytest.fixture
+    def handler(self):
+        """Create handler with mocked use cases, formatter and keyboards"""
+        return CommentHandler(
+            view_comments_use_case=Mock(),
+            add_comment_use_case=Mock(),
+            formatter=Mock(),
+            keyboards=Mock()
+        )
+    
+    @pytest.fixture
+    def update(self):
+        """Create update carrying a callback query"""
+        update = Mock()
+        update.callback_query = Mock()
+        update.callback_query.answer = AsyncMock()
+        update.callback_query.edit_message_text = AsyncMock()
+        return update
+    
+    @pytest.mark.parametrize("data, prefix", [
+        ("view_comments:VN251025001", "view_comments"),
+        ("add_comment:VN251025001", "add_comment"),
+        ("add_internal:VN251025001", "add_internal"),
+        ("use_template:VN251025001:3", "use_template"),
+        ("custom_comment:VN251025001", "custom_comment"),
+        ("confirm_comment:VN251025001", "confirm_comment"),
+        ("refresh_comments:VN251025001", "refresh_comments"),
+        ("cancel_comment", "cancel_comment")
+    ])
+    def test_callback_re_accepts_known_shapes(self, data, prefix):
+        """Test each prefix matches its own argument shape"""
+        match = CommentHandler._CALLBACK_RE.fullmatch(data)
+        
+        assert match is not None
+        assert match.lastgroup == prefix
+    
+    @pytest.mark.parametrize("data", [
+        "view_comments:",
+        "view_comments:VN251025001:1",
+        "use_template:VN251025001",
+        "use_template:VN251025001:x",
+        "cancel_comment:VN251025001",
+        "delete_comment:VN251025001",
+        "refresh_comments"
+    ])
+    def test_callback_re_rejects_malformed_data(self, data):
+        """Test unknown prefixes and wrong argument shapes do not match"""
+        assert CommentHandler._CALLBACK_RE.fullmatch(data) is None
+    
+    @pytest.mark.asyncio
+    async def test_handle_callback_routes_by_prefix(self, handler, update, mock_telegram_context):
+        """Test the matched prefix selects the handler and receives the arguments"""
+        target = AsyncMock(return_value="CONFIRMING_COMMENT")
+        update.callback_query.data = "use_template:VN251025001:2"
+        
+        with patch.dict(CommentHandler._PREFIX_HANDLERS, {"use_template": (target, r":[^:]+:\d+")}):
+            state = await handler.handle_callback(update, mock_telegram_context)
+        
+        assert state == "CONFIRMING_COMMENT"
+        target.assert_awaited_once_with(
+            handler, update, mock_telegram_context, "use_template", "VN251025001:2"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_handle_callback_rejects_invalid_data(self, handler, update, mock_telegram_context):
+        """Test malformed callback data ends the conversation"""
+        update.callback_query.data = "use_template:VN251025001"
+        
+        state = await handler.handle_callback(update, mock_telegram_context)
+        
+        assert state == "END"
+        update.callback_query.edit_message_text.assert_awaited_once_with("❌ Invalid action.")
+    
+    @pytest.mark.asyncio
+    async def test_cancel_comment_clears_draft(self, handler, update, mock_telegram_context):
+        """Test the inline Cancel button drops the draft state"""
+        update.callback_query.data = "cancel_comment"
+        key = handler._cache_templates("user@example.com", "VN251025001", ["Thanks!"])
+        mock_telegram_context.user_data.update({
+            'adding_comment': CommentDraftCtx("VN251025001", "public"),
+            'comment_draft': "Draft text",
+            'comment_templates_key': key
+        })
+        
+        state = await handler.handle_callback(update, mock_telegram_context)
+        
+        assert state == "END"
+        assert mock_telegram_context.user_data == {}
+        assert handler._get_cached_templates(key) == []
+    
+    def test_template_cache_round_trip(self, handler):
+        """Test cached templates are returned by their key"""
+        key = handler._cache_templates("user@example.com", "VN251025001", ["Thanks!", "On it"])
+        
+        assert key == ("user@example.com", "VN251025001")
+        assert handler._get_cached_templates(key) == ["Thanks!", "On it"]
+        assert handler._get_cached_templates(None) == []
+    
+    def test_template_cache_expires(self, handler):
+        """Test templates are swept once their TTL has passed"""
+        with patch("src.presentation.handlers.comment_handler.time.monotonic", return_value=1000.0):
+            key = handler._cache_templates("user@example.com", "VN251025001", ["Thanks!"])
+        
+        with patch("src.presentation.handlers.comment_handler.time.monotonic", return_value=1000.0 + 601):
+            assert handler._get_cached_templates(key) == []
+        
+        assert handler._template_cache == {}
+    
+    @pytest.mark.asyncio
+    async def test_confirmation_ignored_while_post_in_progress(self, handler, update, mock_telegram_context):
+        """Test a repeated confirm tap does not post the comment twice"""
+        update.callback_query.data = "confirm_comment:VN251025001"
+        mock_telegram_context.user_data.update({
+            'adding_comment': CommentDraftCtx("VN251025001", "public"),
+            'comment_draft': "Printer is back online",
+            'email': "user@example.com"
+        })
+        post_lock = asyncio.Lock()
+        mock_telegram_context.chat_data['comment_post_lock'] = post_lock
+        await post_lock.acquire()
+        handler.add_comment_use_case.execute = AsyncMock()
+        
+        state = await handler.handle_callback(update, mock_telegram_context)
+        
+        assert state == "COMMENT_POSTED"
+        update.callback_query.edit_message_text.assert_not_awaited()
+        assert handler._pending_posts == set()
+        # Draft is kept for the post that holds the lock
+        assert mock_telegram_context.user_data['comment_draft'] == "Printer is back online"
+    
+    @pytest.mark.asyncio
+    async def test_confirmation_posts_in_background_and_releases_lock(self, handler, update, mock_telegram_context):
+        """Test the comment is posted once and the chat lock is released afterwards"""
+        update.callback_query.data = "confirm_comment:VN251025001"
+        mock_telegram_context.user_data.update({
+            'adding_comment': CommentDraftCtx("VN251025001", "internal"),
+            'comment_draft': "Printer is back online",
+            'email': "agent@example.com"
+        })
+        handler.add_comment_use_case.execute = AsyncMock()
+        handler.formatter.format_comment_added_success.return_value = "✅ Comment added"
+        
+        state = await handler.handle_callback(update, mock_telegram_context)
+        await asyncio.gather(*handler._pending_posts)
+        
+        assert state == "COMMENT_POSTED"
+        request = handler.add_comment_use_case.execute.await_args[0][0]
+        assert request.comment_type == "internal"
+        assert not mock_telegram_context.chat_data['comment_post_lock'].locked()
+        assert 'comment_draft' not in mock_telegram_context.user_data
+    
+    @pytest.mark.asyncio
+    async def test_failed_post_keeps_draft_for_retry(self, handler, update, mock_telegram_context):
+        """Test a failed background post reports the error and leaves the draft for a retry"""
+        update.callback_query.data = "confirm_comment:VN251025001"
+        mock_telegram_context.user_data.update({
+            'adding_comment': CommentDraftCtx("VN251025001", "public"),
+            'comment_draft': "Printer is back online",
+            'email': "user@example.com"
+        })
+        handler.add_comment_use_case.execute = AsyncMock(side_effect=RuntimeError("odoo down"))
+        
+        await handler.handle_callback(update, mock_telegram_context)
+        await asyncio.gather(*handler._pending_posts)
+        
+        update.callback_query.edit_message_text.assert_awaited_with("❌ Error posting comment. Please try again.")
+        assert mock_telegram_context.user_data['comment_draft'] == "Printer is back online"
+        assert not mock_telegram_context.chat_data['comment_post_lock'].locked()
+        
+        # Retrying posts the same draft again
+        handler.add_comment_use_case.execute = AsyncMock()
+        await handler.handle_callback(update, mock_telegram_context)
+        await asyncio.gather(*handler._pending_posts)
+        
+        handler.add_comment_use_case.execute.assert_awaited_once()
+        assert 'comment_draft' not in mock_telegram_context.user_data
+    
+    @pytest.mark.asyncio
+    async def test_template_selection_reloads_expired_templates(self, handler, update, mock_telegram_context):
+        """Test a template tap after the cache expired reloads the templates"""
+        update.callback_query.data = "use_template:VN251025001:1"
+        mock_telegram_context.user_data['email'] = "user@example.com"
+        handler.add_comment_use_case.get_comment_templates = AsyncMock(return_value=["Thanks!", "On it"])
+        
+        state = await handler.handle_callback(update, mock_telegram_context)
+        
+        assert state == "CONFIRMING_COMMENT"
+        handler.add_comment_use_case.get_comment_templates.assert_awaited_once_with("user@example.com", "VN251025001")
+        assert mock_telegram_context.user_data['comment_draft'] == "On it"
+    
+    @pytest.mark.asyncio
+    async def test_template_selection_reports_missing_template(self, handler, update, mock_telegram_context):
+        """Test a tap on a template that cannot be reloaded replies and ends the conversation"""
+        update.callback_query.data = "use_template:VN251025001:4"
+        handler.add_comment_use_case.get_comment_templates = AsyncMock(return_value=["Thanks!"])
+        
+        state = await handler.handle_callback(update, mock_telegram_context)
+        
+        assert state == "END"
+        update.callback_query.edit_message_text.assert_awaited_once_with(
+            "❌ Template no longer available. Please try again."
+        )
+    
+    @pytest.mark.asyncio
+    async def test_refresh_unchanged_answers_no_new_comments(self, handler, update, mock_telegram_context):
+        """Test an unchanged thread is not reloaded and the tap gets feedback"""
+        update.callback_query.data = "refresh_comments:VN251025001"
+        version = (42, 3, None)
+        mock_telegram_context.user_data.update({
+            'email': "user@example.com",
+            'current_ticket': Mock(number="VN251025001"),
+            'current_ticket_version': ("VN251025001", version)
+        })
+        handler.view_comments_use_case.get_comment_version = AsyncMock(return_value=version)
+        handler.view_comments_use_case.execute = AsyncMock()
+        
+        state = await handler.handle_callback(update, mock_telegram_context)
+        
+        assert state == "VIEWING_COMMENTS"
+        update.callback_query.answer.assert_awaited_once_with("✅ No new comments")
+        handler.view_comments_use_case.get_comment_version.assert_awaited_once_with(
+            "VN251025001", "user@example.com", access_checked=True
+        )
+        handler.view_comments_use_case.execute.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_refresh_changed_reloads_thread(self, handler, update, mock_telegram_context):
+        """Test a new version reloads the thread and records the version"""
+        update.callback_query.data = "refresh_comments:VN251025001"
+        mock_telegram_context.user_data.update({
+            'email': "user@example.com",
+            'current_ticket_version': ("VN251025001", (41, 2, None))
+        })
+        handler.view_comments_use_case.get_comment_version = AsyncMock(return_value=(42, 3, None))
+        handler.view_comments_use_case.execute = AsyncMock(return_value=Mock(comments=[]))
+        handler.formatter.format_comments_list.return_value = "Comments"
+        
+        state = await handler.handle_callback(update, mock_telegram_context)
+        
+        assert state == "VIEWING_COMMENTS"
+        update.callback_query.answer.assert_awaited_once_with("🔄 Refreshing...")
+        handler.view_comments_use_case.get_comment_version.assert_awaited_once_with(
+            "VN251025001", "user@example.com", access_checked=False
+        )
+        assert mock_telegram_context.user_data['current_ticket_version'] == ("VN251025001", (42, 3, None))
@@ -0,0 +1,96 @@
+"""
+Unit tests for ticket and comment keyboards.
+Tests memoized keyboard builders and the ticket keyboards facade.
+"""
+import pytest
+from telegram import InlineKeyboardMarkup
+
+from src.presentation.keyboards import ticket_keyboards as ticket_kb_module
+from src.presentation.keyboards.ticket_keyboards import TicketKeyboards, ticket_keyboards
+from src.presentation.keyboards.comment_keyboards import CommentKeyboards
+
+
+def _callbacks(markup: InlineKeyboardMarkup) -> list:
+    """Flatten callback data of an inline keyboard"""
+    return [button.callback_data for row in markup.inline_keyboard for button in row]
+
+
+class TestTicketKeyboards:
+    """Test ticket keyboards"""
+    
+    def test_details_keyboard_is_cached(self):
+        """Test identical arguments return the same shared markup"""
+        first = ticket_keyboards.get_ticket_details_keyboard("VN251025001", True, True)
+        
+        assert ticket_keyboards.get_ticket_details_keyboard("VN251025001", True, True) is first
+        assert ticket_keyboards.get_ticket_details_keyboard("VN251025001", False, True) is not first
+    
+    def test_status_change_keyboard_is_cached(self):
+        """Test status change keyboard is built once per ticket and status"""
+        first = ticket_keyboards.get_ticket_status_change_keyboard("VN251025001", "Open")
+        
+        assert ticket_keyboards.get_ticket_status_change_keyboard("VN251025001", "Open") is first
+        assert "set_status:VN251025001:In Progress" in _callbacks(first)
+    
+    def test_filters_keyboard_marks_active_values(self):
+        """Test the active filter values are ticked"""
+        markup = ticket_keyboards.get_ticket_filters_keyboard("Open", None)
+        labels = [button.text for row in markup.inline_keyboard for button in row]
+        
+        assert ticket_keyboards.get_ticket_filters_keyboard("Open", None) is markup
+        assert any(label.endswith(" ✓") and "Open" in label for label in labels)
+    
+    def test_static_keyboards_are_shared(self):
+        """Test keyboards that never vary are built once at import"""
+        assert ticket_keyboards.get_main_tickets_keyboard() is ticket_keyboards.get_main_tickets_keyboard()
+        assert ticket_keyboards.get_ticket_dashboard_keyboard() is ticket_keyboards.get_ticket_dashboard_keyboard()
+    
+    def test_ticket_list_keyboard_pagination(self):
+        """Test only the applicable pagination buttons are shown"""
+        markup = ticket_keyboards.get_ticket_list_keyboard([], current_page=1, total_pages=3)
+        callbacks = _callbacks(markup)
+        
+        assert "tickets_page:2" in callbacks
+        assert "tickets_page:0" not in callbacks
+        assert "noop" in callbacks
+    
+    def test_facade_delegates_to_module_functions(self):
+        """Test the TicketKeyboards facade exposes the module-level functions"""
+        assert isinstance(ticket_keyboards, TicketKeyboards)
+        assert ticket_keyboards.get_ticket_details_keyboard is ticket_kb_module.get_ticket_details_keyboard
+        assert TicketKeyboards().get_ticket_list_keyboard is ticket_kb_module.get_ticket_list_keyboard
+        with pytest.raises(AttributeError):
+            ticket_keyboards.extra = True
+
+
+class TestCommentKeyboards:
+    """Test comment keyboards"""
+    
+    @pytest.fixture
+    def keyboards(self):
+        """Create comment keyboards"""
+        return CommentKeyboards()
+    
+    def test_comments_keyboard_is_cached(self, keyboards):
+        """Test the comments view keyboard is shared per ticket and permission flags"""
+        first = keyboards.get_ticket_comments_keyboard("VN251025001", True, True, False)
+        
+        assert keyboards.get_ticket_comments_keyboard("VN251025001", True, True, False) is first
+        assert CommentKeyboards().get_ticket_comments_keyboard("VN251025001", True, True, False) is first
+        assert "add_internal:VN251025001" not in _callbacks(first)
+        assert "add_internal:VN251025001" in _callbacks(
+            keyboards.get_ticket_comments_keyboard("VN251025001", True, True, True)
+        )
+    
+    def test_type_and_success_keyboards_are_cached(self, keyboards):
+        """Test per-ticket comment keyboards are built once"""
+        assert keyboards.get_comment_type_keyboard("VN251025001") is keyboards.get_comment_type_keyboard("VN251025001")
+        assert keyboards.get_comment_success_keyboard("VN251025001") is keyboards.get_comment_success_keyboard("VN251025001")
+    
+    def test_templates_keyboard(self, keyboards):
+        """Test template buttons carry their index and share the cached tail rows"""
+        markup = keyboards.get_comment_templates_keyboard("VN251025001", ["Thanks!", "On it"])
+        callbacks = _callbacks(markup)
+        
+        assert callbacks[:2] == ["use_template:VN251025001:0", "use_template:VN251025001:1"]
+        assert "custom_comment:VN251025001" in callbacks
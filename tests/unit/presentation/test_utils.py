@@ -0,0 +1,29 @@
+"""
+Unit tests for shared presentation text helpers.
+"""
+import pytest
+from src.presentation.utils import ellipsize
+
+
+class TestEllipsize:
+    """Test ellipsize"""
+    
+    def test_short_text_unchanged(self):
+        """Test text within the limit is returned as is"""
+        assert ellipsize("Printer offline", 20) == "Printer offline"
+    
+    def test_text_at_limit_unchanged(self):
+        """Test text exactly at the limit is not cut"""
+        assert ellipsize("a" * 10, 10) == "a" * 10
+    
+    def test_long_text_cut_with_ellipsis(self):
+        """Test long text is cut to max_length including the ellipsis"""
+        result = ellipsize("Cannot connect to the office VPN", 10)
+        
+        assert result == "Cannot co…"
+        assert len(result) == 10
+    
+    @pytest.mark.parametrize("text", ["", "x"])
+    def test_empty_and_single_char(self, text):
+        """Test trivial inputs pass through"""
+        assert ellipsize(text, 5) == text